@@ -0,0 +1,47 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from src.Backend.API.make_api_request import make_api_request
+from src.config import API_MAX_IN_FLIGHT
+
+
+async def run_concurrently_async(func, args_list, max_in_flight=API_MAX_IN_FLIGHT):
+    """
+    Egyszerre legfeljebb `max_in_flight` hívást futtat a megadott függvénnyel.
+    A kvótát a make_api_request közös token bucketje tartja be, így a párhuzamos
+    hívások sem lépik túl a percenkénti keretet.
+    :param args_list: Argumentum tuple-ök listája, pl. [(fixture_id,), ...].
+    :return: Az eredmények listája a bemenet sorrendjében.
+    """
+    if not args_list:
+        return []
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        async def run_one(args):
+            async with semaphore:
+                # A hívó kontextusát (pl. az API futási hatókört) a munkaszálak is látják
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(executor, context.run, func, *args)
+
+        return await asyncio.gather(*(run_one(args) for args in args_list))
+
+
+def run_concurrently(func, args_list, max_in_flight=API_MAX_IN_FLIGHT):
+    """
+    Szinkron homlokzat a run_concurrently_async-hoz (a hívó kódnak nem kell asyncio-t ismernie).
+    """
+    return asyncio.run(run_concurrently_async(func, list(args_list), max_in_flight))
+
+
+def fetch_many(requests_list, max_in_flight=API_MAX_IN_FLIGHT):
+    """
+    Több API kérést küld párhuzamosan.
+    :param requests_list: (endpoint, params) párok listája.
+    :return: A válaszok listája a kérések sorrendjében (hiba esetén None).
+    """
+    return run_concurrently(make_api_request, [(endpoint, params) for endpoint, params in requests_list],
+                            max_in_flight)
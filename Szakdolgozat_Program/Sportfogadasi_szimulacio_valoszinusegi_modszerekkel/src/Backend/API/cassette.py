@@ -0,0 +1,114 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+
+from src.Backend.API.parsing import loads
+from src.Backend.API.response_cache import make_cache_key
+from src.config import CASSETTE_DIR
+
+# A visszajátszáshoz szükséges fejlécek (kvóta és tartalom típusa)
+RECORDED_HEADERS = (
+    "Content-Type",
+    "x-ratelimit-requests-limit",
+    "x-ratelimit-requests-remaining",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+)
+
+
+class CassetteRecorder:
+    """
+    Kérés/válasz párok rögzítése tömörített (gzip) JSON-lines kazettába.
+    Soronként egy bejegyzés: kulcs, végpont, paraméterek, státusz, fejlécek és a válasz törzse.
+    A fájl hozzáfűzéssel bővül, így több futás felvétele is összegyűjthető egy kazettában.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self.recorded = 0
+
+    def record(self, endpoint, params, status, headers, body):
+        entry = {
+            "key": make_cache_key(endpoint, params),
+            "endpoint": endpoint,
+            "params": {str(key): str(value) for key, value in (params or {}).items() if value is not None},
+            "status": status,
+            "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            "body": body,
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def resolve_cassette_path(name):
+    """
+    Könyvtár nélküli kazettanév esetén a CASSETTE_DIR-be mutató útvonal, egyébként a megadott út.
+    """
+    if os.path.dirname(name):
+        return name
+    return os.path.join(CASSETTE_DIR, name)
+
+
+def load_cassette(path):
+    """
+    Beolvassa a kazettát: {kulcs: [bejegyzések a felvétel sorrendjében]}.
+    """
+    entries = {}
+    with gzip.open(resolve_cassette_path(path), "rt", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = loads(line)
+            entries.setdefault(entry["key"], []).append(entry)
+    return entries
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def start_recording(path):
+    """
+    Bekapcsolja a felvételt: minden ezutáni hálózati válasz a megadott kazettába kerül.
+    Puszta fájlnév esetén a kazetta a CASSETTE_DIR könyvtárba kerül.
+    """
+    global _recorder
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.close()
+        _recorder = CassetteRecorder(resolve_cassette_path(path))
+    return _recorder
+
+
+def stop_recording():
+    global _recorder
+    with _recorder_lock:
+        recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
+        print(f"📼 {recorder.recorded} API válasz rögzítve: {recorder.path}")
+    return recorder
+
+
+def get_recorder():
+    return _recorder
+
+
+atexit.register(stop_recording)
@@ -1,12 +1,31 @@
+import math
+from datetime import datetime, timedelta
+
+from src.Backend.API.async_client import fetch_many, run_concurrently
 from src.Backend.API.endpoints import HEAD_TO_HEAD, FIXTURES, FIXTURE_STATISTICS
 from src.Backend.API.helpersAPI import get_next_days_dates
 from src.Backend.API.make_api_request import make_api_request
-from src.Backend.API.odds import fetch_odds_for_fixture
+from src.Backend.API.odds import fetch_odds_by_date, fetch_odds_for_fixtures, parse_match_winner_odds
+from src.Backend.API.parsing import Fixture, parse_fixtures
+from src.Backend.API.quota_meter import api_quota_meter
+from src.Backend.API.request_scheduler import with_priority, BACKFILL
+from src.Backend.API.response_cache import FINAL_STATUSES
+from src.Backend.DB.bookmakers import save_bookmakers
 from src.Backend.DB.fixtures import read_from_fixtures, write_to_fixtures, read_head_to_head_stats, \
     check_h2h_match_exists, update_fixture_status, get_fixtures_with_updatable_status
-from src.Backend.DB.predictions import evaluate_predictions
-from src.Backend.DB.statistics import read_from_match_statistics, write_to_match_statistics
+from src.Backend.DB.league_seasons import read_league_season_backfill, write_league_season_backfill
+from src.Backend.DB.missing_statistics import read_missing_statistics, write_missing_statistics, \
+    delete_missing_statistics
+from src.Backend.DB.odds import write_to_odds
+from src.Backend.DB.pre_match_sync import read_pre_match_sync, read_fixture_hashes, write_pre_match_sync
+from src.Backend.DB.predictions import evaluate_predictions_for_fixtures
+from src.Backend.DB.statistics import read_from_match_statistics, read_from_match_statistics_bulk, \
+    write_to_match_statistics, write_match_statistics_bulk
 from src.Backend.DB.utils import normalize_date
+from src.config import LEAGUE_SEASON_REFRESH_HOURS, MISSING_STATISTICS_RECHECK_DAYS, PRE_MATCH_SYNC_DAYS, \
+    PRE_MATCH_RESYNC_HOURS
+
+MAX_IDS_PER_REQUEST = 20  # Az API ennyi azonosítót fogad el egy "ids" kérésben
 
 
 def get_league_id_by_fixture(fixture_id):
@@ -24,6 +43,32 @@ def get_league_id_by_fixture(fixture_id):
         print(f"⚠️ Nem sikerült lekérni a liga azonosítót fixture alapján (fixture_id: {fixture_id}).")
         return None
 
+def fetch_fixtures_by_ids(fixture_ids, use_cache=True):
+    """
+    Több mérkőzés lekérése az API multi-id (`ids=1-2-3`) keresésével, legfeljebb 20 azonosító kérésenként.
+    A csomagokat párhuzamosan küldi el, a válaszokat összefésüli.
+    :return: Szótár {fixture_id: API fixture objektum}.
+    """
+    unique_ids = list(dict.fromkeys(int(fixture_id) for fixture_id in fixture_ids))
+    chunks = [unique_ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(unique_ids), MAX_IDS_PER_REQUEST)]
+
+    responses = run_concurrently(make_api_request, [
+        (FIXTURES, {'ids': "-".join(str(fixture_id) for fixture_id in chunk), 'timezone': 'Europe/Budapest'},
+         use_cache)
+        for chunk in chunks
+    ])
+
+    fixtures_by_id = {}
+    for chunk, response in zip(chunks, responses):
+        if not response or not response.get("response"):
+            print(f"⚠️ API nem adott választ a mérkőzéscsomagra: {chunk[0]}..{chunk[-1]} ({len(chunk)} db)")
+            continue
+        for api_fixture in response["response"]:
+            fixtures_by_id[api_fixture["fixture"]["id"]] = api_fixture
+
+    print(f"📦 {len(fixtures_by_id)}/{len(unique_ids)} mérkőzés lekérve {len(chunks)} API hívással.")
+    return fixtures_by_id
+
 def get_fixture_by_id(fixture_id):
     response = make_api_request(FIXTURES, {"id": fixture_id})
     if response and response.get("response"):
@@ -62,29 +107,58 @@ def get_fixtures(league_id, season, from_date=None, to_date=None, team_id=None,
         print("Az API nem adott vissza mérkőzéseket a megadott paraméterekkel.")
         return []
 
-    fixtures = [
-        {
-            "id": fixture['fixture']['id'],
-            "date": fixture['fixture']['date'],
-            "home_team_id": fixture['teams']['home']['id'],
-            "home_team_name": fixture['teams']['home']['name'],
-            "home_team_country": fixture['league'].get('country', 'Unknown'),
-            "home_team_logo": fixture['teams']['home']['logo'],
-            "away_team_id": fixture['teams']['away']['id'],
-            "away_team_name": fixture['teams']['away']['name'],
-            "away_team_country": fixture['league'].get('country', 'Unknown'),
-            "away_team_logo": fixture['teams']['away']['logo'],
-            "score_home": fixture['score']['fulltime']['home'] if fixture['score']['fulltime']['home'] is not None else 0,
-            "score_away": fixture['score']['fulltime']['away'] if fixture['score']['fulltime']['away'] is not None else 0,
-            "status": fixture['fixture']['status']['short']
-        }
-        for fixture in data.get('response', [])
-    ]
+    fixtures = parse_fixtures(data['response'])
 
     if fixtures:
         write_to_fixtures(fixtures)
     return fixtures
 
+@with_priority(BACKFILL)
+def backfill_league_seasons(league_seasons):
+    """
+    Teljes liga-szezonok mérkőzéseinek feltöltése (`fixtures?league=&season=`), szezononként egy API hívással.
+    A lezárult szezonokat megjegyezzük és többé nem kérjük le, a folyamatban lévőket legfeljebb
+    LEAGUE_SEASON_REFRESH_HOURS óránként frissítjük. Így a csapatok múltbeli meccsei (get_last_matches)
+    nagyrészt csapatonkénti API forgalom nélkül, helyben elérhetők.
+    :param league_seasons: (league_id, season) párok.
+    :return: Az elmentett mérkőzések száma.
+    """
+    league_seasons = sorted(set(league_seasons))
+    state = read_league_season_backfill(league_seasons)
+    refresh_before = datetime.now() - timedelta(hours=LEAGUE_SEASON_REFRESH_HOURS)
+
+    todo = [pair for pair in league_seasons
+            if pair not in state or (not state[pair]["is_complete"] and state[pair]["backfilled_at"] < refresh_before)]
+    if not todo:
+        return 0
+
+    affordable = api_quota_meter.affordable(len(todo))
+    if affordable < len(todo):
+        print(f"📉 A napi API keret miatt csak {affordable}/{len(todo)} liga-szezon tölthető fel most.")
+        todo = todo[:affordable]
+
+    responses = fetch_many([(FIXTURES, {'league': league_id, 'season': season, 'timezone': 'Europe/Budapest'})
+                            for league_id, season in todo])
+
+    saved = 0
+    for (league_id, season), data in zip(todo, responses):
+        if not data or data.get("errors"):
+            print(f"⚠️ Nem sikerült lekérni a liga-szezont: {league_id}/{season}")
+            continue
+
+        api_fixtures = data.get("response", [])
+        fixtures = parse_fixtures(api_fixtures)
+        if fixtures:
+            write_to_fixtures(fixtures)
+
+        is_complete = bool(fixtures) and all(fixture["status"] in FINAL_STATUSES for fixture in fixtures)
+        write_league_season_backfill(league_id, season, len(fixtures), is_complete)
+        saved += len(fixtures)
+        print(f"📚 Liga-szezon feltöltve: {league_id}/{season} – {len(fixtures)} mérkőzés"
+              f"{' (lezárult)' if is_complete else ''}")
+
+    return saved
+
 def get_match_statistics(match_id):
     """
     Lekéri egy adott mérkőzés statisztikáit az API-ból, ha még nem szerepelnek az adatbázisban.
@@ -95,6 +169,9 @@ def get_match_statistics(match_id):
         print("Statisztikák az adatbázisból:", db_statistics)
         return db_statistics
 
+    if not skip_known_missing_statistics([match_id], per_call=1):
+        return []
+
     # API lekérés rate limit mellett
     params = {'fixture': match_id}
     data = make_api_request(FIXTURE_STATISTICS , params)
@@ -111,58 +188,151 @@ def get_match_statistics(match_id):
             team_id = team_stat['team']['id']
             statistics = team_stat['statistics']
             write_to_match_statistics(match_id, team_id, statistics)
+    else:
+        write_missing_statistics([match_id])
 
     return statistics_data
 
+def skip_known_missing_statistics(fixture_ids, per_call=MAX_IDS_PER_REQUEST):
+    """
+    Kiszűri azokat a mérkőzéseket, amelyekről MISSING_STATISTICS_RECHECK_DAYS napon belül kiderült,
+    hogy az API-ban sincs statisztikájuk, és rögzíti a megspórolt hívások számát.
+    :param per_call: Hány mérkőzés statisztikája fér egy API hívásba.
+    :return: A még lekérendő azonosítók listája (eredeti sorrendben).
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    known_missing = read_missing_statistics(fixture_ids, MISSING_STATISTICS_RECHECK_DAYS)
+    if not known_missing:
+        return fixture_ids
+
+    to_fetch = [fixture_id for fixture_id in fixture_ids if fixture_id not in known_missing]
+    saved = math.ceil(len(fixture_ids) / per_call) - math.ceil(len(to_fetch) / per_call)
+    api_quota_meter.record_saved(saved)
+    print(f"💾 {len(known_missing)} mérkőzésnek ismerten nincs statisztikája, kihagyva ({saved} API hívás megspórolva).")
+    return to_fetch
+
+def has_usable_statistics(team_statistics):
+    """
+    Igaz, ha az API csapatstatisztikái között van érdemi (nem üres, nem nulla) érték.
+    """
+    return bool(team_statistics) and any(
+        any(item.get("value") not in [None, 0, ""] for item in team["statistics"]) for team in team_statistics
+    )
+
+def fetch_match_statistics_batch(match_ids):
+    """
+    Több mérkőzés statisztikáinak lekérése a multi-id (`ids=`) kereséssel, amely a statisztikákat is
+    beágyazva adja vissza: 20 mérkőzés egy API hívás a mérkőzésenkénti `fixtures/statistics` helyett.
+    A használható statisztikákat egyetlen tömeges upserttel menti a match_statistics táblába.
+    :return: Szótár {fixture_id: API fixture objektum} a használható statisztikával rendelkező mérkőzésekre.
+    """
+    if not match_ids:
+        return {}
+
+    api_fixtures = fetch_fixtures_by_ids(match_ids)
+    with_statistics = {fixture_id: api_fixture for fixture_id, api_fixture in api_fixtures.items()
+                       if has_usable_statistics(api_fixture.get("statistics"))}
+
+    write_match_statistics_bulk([(fixture_id, team_stat['team']['id'], team_stat['statistics'])
+                                 for fixture_id, api_fixture in with_statistics.items()
+                                 for team_stat in api_fixture["statistics"]])
+
+    # A lezárult, mégis statisztika nélküli meccseket megjegyezzük, hogy a következő futás ne kérdezze újra
+    write_missing_statistics([fixture_id for fixture_id, api_fixture in api_fixtures.items()
+                              if fixture_id not in with_statistics
+                              and api_fixture["fixture"]["status"]["short"] in FINAL_STATUSES])
+    delete_missing_statistics(list(with_statistics))
+
+    print(f"📊 {len(with_statistics)}/{len(api_fixtures)} mérkőzéshez érkezett használható statisztika.")
+    return with_statistics
+
+def get_match_statistics_batch(match_ids):
+    """
+    A get_match_statistics több mérkőzésre: az adatbázisban meglévő statisztikákat onnan adja vissza,
+    a hiányzókat egyben, a fetch_match_statistics_batch segítségével kéri le.
+    :return: Szótár {fixture_id: statisztika lista} (adatbázis sorok, vagy az API csapatstatisztikái).
+    """
+    match_ids = list(dict.fromkeys(match_ids))
+    statistics_by_id = read_from_match_statistics_bulk(match_ids)
+    missing_ids = [match_id for match_id in match_ids if match_id not in statistics_by_id]
+
+    for fixture_id, api_fixture in fetch_match_statistics_batch(skip_known_missing_statistics(missing_ids)).items():
+        statistics_by_id[fixture_id] = api_fixture["statistics"]
+    return statistics_by_id
+
 def save_pre_match_fixtures():
     """
     Lekéri az összes NS státuszú mérkőzést az API-ból, és csak azokat menti el az adatbázisba,
     amelyekhez legalább egy odds található.
+    Inkrementális: a napi listákból a mérkőzések tartalom-hash-ét összeveti az utolsó szinkronnal.
+    Egy napot (a lapozott napi odds lekéréssel) csak akkor dolgozunk fel teljesen, ha új, vagy a vízjele
+    PRE_MATCH_RESYNC_HOURS óránál régebbi; egyébként csak a megváltozott / új mérkőzések oddsait kérjük le
+    és csak őket írjuk. A változatlan napokhoz nem kell sem odds lekérés, sem adatbázis írás.
     """
-    dates = get_next_days_dates(5)  # Következő 3 nap dátumai
-    for match_date in dates:
-        params = {
+    dates = get_next_days_dates(PRE_MATCH_SYNC_DAYS)
+    day_requests = [
+        (FIXTURES, {
             'status': 'NS',  # Csak a Not Started mérkőzések
             'timezone': 'Europe/Budapest',
             'date': match_date  # Az adott napi mérkőzések lekérése
-        }
+        })
+        for match_date in dates
+    ]
 
-        # API kérés a "fixtures" végpontra
-        data = make_api_request(FIXTURES, params)
+    # A napi listákat párhuzamosan kérjük le a "fixtures" végpontról
+    day_responses = fetch_many(day_requests)
+    watermarks = read_pre_match_sync(dates)
+    resync_before = datetime.now() - timedelta(hours=PRE_MATCH_RESYNC_HOURS)
 
+    for match_date, data in zip(dates, day_responses):
         if not data:
             print(f"❌ Nem sikerült lekérni a mérkőzéseket a dátumra: {match_date}")
             continue
 
-        fixtures = data.get('response', [])
-        for fixture in fixtures:
-            fixture_id = fixture["fixture"]["id"]
+        fixtures = {fixture.id: fixture for fixture in map(Fixture.from_api, data.get('response', []))}
+        hashes = {fixture_id: fixture.content_hash() for fixture_id, fixture in fixtures.items()}
+        synced = read_fixture_hashes(list(fixtures))
+        changed = [fixture_id for fixture_id in fixtures
+                   if synced.get(fixture_id, {}).get("content_hash") != hashes[fixture_id]]
+
+        watermark = watermarks.get(match_date)
+        full_sync = watermark is None or watermark["synced_at"] < resync_before
+        if not full_sync and not changed:
+            print(f"⏭️ Nincs változás a legutóbbi szinkron óta: {match_date} ({len(fixtures)} mérkőzés)")
+            continue
+
+        # Teljes napnál az összes Match Winner odds lapozva, egyébként csak a megváltozott mérkőzéseké
+        odds_items = fetch_odds_by_date(match_date) if full_sync else fetch_odds_for_fixtures(changed)
+        bookmakers, odds_by_fixture = parse_match_winner_odds(odds_items)
 
-            # Lekérdezzük, hogy van-e odds a mérkőzéshez
-            odds = fetch_odds_for_fixture(fixture_id)
-            if not odds:
+        checked = list(fixtures) if full_sync else changed
+        fixtures_to_save = []
+        for fixture_id in checked:
+            if fixture_id not in odds_by_fixture:
                 print(f"Nincs odds a mérkőzéshez, kihagyva: {fixture_id}")
                 continue  # Ha nincs odds, a mérkőzés kimarad
 
-            # Ha van odds, a mérkőzést elmentjük
-            fixture_data = {
-                "id": fixture["fixture"]["id"],
-                "date": fixture["fixture"]["date"],
-                "home_team_id": fixture["teams"]["home"]["id"],
-                "home_team_name": fixture["teams"]["home"]["name"],
-                "home_team_country": fixture["league"].get("country", "Unknown"),
-                "home_team_logo": fixture["teams"]["home"]["logo"],
-                "away_team_id": fixture["teams"]["away"]["id"],
-                "away_team_name": fixture["teams"]["away"]["name"],
-                "away_team_country": fixture["league"].get("country", "Unknown"),
-                "away_team_logo": fixture["teams"]["away"]["logo"],
-                "score_home": None,
-                "score_away": None,
-                "status": "NS",
-            }
-            write_to_fixtures([fixture_data])
+            # A mérkőzést csak akkor írjuk újra, ha változott, vagy eddig nem volt elmentve (nem volt oddsa)
+            if fixture_id in changed or not synced[fixture_id]["has_odds"]:
+                fixtures_to_save.append(fixtures[fixture_id].to_row())
+
+        if fixtures_to_save:
+            write_to_fixtures(fixtures_to_save)
+        odds_to_save = [odds for fixture_id in checked for odds in odds_by_fixture.get(fixture_id, [])]
+        if odds_to_save:
+            # Előbb a mérkőzések, utána a rájuk hivatkozó fogadóirodák és oddsok
+            save_bookmakers(bookmakers)
+            write_to_odds(odds_to_save)
+
+        write_pre_match_sync(match_date,
+                             [(fixture_id, hashes[fixture_id], fixture_id in odds_by_fixture) for fixture_id in checked],
+                             fixture_count=len(fixtures) if full_sync else None)
+
+        for fixture_data in fixtures_to_save:
             print(
                 f"Mérkőzés mentve: {fixture_data['id']} - {fixture_data['home_team_name']} vs {fixture_data['away_team_name']} ({match_date})")
+        print(f"🔄 {match_date}: {'teljes' if full_sync else 'részleges'} szinkron, {len(changed)} új/változott, "
+              f"{len(fixtures_to_save)} mérkőzés és {len(odds_to_save)} odds mentve.")
 
 def get_fixtures_for_team(team_id, limit=10):
     """
@@ -183,26 +353,7 @@ def get_fixtures_for_team(team_id, limit=10):
         print(f"⚠️ Nincsenek múltbeli mérkőzések az API-ban (Csapat ID: {team_id}).")
         return []
 
-    fixtures = []
-    for fixture in data['response']:
-        match_data = {
-            "id": fixture['fixture']['id'],
-            "date": fixture['fixture']['date'],
-            "home_team_id": fixture['teams']['home']['id'],
-            "home_team_name": fixture['teams']['home']['name'],
-            "home_team_country": fixture['league'].get('country', 'Unknown'),
-            "home_team_logo": fixture['teams']['home']['logo'],
-            "away_team_id": fixture['teams']['away']['id'],
-            "away_team_name": fixture['teams']['away']['name'],
-            "away_team_country": fixture['league'].get('country', 'Unknown'),
-            "away_team_logo": fixture['teams']['away']['logo'],
-            "score_home": fixture['score']['fulltime']['home'],
-            "score_away": fixture['score']['fulltime']['away'],
-            "status": fixture['fixture']['status']['short'],
-        }
-        fixtures.append(match_data)
-
-    return fixtures
+    return parse_fixtures(data['response'])
 
 def get_head_to_head_stats(home_team_id, away_team_id):
     """
@@ -233,37 +384,20 @@ def get_head_to_head_stats(home_team_id, away_team_id):
             continue
 
         # Fixture mentés előkészítése
-        fixture_data = {
-            "id": match_id,
-            "date": fixture['fixture']['date'],
-            "home_team_id": fixture['teams']['home']['id'],
-            "home_team_name": fixture['teams']['home']['name'],
-            "home_team_country": fixture['league'].get('country', 'Unknown'),
-            "home_team_logo": fixture['teams']['home']['logo'],
-            "away_team_id": fixture['teams']['away']['id'],
-            "away_team_name": fixture['teams']['away']['name'],
-            "away_team_country": fixture['league'].get('country', 'Unknown'),
-            "away_team_logo": fixture['teams']['away']['logo'],
-            "score_home": fixture.get('score', {}).get('fulltime', {}).get('home', 0),
-            "score_away": fixture.get('score', {}).get('fulltime', {}).get('away', 0),
-            "status": fixture['fixture']['status']['short']
-        }
+        fixture_data = Fixture.from_api(fixture).to_row()
 
         write_to_fixtures([fixture_data])
         print(f"📁 Fixture mentve: {match_id}")
         new_h2h_matches.append(fixture_data)
 
-        # Statok mentése külön (ha van)
-        stats = get_match_statistics(match_id)
-        if stats and any(
-                any(item.get("value") not in [None, 0, ""] for item in team["statistics"]) for team in stats
-        ):
-            for team_stat in stats:
-                team_id = team_stat['team']['id']
-                write_to_match_statistics(match_id, team_id, team_stat['statistics'])
-            print(f"✅ Statisztikák mentve: {match_id}")
+    # Statok lekérése és mentése egyben, a multi-id keresésből
+    with_statistics = fetch_match_statistics_batch(
+        skip_known_missing_statistics([match["id"] for match in new_h2h_matches]))
+    for match in new_h2h_matches:
+        if match["id"] in with_statistics:
+            print(f"✅ Statisztikák mentve: {match['id']}")
         else:
-            print(f"⚠️ Nincs statisztika vagy érvénytelen: {match_id}")
+            print(f"⚠️ Nincs statisztika vagy érvénytelen: {match['id']}")
 
     all_matches = existing_h2h_matches + new_h2h_matches
     print(f"📊 Összesen {len(all_matches)} H2H meccs visszaadva ({home_team_id} vs {away_team_id})")
@@ -282,21 +416,20 @@ def update_fixtures():
     print(f"\n🔄 Frissítendő mérkőzések száma: {len(fixtures_to_update)}")
     updates = []
 
+    # A frissítendő meccseket csomagokban kérjük le, cache nélkül (élő státusz kell)
+    api_fixtures = fetch_fixtures_by_ids([fixture["id"] for fixture in fixtures_to_update], use_cache=False)
+
     for fixture in fixtures_to_update:
         fixture_id = str(fixture["id"])
         current_status = fixture["status"]
         current_home = fixture.get("score_home")
         current_away = fixture.get("score_away")
 
-        params = {'id': fixture_id, 'timezone': 'Europe/Budapest'}
-        response = make_api_request(FIXTURES, params=params)
-
-        if not response or not response.get("response"):
+        api_fixture = api_fixtures.get(int(fixture["id"]))
+        if not api_fixture:
             print(f"⚠️ API nem adott választ a meccsre: {fixture_id}")
             continue
 
-        api_fixture = response["response"][0]
-
         new_status = api_fixture["fixture"]["status"]["short"]
         new_date = normalize_date(api_fixture["fixture"]["date"])
         home_score = api_fixture["score"]["fulltime"].get("home")
@@ -311,10 +444,11 @@ def update_fixtures():
         update_fixture_status(updates)
         print(f"\n✅ Összesen {len(updates)} mérkőzés frissítve.")
 
-        for new_status, new_date, home_score, away_score, fixture_id in updates:
-            if home_score is not None and away_score is not None:
-                evaluate_predictions(fixture_id, home_score, away_score)
+        # Egyetlen halmazalapú kiértékelés a lezárult meccsekre
+        finished_ids = [fixture_id for _, _, home_score, away_score, fixture_id in updates
+                        if home_score is not None and away_score is not None]
+        if finished_ids:
+            evaluate_predictions_for_fixtures(finished_ids)
 
     else:
         print("ℹ️ Nincs új adat a frissítéshez.")
-
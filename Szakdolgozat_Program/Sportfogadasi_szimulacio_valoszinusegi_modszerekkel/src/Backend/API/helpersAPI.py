@@ -1,10 +1,14 @@
+import threading
 from datetime import datetime, timedelta
 
 import pytz
 
-from src.Backend.API.odds import fetch_odds_for_fixture
-from src.Backend.DB.bookmakers import save_bookmakers, read_from_bookmakers
+from src.Backend.API.endpoints import ODDS
+from src.Backend.API.odds import fetch_odds_for_fixture, parse_match_winner_odds
+from src.Backend.API.raw_archive import raw_archive
+from src.Backend.DB.bookmakers import save_bookmakers, read_from_bookmakers, read_unknown_bookmaker_ids
 from src.Backend.DB.odds import odds_already_saved, write_to_odds
+from src.config import BOOKMAKER_SYNC_ARCHIVE_DAYS
 
 
 def get_next_days_dates(days=3):
@@ -39,22 +43,9 @@ def save_odds_for_fixture(fixture_id):
     bookmakers = fetch_bookmakers_from_odds(odds)
     save_bookmakers(bookmakers)
 
-    odds_to_save = []
-    for bookmaker in odds[0]["bookmakers"]:
-        if "bets" not in bookmaker:
-            continue
-
-        for bet in bookmaker["bets"]:
-            if bet["name"] == "Match Winner" and len(bet["values"]) >= 3:
-                odds_entry = {
-                    "fixture_id": fixture_id,
-                    "bookmaker_id": bookmaker["id"],
-                    "home_odds": bet["values"][0]["odd"],
-                    "draw_odds": bet["values"][1]["odd"],
-                    "away_odds": bet["values"][2]["odd"],
-                    "updated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                }
-                odds_to_save.append(odds_entry)
+    # Ugyanaz a Match Winner feldolgozás, mint a dátum szerinti odds betöltésnél
+    _, odds_by_fixture = parse_match_winner_odds(odds[:1])
+    odds_to_save = [dict(row, fixture_id=fixture_id) for rows in odds_by_fixture.values() for row in rows]
 
     if odds_to_save:
         write_to_odds(odds_to_save)
@@ -88,3 +79,40 @@ def sync_bookmakers(api_response):
         save_bookmakers(new_bookmakers)
     else:
         print("Nincsenek új vagy frissítendő fogadóirodák.")
+
+def bookmakers_are_stale():
+    """
+    A fogadóiroda lista elavult, ha üres, vagy van olyan mentett odds, amelynek az irodája hiányzik belőle.
+    (Az odds betöltés a fogadóirodákat is menti, így ez csak megszakadt vagy régi betöltés után fordul elő.)
+    """
+    return not read_from_bookmakers() or bool(read_unknown_bookmaker_ids())
+
+def sync_bookmakers_from_archive(archive=raw_archive, days=BOOKMAKER_SYNC_ARCHIVE_DAYS):
+    """
+    Fogadóirodák szinkronizálása a helyben tárolt odds válaszokból (nyers archívum), hálózati hívás nélkül.
+    Csak a legutóbbi `days` napi partíciót olvassa.
+    """
+    partitions = archive.partitions()[-days:]
+    if not partitions:
+        print("Nincsenek archivált odds válaszok a fogadóirodák szinkronizálásához.")
+        return
+
+    odds_items = [item
+                  for entry in archive.iter_entries(endpoints=[ODDS], since=partitions[0])
+                  for item in (entry["body"] or {}).get("response") or []]
+    sync_bookmakers(odds_items)
+
+def start_bookmaker_sync_if_stale():
+    """
+    Induláskor: ha a fogadóiroda lista elavult, háttérszálon szinkronizálja az archívumból,
+    így a főablak megjelenése nem vár rá.
+    :return: A háttérszál, vagy None, ha nem volt szükség szinkronra.
+    """
+    if not bookmakers_are_stale():
+        print("A fogadóirodák listája naprakész.")
+        return None
+
+    print("Fogadóirodák szinkronizálása a háttérben...")
+    thread = threading.Thread(target=sync_bookmakers_from_archive, name="bookmaker-sync", daemon=True)
+    thread.start()
+    return thread
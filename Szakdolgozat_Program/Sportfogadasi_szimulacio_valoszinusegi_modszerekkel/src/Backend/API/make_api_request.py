@@ -1,36 +1,195 @@
+import threading
 import time
+
 import requests
-from ratelimit import limits, sleep_and_retry
-from src.config import BASE_URL, API_KEY, HOST
+from requests.adapters import HTTPAdapter
+
+from src.Backend.API.cassette import start_recording, get_recorder
+from src.Backend.API.parsing import loads
+from src.Backend.API.quota_meter import api_quota_meter
+from src.Backend.API.rate_limiter import TokenBucket
+from src.Backend.API.raw_archive import raw_archive
+from src.Backend.API.request_scheduler import PriorityScheduler
+from src.Backend.API.response_cache import response_cache, make_cache_key
+from src.Backend.API.retry_policy import get_retry_policy, parse_retry_after, is_transient_error, \
+    RETRYABLE_STATUS_CODES
+from src.Backend.API.single_flight import api_single_flight
+from src.config import BASE_URL, API_KEY, HOST, API_POOL_SIZE, API_TIMEOUT, API_CACHE_ENABLED, API_BURST, \
+    API_RECORD_CASSETTE, RAW_ARCHIVE_ENABLED, PRODUCTION_BASE_URL
 
 CALLS = 300
 PERIOD = 60  # Másodperc (1 perc)
 
-@sleep_and_retry
-@limits(calls=CALLS, period=PERIOD)
-def make_api_request(endpoint, params=None):
+# Közös token bucket: minden szál és párhuzamos kérés ugyanabból a keretből fogyaszt.
+# A tokeneket prioritás szerint osztjuk ki (interaktív > frissítés > feltöltés), lásd request_scheduler.
+api_rate_limiter = PriorityScheduler(TokenBucket(CALLS, PERIOD, capacity=API_BURST))
+
+if API_RECORD_CASSETTE:
+    start_recording(API_RECORD_CASSETTE)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_api_session():
+    """
+    Visszaadja a közös, szálbiztosan létrehozott HTTP sessiont.
+    A session keep-alive kapcsolatkészletet használ, így az egymás utáni kérések
+    nem fizetik meg újra a TCP és TLS kézfogást.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=API_POOL_SIZE, pool_block=True)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    'x-apisports-key': API_KEY,
+                    'x-rapidapi-host': HOST,
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive'
+                })
+                _session = session
+    return _session
+
+
+def close_api_session():
+    """
+    Lezárja a közös sessiont és a hozzá tartozó kapcsolatokat (pl. program leállításakor).
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def is_production_api():
+    """
+    Igaz, ha a kérések a valódi API-hoz mennek. A visszajátszó szerver és a benchmark helyettesítő
+    szervere válaszai nem kerülnek a nyers archívumba, és az API keretet sem terhelik.
+    """
+    return BASE_URL == PRODUCTION_BASE_URL
+
+
+def make_api_request(endpoint, params=None, use_cache=True):
     """
     Egy API kérést indít a megadott végpontra és figyeli a rate limitet.
-    Ha eléri a 300 hívást, akkor csak a szükséges időt várja ki, nem az egész 60 másodpercet.
+    Ha a válasz már szerepel a helyi cache-ben és még érvényes, nem indít hálózati hívást.
+    Az egyidejű (és egy futási hatókörön belül ismételt) azonos kérések egyetlen hívást osztanak meg.
+    :param use_cache: False esetén mindenképp az API-t kérdezi (a friss választ ettől még elmenti).
+    Kazetta felvétel közben a cache-t és az összevonást is megkerüli, hogy minden kérés bekerüljön a kazettába.
+    """
+    if get_recorder() is not None:
+        return _cached_request(endpoint, params, use_cache=False)
+
+    return api_single_flight.do(make_cache_key(endpoint, params),
+                                lambda: _cached_request(endpoint, params, use_cache),
+                                remember=use_cache)
+
+
+def _cached_request(endpoint, params, use_cache):
+    if API_CACHE_ENABLED and use_cache:
+        cached = response_cache.get(endpoint, params)
+        if cached is not None:
+            return cached
+
+    data = _send_request(endpoint, params)
+
+    if API_CACHE_ENABLED and data is not None:
+        response_cache.put(endpoint, params, data)
+    return data
+
+
+def _send_request(endpoint, params=None):
+    """
+    Hálózati kérés a rate limit figyelembevételével, korlátos számú újrapróbálással.
+    A token bucket egyenletesen osztja el a hívásokat, így sosem kell egy teljes percet várni.
+    429 esetén a Retry-After idejére a közös limitert szüneteltetjük (minden szál egyszer vár),
+    átmeneti hibáknál (timeout, kapcsolati hiba, 5xx) exponenciális, jitteres várakozás után ismétlünk.
     """
+    policy = get_retry_policy(endpoint)
     url = f"{BASE_URL}{endpoint}"
-    headers = {
-        'x-apisports-key': API_KEY,
-        'x-rapidapi-host': HOST
-    }
+    production = is_production_api()
 
-    try:
-        response = requests.get(url, headers=headers, params=params)
+    for attempt in range(policy.max_attempts):
+        api_rate_limiter.acquire()
+
+        try:
+            response = get_api_session().get(url, params=params, timeout=API_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if not policy.can_retry_transient(attempt) or not is_transient_error(e):
+                print(f"❌ API hiba történt: {e}")
+                return None
+            delay = policy.backoff(attempt)
+            print(f"⚠️ Átmeneti API hiba ({e.__class__.__name__}), újrapróbálás {delay:.1f} mp múlva...")
+            time.sleep(delay)
+            continue
+        except requests.exceptions.RequestException as e:
+            print(f"❌ API hiba történt: {e}")
+            return None
+
+        if production:
+            api_quota_meter.record(endpoint, response.headers)
 
-        if response.status_code == 429 or "rateLimit" in response.json().get("errors", {}):
-            retry_after = int(response.headers.get("Retry-After", 60))
-            print(f"⚠️ API rate limit elérve. Várakozás {retry_after} másodpercig...")
-            time.sleep(retry_after)
-            return make_api_request(endpoint, params)
+        # A választ egyszer dekódoljuk: a rate limit ellenőrzés és a feldolgozás is ezt használja
+        try:
+            data = loads(response.content)
+        except ValueError:
+            data = None
 
-        response.raise_for_status()
-        return response.json()
+        if _is_rate_limited(response, data):
+            if not policy.has_attempts_left(attempt):
+                print(f"❌ API rate limit: a kérés {policy.max_attempts} próbálkozás után is elutasítva ({endpoint}).")
+                return None
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            wait = retry_after if retry_after is not None else policy.backoff(attempt)
+            print(f"⚠️ API rate limit elérve. Várakozás {wait:.1f} másodpercig...")
+            api_rate_limiter.pause(wait)  # A következő acquire() addig blokkol
+            continue
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ API hiba történt: {e}")
-        return None
\ No newline at end of file
+        if response.status_code in RETRYABLE_STATUS_CODES and policy.can_retry_transient(attempt):
+            delay = policy.backoff(attempt)
+            print(f"⚠️ API szerverhiba ({response.status_code}), újrapróbálás {delay:.1f} mp múlva...")
+            time.sleep(delay)
+            continue
+
+        try:
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"❌ API hiba történt: {e}")
+            return None
+        if data is None:
+            print(f"❌ API hiba történt: érvénytelen JSON válasz ({endpoint})")
+            return None
+
+        if RAW_ARCHIVE_ENABLED and production:
+            raw_archive.append(endpoint, params, data)
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.record(endpoint, params, response.status_code, response.headers, data)
+        return data
+
+    return None
+
+
+def _is_rate_limited(response, data):
+    if response.status_code == 429:
+        return True
+    try:
+        errors = data.get("errors") or {}
+    except AttributeError:
+        return False
+    return "rateLimit" in errors
+
+
+def print_scheduler_report():
+    """
+    Prioritási osztályonként kiírja a kiszolgált kéréseket, a várakozási időket és a sorhosszt.
+    """
+    for name, stats in api_rate_limiter.stats().items():
+        if stats["granted"] or stats["queued"]:
+            print(f"🚦 {name:<11} {stats['granted']:>5} kérés, várakozás átlag {stats['wait_avg']:.2f} mp, "
+                  f"max {stats['wait_max']:.2f} mp, sor most/max: {stats['queued']}/{stats['max_queued']}")
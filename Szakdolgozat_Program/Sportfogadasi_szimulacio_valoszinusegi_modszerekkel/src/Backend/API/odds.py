@@ -1,6 +1,11 @@
+from datetime import datetime
+
+from src.Backend.API.async_client import fetch_many
 from src.Backend.API.endpoints import ODDS
 from src.Backend.API.make_api_request import make_api_request
 
+MATCH_WINNER_BET_ID = 1  # Az API-ban a "Match Winner" (1X2) piac azonosítója
+
 
 def fetch_odds_for_fixture(fixture_id):
     """
@@ -21,3 +26,69 @@ def fetch_odds_for_fixture(fixture_id):
 
     print(f"Match Winner odds nem található: {fixture_id}")
     return []
+
+def fetch_odds_for_fixtures(fixture_ids):
+    """
+    Több mérkőzés Match Winner oddsai, mérkőzésenként egy (párhuzamos) hívással.
+    Akkor érdemes a napi, lapozott lekérés helyett, ha csak néhány mérkőzés oddsa kell.
+    :return: Az "response" elemek listája (a parse_match_winner_odds bemenete).
+    """
+    responses = fetch_many([(ODDS, {'fixture': fixture_id, 'bet': MATCH_WINNER_BET_ID}) for fixture_id in fixture_ids])
+    return [item for data in responses if data for item in data.get("response", [])]
+
+def fetch_odds_by_date(match_date, timezone="Europe/Budapest"):
+    """
+    Lekéri egy adott nap összes Match Winner oddsát lapozással.
+    Az első oldal megadja az oldalak számát, a többit párhuzamosan kérjük le.
+    :return: Az összes oldal "response" elemeinek listája.
+    """
+    params = {'date': match_date, 'bet': MATCH_WINNER_BET_ID, 'timezone': timezone}
+    first_page = make_api_request(ODDS, {**params, 'page': 1})
+
+    if not first_page or not first_page.get("response"):
+        print(f"Nincsenek oddsok a dátumra: {match_date}")
+        return []
+
+    odds_items = list(first_page["response"])
+    total_pages = first_page.get("paging", {}).get("total") or 1
+
+    if total_pages > 1:
+        pages = fetch_many([(ODDS, {**params, 'page': page}) for page in range(2, total_pages + 1)])
+        for page, page_data in enumerate(pages, start=2):
+            if not page_data:
+                print(f"⚠️ Hiányzó odds oldal: {match_date} ({page}/{total_pages})")
+                continue
+            odds_items.extend(page_data.get("response", []))
+
+    print(f"📥 {len(odds_items)} mérkőzés oddsai lekérve ({match_date}, {total_pages} oldal).")
+    return odds_items
+
+def parse_match_winner_odds(odds_items):
+    """
+    Egy menetben feldolgozza az odds válasz összes Match Winner piacát.
+    :param odds_items: Az API "response" listája (mérkőzésenként egy elem).
+    :return: (bookmakers, odds_by_fixture), ahol bookmakers = {id: név},
+             odds_by_fixture = {fixture_id: [odds sorok a write_to_odds formátumában]}.
+    """
+    updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    bookmakers = {}
+    odds_by_fixture = {}
+
+    for item in odds_items:
+        fixture_id = item.get("fixture", {}).get("id")
+        for bookmaker in item.get("bookmakers", []):
+            for bet in bookmaker.get("bets", []):
+                if bet.get("name") != "Match Winner" or len(bet.get("values", [])) < 3:
+                    continue
+
+                bookmakers[bookmaker["id"]] = bookmaker["name"]
+                odds_by_fixture.setdefault(fixture_id, []).append({
+                    "fixture_id": fixture_id,
+                    "bookmaker_id": bookmaker["id"],
+                    "home_odds": bet["values"][0]["odd"],
+                    "draw_odds": bet["values"][1]["odd"],
+                    "away_odds": bet["values"][2]["odd"],
+                    "updated_at": updated_at,
+                })
+
+    return bookmakers, odds_by_fixture
@@ -0,0 +1,108 @@
+"""
+Az API válaszok közös feldolgozása: gyors JSON dekódolás és típusos mérkőzés objektumok.
+
+Ha az orjson telepítve van, azzal dekódolunk (többszörösen gyorsabb a beépített json modulnál),
+különben a beépített json-ra esünk vissza. A mérkőzéseket egyetlen helyen, a Fixture.from_api
+alakítja az API formátumából a write_to_fixtures által várt sorrá.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, astuple
+
+try:
+    import orjson
+except ImportError:  # Opcionális függőség
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(payload):
+    """
+    JSON dekódolás (bytes vagy str) a leggyorsabb elérhető backenddel.
+    Hibás bemenetnél ValueError (json.JSONDecodeError) kivételt dob.
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def dumps(payload):
+    """
+    JSON kódolás str-be a leggyorsabb elérhető backenddel.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
+
+
+@dataclass(slots=True)
+class Fixture:
+    """
+    Egy mérkőzés a fixtures tábla (és a csapatok) mentéséhez szükséges mezőkkel.
+    """
+    id: int
+    date: str
+    home_team_id: int
+    home_team_name: str
+    home_team_country: str
+    home_team_logo: str
+    away_team_id: int
+    away_team_name: str
+    away_team_country: str
+    away_team_logo: str
+    score_home: int | None
+    score_away: int | None
+    status: str
+
+    @classmethod
+    def from_api(cls, api_fixture):
+        """
+        Az API `fixtures` válaszának egy eleméből (fixture / league / teams / score) készít mérkőzést.
+        Még le nem játszott mérkőzésnél az eredmény None.
+        """
+        fixture = api_fixture["fixture"]
+        teams = api_fixture["teams"]
+        home, away = teams["home"], teams["away"]
+        country = api_fixture["league"].get("country", "Unknown")
+        fulltime = (api_fixture.get("score") or {}).get("fulltime") or {}
+        return cls(
+            fixture["id"], fixture["date"],
+            home["id"], home["name"], country, home["logo"],
+            away["id"], away["name"], country, away["logo"],
+            fulltime.get("home"), fulltime.get("away"),
+            fixture["status"]["short"],
+        )
+
+    def content_hash(self):
+        """
+        A mérkőzés mentett mezőinek SHA-1 lenyomata: ha nem változik, a mérkőzést nem kell újra menteni.
+        """
+        return hashlib.sha1(repr(astuple(self)).encode()).hexdigest()
+
+    def to_row(self):
+        """
+        A write_to_fixtures által várt szótár (a mérkőzéslisták hívói is ezt a formát használják).
+        """
+        return {
+            "id": self.id,
+            "date": self.date,
+            "home_team_id": self.home_team_id,
+            "home_team_name": self.home_team_name,
+            "home_team_country": self.home_team_country,
+            "home_team_logo": self.home_team_logo,
+            "away_team_id": self.away_team_id,
+            "away_team_name": self.away_team_name,
+            "away_team_country": self.away_team_country,
+            "away_team_logo": self.away_team_logo,
+            "score_home": self.score_home,
+            "score_away": self.score_away,
+            "status": self.status,
+        }
+
+
+def parse_fixtures(api_fixtures):
+    """
+    Az API mérkőzéslistájából write_to_fixtures sorok listája.
+    """
+    return [Fixture.from_api(api_fixture).to_row() for api_fixture in api_fixtures]
@@ -0,0 +1,255 @@
+import atexit
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+from src.config import API_DAILY_RESERVE, API_USAGE_FLUSH_EVERY
+
+# Az api-sports fejlécei: napi keret (requests) és percenkénti keret (RateLimit)
+DAILY_LIMIT_HEADER = "x-ratelimit-requests-limit"
+DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+MINUTE_LIMIT_HEADER = "X-RateLimit-Limit"
+MINUTE_REMAINING_HEADER = "X-RateLimit-Remaining"
+
+
+class ApiBudgetExceeded(Exception):
+    """
+    A napi API keret (a tartalékon felül) nem elég a kért munkához.
+    """
+
+
+def _utc_today():
+    # Az API napi kerete UTC éjfélkor nullázódik
+    return datetime.now(timezone.utc).date()
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaMeter:
+    """
+    Nyilvántartja az API kvótát a válaszfejlécek alapján.
+    Minden hívás után frissíti a napi és percenkénti hátralévő keretet, a végpontonkénti
+    hívásszámokat pedig pufferelve írja az adatbázisba.
+    A háttérfeladatok a can_spend / affordable metódusokkal kérdezhetik, mennyi munka fér még bele a napba.
+    Az adatbázis írás háttérszálon fut, így egy elérhetetlen adatbázis sem lassítja az API hívásokat.
+    """
+
+    def __init__(self, reserve=API_DAILY_RESERVE, flush_every=API_USAGE_FLUSH_EVERY, writer=None, clock=_utc_today):
+        self.reserve = reserve
+        self.flush_every = flush_every
+        self._writer = writer
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pending_total = 0
+        self._since_flush_request = 0
+        self._flush_requested = threading.Event()
+        self._flush_finished = threading.Event()
+        self._flusher = None
+        self.day = clock()
+        self.daily_limit = None
+        self.daily_remaining = None
+        self.minute_limit = None
+        self.minute_remaining = None
+        self.updated_at = None
+        self.saved_calls = 0
+
+    def _roll_day(self):
+        today = self._clock()
+        if today != self.day:
+            self.day = today
+            self.daily_remaining = self.daily_limit
+
+    def record(self, endpoint, headers):
+        """
+        Egy elküldött kérés rögzítése: végpont hívásszám + a fejlécekben kapott keretek.
+        """
+        with self._lock:
+            self._roll_day()
+            key = (self.day, endpoint)
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self._pending_total += 1
+            self._since_flush_request += 1
+
+            daily_limit = _header_int(headers, DAILY_LIMIT_HEADER)
+            daily_remaining = _header_int(headers, DAILY_REMAINING_HEADER)
+            if daily_limit is not None:
+                self.daily_limit = daily_limit
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+            elif self.daily_remaining is not None:
+                self.daily_remaining = max(self.daily_remaining - 1, 0)
+
+            minute_limit = _header_int(headers, MINUTE_LIMIT_HEADER)
+            minute_remaining = _header_int(headers, MINUTE_REMAINING_HEADER)
+            if minute_limit is not None:
+                self.minute_limit = minute_limit
+            if minute_remaining is not None:
+                self.minute_remaining = minute_remaining
+
+            self.updated_at = time.time()
+            # A küszöb a kérés után nullázódik, így egy sikertelen írás nem vált ki újabbat minden hívásnál
+            flush = self._since_flush_request >= self.flush_every
+            if flush:
+                self._since_flush_request = 0
+
+        if flush:
+            self._request_flush()
+
+    def record_saved(self, calls):
+        """
+        Rögzíti, hány API hívást spórolt meg egy helyi nyilvántartás (pl. a statisztika nélküli meccsek listája).
+        """
+        with self._lock:
+            self.saved_calls += calls
+
+    def _request_flush(self):
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="api-usage-flush", daemon=True)
+                self._flusher.start()
+        self._flush_finished.clear()
+        self._flush_requested.set()
+
+    def _flush_loop(self):
+        while True:
+            self._flush_requested.wait()
+            self._flush_requested.clear()
+            self.flush()
+            self._flush_finished.set()
+
+    def wait_for_flush(self, timeout=None):
+        """
+        Megvárja a háttérben kért kiírás végét (pl. tesztekben).
+        """
+        return self._flush_finished.wait(timeout)
+
+    def remaining(self):
+        """
+        A napból még elkölthető hívások száma (None, ha még nem ismert).
+        """
+        with self._lock:
+            self._roll_day()
+            return self.daily_remaining
+
+    def available(self):
+        """
+        A tartalékon felül még szabadon elkölthető hívások (None, ha a keret nem ismert).
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return max(remaining - self.reserve, 0)
+
+    def can_spend(self, calls=1):
+        """
+        True, ha a becsült `calls` hívás belefér a napi keretbe a tartalék megtartása mellett.
+        Ismeretlen keretnél nem tartjuk vissza a munkát.
+        """
+        available = self.available()
+        return available is None or available >= calls
+
+    def require(self, calls=1):
+        """
+        Mint a can_spend, de elégtelen keretnél ApiBudgetExceeded kivételt dob.
+        """
+        if not self.can_spend(calls):
+            raise ApiBudgetExceeded(f"{calls} API hívás nem fér bele a napi keretbe.")
+
+    def affordable(self, units, calls_per_unit=1):
+        """
+        Hány egységnyi munka (pl. mérkőzés) fér bele a keretbe, ha egy egység `calls_per_unit` hívásba kerül.
+        A háttérfeladatok ezzel skálázzák le a munkát, mielőtt a napi keret elfogyna.
+        """
+        available = self.available()
+        if available is None:
+            return units
+        return min(units, available // max(calls_per_unit, 1))
+
+    def snapshot(self):
+        with self._lock:
+            self._roll_day()
+            return {
+                "day": self.day,
+                "daily_limit": self.daily_limit,
+                "daily_remaining": self.daily_remaining,
+                "minute_limit": self.minute_limit,
+                "minute_remaining": self.minute_remaining,
+                "pending_calls": self._pending_total,
+                "saved_calls": self.saved_calls,
+            }
+
+    def restore(self):
+        """
+        Visszatölti a mai napra utoljára mentett keretet, így a program újraindítása után
+        már az első hívás előtt ismert a hátralévő napi kvóta.
+        """
+        from src.Backend.DB.api_usage import read_api_quota
+
+        row = read_api_quota(self.day)
+        if row:
+            with self._lock:
+                if self.daily_remaining is None:
+                    self.daily_limit = row["daily_limit"]
+                    self.daily_remaining = row["daily_remaining"]
+        return row
+
+    def flush(self):
+        """
+        A pufferelt hívásszámok és az utolsó ismert napi keret kiírása az adatbázisba.
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            usage_rows = [(day, endpoint, calls) for (day, endpoint), calls in self._pending.items()]
+            quota = (self.day, self.daily_limit, self.daily_remaining) if self.daily_limit is not None else None
+            self._pending = {}
+            self._pending_total = 0
+
+        writer = self._writer
+        if writer is None:
+            from src.Backend.DB.api_usage import write_api_usage
+            writer = write_api_usage
+
+        if writer(usage_rows, quota):
+            return True
+
+        # Sikertelen írásnál visszatesszük a számokat, a következő flush újrapróbálja
+        with self._lock:
+            for day, endpoint, calls in usage_rows:
+                self._pending[(day, endpoint)] = self._pending.get((day, endpoint), 0) + calls
+                self._pending_total += calls
+        return False
+
+
+api_quota_meter = QuotaMeter()
+atexit.register(api_quota_meter.flush)
+
+
+def print_api_usage_report(days=1):
+    """
+    Kiírja a mai napi kvóta állapotot és az utolsó `days` nap végpontonkénti hívásszámait.
+    """
+    from src.Backend.DB.api_usage import read_api_usage
+
+    api_quota_meter.flush()
+    snapshot = api_quota_meter.snapshot()
+    if snapshot["daily_limit"] is not None:
+        print(f"📉 API napi keret: {snapshot['daily_remaining']}/{snapshot['daily_limit']} hívás maradt "
+              f"(percenként: {snapshot['minute_remaining']}/{snapshot['minute_limit']})")
+    if snapshot["saved_calls"]:
+        print(f"💾 A statisztika nélküli meccsek nyilvántartása {snapshot['saved_calls']} API hívást spórolt meg.")
+
+    today = snapshot["day"]
+    rows = read_api_usage(today - timedelta(days=days - 1), today)
+    current_day = None
+    for row in rows:
+        if row["usage_date"] != current_day:
+            current_day = row["usage_date"]
+            print(f"📅 {current_day}:")
+        print(f"   {row['endpoint']:<24} {row['calls']:>6} hívás")
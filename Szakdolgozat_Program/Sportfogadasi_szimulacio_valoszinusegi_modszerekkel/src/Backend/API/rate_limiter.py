@@ -0,0 +1,69 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Szálbiztos token bucket rate limiter.
+    A hívásokat egyenletesen osztja szét az időablakban, ahelyett hogy a keret
+    kimerülésekor egy teljes ablakot várna. A töltési sebességet úgy választjuk,
+    hogy a kezdeti löket (capacity) és a töltés együtt se lépje túl a `calls`/`period` keretet.
+    """
+
+    def __init__(self, calls, period, capacity=1):
+        if capacity >= calls:
+            raise ValueError("A löket (capacity) kisebb kell legyen, mint az időablak kerete.")
+        self.capacity = capacity
+        self.refill_rate = (calls - capacity) / period  # token / másodperc
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated_at = now
+
+    def try_acquire(self):
+        """
+        Egy tokent vesz el, ha van elérhető. Nem blokkol.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.paused_until and self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def time_until_token(self):
+        """
+        Másodpercben megadja, mennyi idő múlva lesz elérhető a következő token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            pause_wait = max(0.0, self.paused_until - now)
+            token_wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.refill_rate
+            return max(pause_wait, token_wait)
+
+    def acquire(self):
+        """
+        Blokkol, amíg nem kap egy tokent. Visszaadja a várakozással töltött időt.
+        """
+        waited = 0.0
+        while not self.try_acquire():
+            delay = max(self.time_until_token(), 0.001)
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    def pause(self, seconds):
+        """
+        Minden hívót felfüggeszt a megadott ideig (pl. ha az API 429-et küldött).
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
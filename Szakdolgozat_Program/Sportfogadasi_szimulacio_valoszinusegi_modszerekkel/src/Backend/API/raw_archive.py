@@ -0,0 +1,174 @@
+"""
+Nyers API válaszok archívuma az offline újrafeldolgozáshoz.
+
+Minden sikeres hálózati válasz egy napi partícióba kerül, végpontonként külön tömörített (gzip)
+JSON-lines fájlba: <RAW_ARCHIVE_DIR>/<YYYY-MM-DD>/<végpont>.jsonl.gz. Egy SQLite index
+(index.sqlite) végpont és normalizált paraméterek szerint mutatja meg, melyik partíció(k)ban van
+egy adott kérés válasza. Az archívum sosem lejár és nem törlődik: parser változás vagy új oszlop
+esetén a reprocess_archive parancs ebből építi újra a táblákat, hálózati hívás nélkül.
+"""
+import atexit
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.Backend.API.parsing import loads
+from src.Backend.API.response_cache import make_cache_key
+from src.config import RAW_ARCHIVE_DIR, RAW_ARCHIVE_COMMIT_EVERY
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def partition_file_name(endpoint):
+    """
+    A végpont fájlneve a partíción belül (a beágyazott végpontok '/' jele helyett '__').
+    """
+    return endpoint.replace("/", "__") + ARCHIVE_SUFFIX
+
+
+class RawArchive:
+    """
+    Hozzáfűzéses, napokra particionált nyers válasz archívum végpont / paraméter indexszel.
+    A partíciófájlok a futás végéig nyitva maradnak; egy fájl több gzip tagból is állhat (több futás).
+    Az indexet nem kérésenként véglegesítjük, hanem commit_every bejegyzésenként és flush()-kor.
+    """
+
+    def __init__(self, directory, commit_every=RAW_ARCHIVE_COMMIT_EVERY):
+        self.directory = directory
+        self.commit_every = commit_every
+        self._lock = threading.Lock()
+        self._files = {}
+        self._index = None
+        self._pending = 0  # Az indexbe írt, még nem véglegesített bejegyzések
+        self.archived = 0
+
+    def _get_index(self):
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), check_same_thread=False)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    cache_key TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    partition TEXT NOT NULL,
+                    archived_at REAL NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_entries_key ON entries (cache_key, archived_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_entries_endpoint ON entries (endpoint, partition)")
+            connection.commit()
+            self._index = connection
+        return self._index
+
+    def _get_file(self, partition, endpoint):
+        path = os.path.join(self.directory, partition, partition_file_name(endpoint))
+        file = self._files.get(path)
+        if file is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file = self._files[path] = gzip.open(path, "at", encoding="utf-8")
+        return file
+
+    def append(self, endpoint, params, body, archived_at=None):
+        """
+        Hozzáfűzi a választ a mai partícióhoz, és felveszi az indexbe.
+        """
+        archived_at = time.time() if archived_at is None else archived_at
+        partition = datetime.fromtimestamp(archived_at).strftime("%Y-%m-%d")
+        normalized = {str(key): str(value) for key, value in (params or {}).items() if value is not None}
+        key = make_cache_key(endpoint, params)
+        line = json.dumps({"key": key, "endpoint": endpoint, "params": normalized, "archived_at": archived_at,
+                           "body": body}, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+        with self._lock:
+            self._get_file(partition, endpoint).write(line)
+            index = self._get_index()
+            index.execute("INSERT INTO entries (cache_key, endpoint, params, partition, archived_at) "
+                          "VALUES (?, ?, ?, ?, ?)",
+                          (key, endpoint, json.dumps(normalized, sort_keys=True), partition, archived_at))
+            self.archived += 1
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._commit_index()
+
+    def _commit_index(self):
+        if self._index is not None and self._pending:
+            self._index.commit()
+        self._pending = 0
+
+    def flush(self):
+        """
+        Lezárja a nyitott partíciófájlokat, hogy a tartalmuk olvasható legyen (a következő írás újra megnyitja),
+        és véglegesíti az index függő bejegyzéseit.
+        """
+        with self._lock:
+            for file in self._files.values():
+                file.close()
+            self._files.clear()
+            self._commit_index()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def lookup(self, endpoint, params):
+        """
+        Az adott kérés archivált példányai: [(partíció, archived_at)], legrégebbi elöl.
+        """
+        with self._lock:
+            return self._get_index().execute(
+                "SELECT partition, archived_at FROM entries WHERE cache_key = ? ORDER BY archived_at",
+                (make_cache_key(endpoint, params),)
+            ).fetchall()
+
+    def load(self, endpoint, params):
+        """
+        A kérés legutóbb archivált válasza (vagy None), az index alapján csak egy partíciót olvas.
+        """
+        found = self.lookup(endpoint, params)
+        if not found:
+            return None
+        partition, archived_at = found[-1]
+        key = make_cache_key(endpoint, params)
+        for entry in self.iter_entries(endpoints=[endpoint], since=partition, until=partition):
+            if entry["key"] == key and entry["archived_at"] == archived_at:
+                return entry["body"]
+        return None
+
+    def partitions(self, since=None, until=None):
+        """
+        A meglévő napi partíciók ('YYYY-MM-DD') időrendben, opcionálisan szűrve (mindkét határ zárt).
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name))
+                      and (since is None or name >= since) and (until is None or name <= until))
+
+    def iter_entries(self, endpoints=None, since=None, until=None):
+        """
+        Bejegyzések ({"key", "endpoint", "params", "archived_at", "body"}) partíciónként, fájlon belül
+        időrendben. A végpontok szűrése a fájlnév alapján történik, a többi fájlt ki sem tömörítjük.
+        """
+        self.flush()
+        wanted = None if endpoints is None else {partition_file_name(endpoint) for endpoint in endpoints}
+        for partition in self.partitions(since, until):
+            directory = os.path.join(self.directory, partition)
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(ARCHIVE_SUFFIX) or (wanted is not None and name not in wanted):
+                    continue
+                with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as file:
+                    for line in file:
+                        if line.strip():
+                            yield loads(line)
+
+
+raw_archive = RawArchive(RAW_ARCHIVE_DIR)
+atexit.register(raw_archive.close)
@@ -0,0 +1,127 @@
+import contextvars
+import functools
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+# Prioritási osztályok: a kisebb érték előbb kap tokent
+INTERACTIVE = 0  # GUI műveletek, a felhasználó vár az eredményre
+REFRESH = 1      # Mérkőzés- és odds frissítés, szimuláció előkészítése
+BACKFILL = 2     # Hosszú, háttérben futó feltöltések
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", REFRESH: "refresh", BACKFILL: "backfill"}
+
+_current_priority = contextvars.ContextVar("api_request_priority", default=REFRESH)
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+@contextmanager
+def api_priority(priority):
+    """
+    A blokkban indított API kérések a megadott prioritási osztályba kerülnek.
+    A párhuzamos lekérések (async_client) a kontextussal együtt öröklik a prioritást.
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def with_priority(priority):
+    """
+    Dekorátor: a függvény teljes futása a megadott prioritási osztályban történik.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with api_priority(priority):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class PriorityScheduler:
+    """
+    Prioritásos ütemező a token bucket fölött: ha többen várnak tokenre, mindig a legmagasabb
+    prioritású (azon belül a legrégebben várakozó) kérés kapja a következőt. Így egy GUI kattintás
+    nem áll be a több száz háttérkérés mögé, a közös percenkénti keret pedig változatlan.
+    Osztályonként nyilvántartja a sor mélységét és a várakozási időket.
+    """
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._stats = {priority: {"queued": 0, "max_queued": 0, "granted": 0, "wait_total": 0.0, "wait_max": 0.0}
+                       for priority in PRIORITY_NAMES}
+
+    def acquire(self, priority=None):
+        """
+        Blokkol, amíg a kérés sorra nem kerül és tokent nem kap. Visszaadja a várakozással töltött időt.
+        :param priority: Prioritási osztály; alapértelmezés az aktuális kontextusé (api_priority).
+        """
+        priority = current_priority() if priority is None else priority
+        entry = (priority, next(self._sequence))
+        stats = self._stats[priority]
+        started = time.monotonic()
+
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            stats["queued"] += 1
+            stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+            try:
+                while True:
+                    if self._waiting[0] == entry:
+                        if self.bucket.try_acquire():
+                            break
+                        # Csak a sor eleje figyeli a bucketet, a többiek értesítésre várnak
+                        self._condition.wait(max(self.bucket.time_until_token(), 0.001))
+                    else:
+                        self._condition.wait()
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                stats["queued"] -= 1
+                self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            stats["granted"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+        return waited
+
+    def pause(self, seconds):
+        """
+        Minden hívót felfüggeszt a megadott ideig (lásd TokenBucket.pause).
+        """
+        self.bucket.pause(seconds)
+        with self._condition:
+            self._condition.notify_all()
+
+    def queue_depths(self):
+        with self._condition:
+            return {PRIORITY_NAMES[priority]: stats["queued"] for priority, stats in self._stats.items()}
+
+    def stats(self):
+        """
+        Osztályonként: aktuális és legnagyobb sorhossz, kiszolgált kérések, átlagos és legnagyobb várakozás (mp).
+        """
+        with self._condition:
+            return {
+                PRIORITY_NAMES[priority]: {
+                    "queued": stats["queued"],
+                    "max_queued": stats["max_queued"],
+                    "granted": stats["granted"],
+                    "wait_avg": stats["wait_total"] / stats["granted"] if stats["granted"] else 0.0,
+                    "wait_max": stats["wait_max"],
+                }
+                for priority, stats in self._stats.items()
+            }
+
@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.Backend.API.endpoints import FIXTURES, HEAD_TO_HEAD, FIXTURE_STATISTICS, ODDS, TEAMS, TEAM_STATISTICS, \
+    LEAGUES
+from src.Backend.API.parsing import loads, dumps
+from src.config import API_CACHE_PATH, API_CACHE_NS_TTL, API_CACHE_LIVE_TTL, API_CACHE_ODDS_TTL
+
+FINAL_STATUSES = {"FT", "AET", "PEN", "CANC", "ABD", "AWD", "WO"}
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"}
+
+NEVER_EXPIRES = None  # TTL érték: a bejegyzés soha nem jár le
+DO_NOT_CACHE = 0      # TTL érték: a választ nem mentjük
+
+DAY = 24 * 60 * 60
+STATISTICS_TTL = 60 * 60          # Ha nem tudjuk, hogy a meccs véget ért-e
+ROLLING_LIST_TTL = 6 * 60 * 60    # last/next/h2h listák: a csapat következő meccsével bővülnek
+TEAM_STATISTICS_TTL = 12 * 60 * 60
+STATIC_TTL = 7 * DAY              # Csapatok, ligák: ritkán változnak
+DEFAULT_TTL = 10 * 60
+
+
+class ResponseCache:
+    """
+    Perzisztens, SQLite alapú cache az API válaszokhoz.
+    A kulcs a végpont és a normalizált paraméterek, a lejárat végpontonként eltérő.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.endpoint_counters = {}
+
+    def _get_connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS fixture_status (
+                    fixture_id INTEGER PRIMARY KEY,
+                    status TEXT NOT NULL
+                )
+            """)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _count(self, endpoint, counter):
+        counters = self.endpoint_counters.setdefault(endpoint, {"hits": 0, "misses": 0})
+        counters[counter] += 1
+
+    def get(self, endpoint, params):
+        """
+        Visszaadja a cache-elt választ, ha van érvényes bejegyzés, különben None-t.
+        """
+        key = make_cache_key(endpoint, params)
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT payload, expires_at FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                self.misses += 1
+                self._count(endpoint, "misses")
+                return None
+
+            self.hits += 1
+            self._count(endpoint, "hits")
+        return loads(row[0])
+
+    def put(self, endpoint, params, payload):
+        """
+        Elmenti a választ a végponthoz tartozó TTL szabály szerint.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            self._remember_fixture_statuses(connection, endpoint, payload)
+
+            ttl = self._ttl_for(connection, endpoint, params, payload)
+            if ttl == DO_NOT_CACHE:
+                connection.commit()
+                return
+
+            now = time.time()
+            expires_at = None if ttl is NEVER_EXPIRES else now + ttl
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, endpoint, payload, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (make_cache_key(endpoint, params), endpoint, dumps(payload), now, expires_at)
+            )
+            connection.commit()
+            self.stores += 1
+
+    def _remember_fixture_statuses(self, connection, endpoint, payload):
+        # A mérkőzéslisták státuszait megjegyezzük, így a statisztika TTL-je is tudja, véget ért-e a meccs
+        if endpoint not in (FIXTURES, HEAD_TO_HEAD):
+            return
+        rows = [(fixture_id, status) for fixture_id, status in _fixture_statuses(payload) if fixture_id]
+        if rows:
+            connection.executemany("INSERT OR REPLACE INTO fixture_status (fixture_id, status) VALUES (?, ?)", rows)
+
+    def _ttl_for(self, connection, endpoint, params, payload):
+        if not payload or payload.get("errors") or not payload.get("response"):
+            return DO_NOT_CACHE
+
+        if endpoint in (FIXTURES, HEAD_TO_HEAD):
+            statuses = {status for _, status in _fixture_statuses(payload)}
+            if statuses and statuses <= FINAL_STATUSES:
+                # Csak a rögzített halmazt lekérő válasz végleges; a "legutóbbi N meccs" listák változnak
+                return NEVER_EXPIRES if _is_fixed_selection(params) else ROLLING_LIST_TTL
+            if statuses & LIVE_STATUSES:
+                return API_CACHE_LIVE_TTL
+            return API_CACHE_NS_TTL
+
+        if endpoint == FIXTURE_STATISTICS:
+            fixture_id = (params or {}).get("fixture")
+            row = connection.execute(
+                "SELECT status FROM fixture_status WHERE fixture_id = ?", (_to_int(fixture_id),)
+            ).fetchone()
+            if row and row[0] in FINAL_STATUSES:
+                return NEVER_EXPIRES
+            return STATISTICS_TTL
+
+        if endpoint == ODDS:
+            return API_CACHE_ODDS_TTL
+        if endpoint == TEAM_STATISTICS:
+            return TEAM_STATISTICS_TTL
+        if endpoint in (TEAMS, LEAGUES):
+            return STATIC_TTL
+        return DEFAULT_TTL
+
+    def purge_expired(self):
+        """
+        Törli a lejárt bejegyzéseket, és visszaadja a törölt sorok számát.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            cursor = connection.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            connection.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "per_endpoint": {endpoint: dict(counters) for endpoint, counters in self.endpoint_counters.items()}
+        }
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def make_cache_key(endpoint, params):
+    """
+    Végpont + normalizált (rendezett, szöveggé alakított) paraméterek -> cache kulcs.
+    """
+    normalized = {str(key): str(value) for key, value in (params or {}).items() if value is not None}
+    return f"{endpoint}?{json.dumps(normalized, sort_keys=True, separators=(',', ':'))}"
+
+
+def _fixture_statuses(payload):
+    for item in payload.get("response", []) or []:
+        fixture = item.get("fixture", {}) if isinstance(item, dict) else {}
+        yield fixture.get("id"), fixture.get("status", {}).get("short")
+
+
+def _is_fixed_selection(params):
+    """
+    True, ha a lekérés tartalma idővel nem bővülhet: azonosító(k) szerinti lekérés
+    vagy egy már lezárult dátum / dátumtartomány.
+    """
+    params = params or {}
+    if params.get("id") or params.get("ids"):
+        return True
+    if any(params.get(key) for key in ("last", "next", "h2h")):
+        return False
+    today = datetime.now().date().isoformat()
+    closed_until = params.get("date") or params.get("to")
+    return bool(closed_until) and str(closed_until) < today
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+response_cache = ResponseCache(API_CACHE_PATH)
+
+
+def get_cache_stats():
+    """
+    Visszaadja a cache találati számlálóit.
+    """
+    return response_cache.stats()
+
+
+def print_cache_report(calls_per_minute=300):
+    """
+    Kiírja, hány API hívást takarított meg a cache a percenkénti kerethez képest.
+    """
+    stats = response_cache.stats()
+    print(f"🗄️ API cache: {stats['hits']} találat, {stats['misses']} hiány "
+          f"({stats['hit_ratio']:.0%} találati arány)")
+    print(f"💰 Megtakarított hívások: {stats['hits']} "
+          f"(≈ {stats['hits'] / calls_per_minute:.1f} perc a {calls_per_minute}/perc keretből)")
+    for endpoint, counters in sorted(stats["per_endpoint"].items()):
+        print(f"   • {endpoint}: {counters['hits']} találat / {counters['misses']} hiány")
@@ -0,0 +1,102 @@
+import random
+import socket
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:  # urllib3 < 2
+    NameResolutionError = None
+
+from src.Backend.API.endpoints import LEAGUES, TEAMS, FIXTURES, ODDS, FIXTURE_STATISTICS, HEAD_TO_HEAD, \
+    TEAM_STATISTICS
+
+# Átmeneti szerverhibák, amelyeknél az ismétlés értelmes
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """
+    Egy végpont újrapróbálási szabályai.
+    A várakozás exponenciálisan nő, "full jitter"-rel: a [0, min(max_delay, base_delay * 2^kísérlet)]
+    intervallumból véletlenszerűen választunk, így a párhuzamos szálak nem egyszerre próbálkoznak újra.
+    :param idempotent: Csak idempotens kéréseket ismétlünk átmeneti hiba (timeout, 5xx) után.
+                       A rate limit (429) esetén a kérés nem futott le, így azt mindig ismételhetjük.
+    """
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, idempotent=True, rng=random.uniform):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idempotent = idempotent
+        self._rng = rng
+
+    def backoff(self, attempt):
+        """
+        Várakozási idő (másodperc) a `attempt`-edik (0-tól számolt) sikertelen kísérlet után.
+        """
+        return self._rng(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def has_attempts_left(self, attempt):
+        return attempt + 1 < self.max_attempts
+
+    def can_retry_transient(self, attempt):
+        return self.idempotent and self.has_attempts_left(attempt)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+# Végpontonkénti szabályok; minden jelenlegi végpont olvasó (GET), így idempotens
+ENDPOINT_RETRY_POLICIES = {
+    LEAGUES: RetryPolicy(max_attempts=5),
+    TEAMS: RetryPolicy(max_attempts=5),
+    TEAM_STATISTICS: RetryPolicy(max_attempts=4),
+    FIXTURES: RetryPolicy(max_attempts=5),
+    FIXTURE_STATISTICS: RetryPolicy(max_attempts=4),
+    HEAD_TO_HEAD: RetryPolicy(max_attempts=4),
+    ODDS: RetryPolicy(max_attempts=3),
+}
+
+
+def get_retry_policy(endpoint):
+    return ENDPOINT_RETRY_POLICIES.get(endpoint, DEFAULT_RETRY_POLICY)
+
+
+def parse_retry_after(value):
+    """
+    A Retry-After fejléc értéke másodpercben (szám vagy HTTP dátum formátumban), vagy None.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_transient_error(error):
+    """
+    Eldönti, hogy egy kapcsolati hiba átmeneti-e. A névfeloldási hiba (DNS, nincs hálózat)
+    nem múlik el néhány másodperc alatt, ezért azt nem ismételjük.
+    """
+    seen = set()
+    stack = [error]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, BaseException) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, socket.gaierror):
+            return False
+        if NameResolutionError is not None and isinstance(current, NameResolutionError):
+            return False
+        stack.extend([getattr(current, "reason", None), current.__cause__, current.__context__])
+        stack.extend(arg for arg in getattr(current, "args", ()) if isinstance(arg, BaseException))
+    return True
@@ -0,0 +1,111 @@
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Összevonja az azonos kulcsú, egyidejű hívásokat: csak az első hívó indít valódi kérést,
+    a többiek megvárják és megkapják ugyanazt az eredményt.
+    Egy futási hatókörön (run_scope) belül a már lefutott hívások eredményét is megjegyzi,
+    így az ismételt azonos kérések sem mennek ki újra. A hatókör a megnyitó szál (kontextus)
+    sajátja: más szálak (pl. a GUI és a háttérfeladatok) hívásait nem jegyzi meg, csak a
+    hatókörből indított párhuzamos hívásokét (lásd async_client).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._scope = contextvars.ContextVar(f"single_flight_scope_{id(self)}", default=None)
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key, func, remember=True):
+        """
+        Lefuttatja a `func`-ot a kulcshoz, vagy visszaadja egy már futó / lefutott azonos hívás eredményét.
+        :param remember: False esetén friss eredmény kell: nem használjuk és nem bővítjük a hatókör memóját,
+                         és csak másik friss (remember=False) híváshoz csatlakozunk.
+        """
+        memo = self._scope.get() if remember else None
+        flight_key = key if remember else (key, "fresh")
+
+        with self._lock:
+            if memo is not None and key in memo:
+                self.deduplicated += 1
+                return memo[key]
+
+            call = self._in_flight.get(flight_key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._in_flight[flight_key] = call
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            return call.result
+
+        try:
+            call.result = func()
+        finally:
+            with self._lock:
+                del self._in_flight[flight_key]
+                if memo is not None and call.result is not None:
+                    memo[key] = call.result
+            call.done.set()
+        return call.result
+
+    @contextmanager
+    def run_scope(self):
+        """
+        Futási hatókör (pl. egy szimuláció előkészítése): a hatókörön belül az azonos kérések
+        eredménye újrahasznosul. Egymásba ágyazható, a memó a legkülső hatókör végén törlődik.
+        """
+        if self._scope.get() is not None:
+            yield self
+            return
+
+        token = self._scope.set({})
+        try:
+            yield self
+        finally:
+            self._scope.reset(token)
+
+    def stats(self):
+        return {"executed": self.executed, "deduplicated": self.deduplicated}
+
+
+api_single_flight = SingleFlight()
+
+
+def api_run_scope():
+    """
+    Rövidítés: `with api_run_scope(): ...` – a blokkban az azonos API kérések egyszer mennek ki.
+    """
+    return api_single_flight.run_scope()
+
+
+def run_scoped(func):
+    """
+    Dekorátor: a függvény teljes futása egy API futási hatókörben történik.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with api_run_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def print_single_flight_report():
+    stats = api_single_flight.stats()
+    print(f"🔁 Összevont API kérések: {stats['deduplicated']} megspórolt duplikátum "
+          f"({stats['executed']} egyedi kérés mellett)")
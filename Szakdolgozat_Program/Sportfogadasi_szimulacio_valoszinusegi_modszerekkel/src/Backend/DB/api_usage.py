@@ -0,0 +1,89 @@
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection
+
+
+def write_api_usage(usage_rows, quota=None):
+    """
+    Hozzáadja a hívásszámokat a napi, végpontonkénti nyilvántartáshoz.
+    :param usage_rows: Lista (usage_date, endpoint, calls) tuple-ökből.
+    :param quota: Opcionális (usage_date, daily_limit, daily_remaining) az utolsó ismert fejlécek alapján.
+    """
+    # Egyetlen próbálkozás: a nyilvántartás nem tarthatja fel az API hívásokat vagy a kilépést
+    connection = get_db_connection(retries=1)
+    if connection is None:
+        return False
+
+    cursor = connection.cursor()
+    try:
+        if usage_rows:
+            cursor.executemany("""
+                INSERT INTO api_usage (usage_date, endpoint, calls)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE calls = calls + VALUES(calls)
+            """, usage_rows)
+        if quota:
+            cursor.execute("""
+                INSERT INTO api_quota (usage_date, daily_limit, daily_remaining, updated_at)
+                VALUES (%s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE daily_limit = VALUES(daily_limit),
+                    daily_remaining = VALUES(daily_remaining), updated_at = VALUES(updated_at)
+            """, quota)
+        connection.commit()
+        return True
+    except mysql.connector.Error as err:
+        print(f"Database write error for api usage: {err}")
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def read_api_quota(usage_date):
+    """
+    Visszaadja az adott napra utoljára rögzített kvóta állapotot (vagy None-t).
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return None
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT q.daily_limit, q.daily_remaining, q.updated_at,
+                   (SELECT COALESCE(SUM(u.calls), 0) FROM api_usage u WHERE u.usage_date = q.usage_date) AS calls
+            FROM api_quota q
+            WHERE q.usage_date = %s
+        """, (usage_date,))
+        return cursor.fetchone()
+    except mysql.connector.Error as err:
+        print(f"Database read error for api quota: {err}")
+        return None
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def read_api_usage(from_date, to_date=None):
+    """
+    Napi, végpontonkénti hívásszámok a megadott időszakra, a legtöbbet fogyasztó végpontokkal elöl.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return []
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT usage_date, endpoint, calls
+            FROM api_usage
+            WHERE usage_date BETWEEN %s AND %s
+            ORDER BY usage_date DESC, calls DESC
+        """, (from_date, to_date or from_date))
+        return cursor.fetchall()
+    except mysql.connector.Error as err:
+        print(f"Database read error for api usage: {err}")
+        return []
+    finally:
+        cursor.close()
+        connection.close()
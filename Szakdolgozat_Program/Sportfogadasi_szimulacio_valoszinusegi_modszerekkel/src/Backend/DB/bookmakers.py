@@ -40,4 +40,28 @@ def read_from_bookmakers():
         return []
     finally:
         cursor.close()
-        connection.close()
\ No newline at end of file
+        connection.close()
+
+def read_unknown_bookmaker_ids():
+    """
+    Azok a fogadóiroda azonosítók, amelyekhez van mentett odds, de a bookmakers táblában nem szerepelnek.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT DISTINCT o.bookmaker_id
+            FROM odds o
+            LEFT JOIN bookmakers b ON b.id = o.bookmaker_id
+            WHERE b.id IS NULL
+        """)
+        return [row[0] for row in cursor.fetchall()]
+    except mysql.connector.Error as err:
+        print(f"Database read error for bookmakers: {err}")
+        return []
+    finally:
+        cursor.close()
+        connection.close()
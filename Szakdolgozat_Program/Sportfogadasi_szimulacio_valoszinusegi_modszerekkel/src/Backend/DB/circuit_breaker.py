@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Közös állapotú megszakító az adatbázis kapcsolathoz.
+
+    Zárt állapotban minden hívás átmegy. `failure_threshold` egymást követő sikertelen csatlakozás
+    után kinyit: ilyenkor a hívók azonnal hibát kapnak (nem várnak kapcsolódási időtúllépésre).
+    Kinyitáskor egyetlen háttérszál `probe_interval` másodpercenként lefuttatja a `probe` függvényt;
+    az első sikeres próba után a megszakító bezár, és a hívások ismét átmennek.
+    """
+
+    def __init__(self, probe, failure_threshold=3, probe_interval=2.0, name="db"):
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.name = name
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_thread = None
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        """
+        True, ha a hívás megpróbálhatja a csatlakozást; nyitott megszakítónál False (és számoljuk).
+        """
+        if self._opened_at is None:
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        """
+        Egy sikertelen csatlakozás rögzítése; a küszöb elérésekor kinyit és elindítja a próbaszálat.
+        :return: True, ha a megszakító (most vagy már korábban) nyitva van.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures < self.failure_threshold:
+                return self._opened_at is not None
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            self._stop.clear()
+            self._probe_thread = threading.Thread(target=self._probe_until_recovered,
+                                                  name=f"{self.name}-circuit-probe", daemon=True)
+            self._probe_thread.start()
+        print(f"⛔ Az adatbázis nem elérhető ({self._failures} sikertelen próbálkozás): a hívások azonnal "
+              f"hibával térnek vissza, {self.probe_interval:g} mp-enként ellenőrizzük a helyreállást.")
+        return True
+
+    def _probe_until_recovered(self):
+        while not self._stop.wait(self.probe_interval):
+            try:
+                recovered = self.probe()
+            except Exception:
+                recovered = False
+            if recovered:
+                with self._lock:
+                    outage = time.monotonic() - self._opened_at
+                    self._opened_at = None
+                    self._failures = 0
+                print(f"✅ Az adatbázis újra elérhető ({outage:.1f} mp kiesés után).")
+                return
+
+    def stop(self):
+        """
+        Leállítja a próbaszálat (pl. tesztek végén); az állapot nem változik.
+        """
+        self._stop.set()
+        thread = self._probe_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
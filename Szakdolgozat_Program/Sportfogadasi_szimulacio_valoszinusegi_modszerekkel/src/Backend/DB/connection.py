@@ -1,19 +1,102 @@
-import mysql.connector
+import threading
 import time
-from src.config import DB_CONFIG
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import pooling
+
+from src.Backend.DB.circuit_breaker import CircuitBreaker
+from src.config import DB_CONFIG, DB_POOL_NAME, DB_POOL_SIZE, DB_POOL_RESET_SESSION, DB_POOL_CHECKOUT_TIMEOUT, \
+    DB_CONNECT_TIMEOUT, DB_CIRCUIT_FAILURE_THRESHOLD, DB_CIRCUIT_PROBE_INTERVAL
+
+POOL_WAIT_STEP = 0.01  # Másodperc két próbálkozás között, ha minden kapcsolat foglalt
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_db_pool():
+    """
+    Visszaadja a folyamat közös, szálbiztosan létrehozott kapcsolatkészletét.
+    A készlet az első kéréskor nyitja meg a DB_POOL_SIZE kapcsolatot; kiadáskor a kapcsolatot pingeli,
+    és ha megszakadt, újracsatlakozik (health check), visszaadáskor pedig alaphelyzetbe állítja a sessiont.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(pool_name=DB_POOL_NAME, pool_size=DB_POOL_SIZE,
+                                                    pool_reset_session=DB_POOL_RESET_SESSION,
+                                                    connection_timeout=DB_CONNECT_TIMEOUT, **DB_CONFIG)
+    return _pool
+
+
+def _checkout(pool):
+    """
+    Kapcsolat kivétele a készletből. Ha mind foglalt, legfeljebb DB_POOL_CHECKOUT_TIMEOUT másodpercig vár.
+    """
+    deadline = time.monotonic() + DB_POOL_CHECKOUT_TIMEOUT
+    while True:
+        try:
+            return pool.get_connection()
+        except mysql.connector.errors.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(POOL_WAIT_STEP)
+
+
+def _probe_database():
+    """
+    A megszakító háttérpróbája: sikerül-e kapcsolatot kivenni (és újranyitni) a készletből.
+    """
+    _checkout(get_db_pool()).close()
+    return True
+
+
+# Közös állapot: ha az adatbázis leállt, nem minden hívó várja ki külön a kapcsolódási időtúllépést
+db_circuit_breaker = CircuitBreaker(_probe_database, failure_threshold=DB_CIRCUIT_FAILURE_THRESHOLD,
+                                    probe_interval=DB_CIRCUIT_PROBE_INTERVAL)
+
 
 def get_db_connection(retries=10, delay=5):
     """
-    Megpróbál csatlakozni az adatbázishoz, legfeljebb `retries` alkalommal.
-    Ha nem sikerül, None-t ad vissza.
+    Kapcsolatot ad a közös kapcsolatkészletből, legfeljebb `retries` próbálkozással.
+    A kapcsolat close() hívása nem bontja a kapcsolatot, csak visszaadja a készletbe.
+    Ha az adatbázis leállt (nyitott megszakító), várakozás nélkül None-t ad vissza;
+    a helyreállást egyetlen háttérpróba figyeli. Ha nem sikerül, None-t ad vissza.
     """
     for attempt in range(1, retries+1):
+        if not db_circuit_breaker.allow():
+            return None
         try:
-            connection = mysql.connector.connect(**DB_CONFIG)
+            connection = _checkout(get_db_pool())
+            db_circuit_breaker.record_success()
             return connection
+        except mysql.connector.errors.PoolError as err:
+            # Minden kapcsolat foglalt: az adatbázis elérhető, ez nem számít a megszakító hibái közé
+            print(f"Adatbázis kapcsolatkészlet hiba: {err} (próba: {attempt}/{retries})")
+            if attempt < retries:
+                time.sleep(delay)
         except mysql.connector.Error as err:
             print(f"Adatbázis hiba: {err} (próba: {attempt}/{retries})")
+            if db_circuit_breaker.record_failure():
+                return None
             if attempt < retries:
                 time.sleep(delay)
     # Ha idáig eljutunk, nem sikerült a csatlakozás
     return None
+
+
+@contextmanager
+def db_connection():
+    """
+    Kontextuskezelős kapcsolat kivétel: a blokk végén a kapcsolat visszakerül a készletbe.
+        with db_connection() as connection:
+            if connection is None: ...
+    """
+    connection = get_db_connection()
+    try:
+        yield connection
+    finally:
+        if connection is not None:
+            connection.close()
@@ -1,10 +1,22 @@
+import contextvars
+from contextlib import contextmanager
+
 import mysql.connector
 from src.Backend.DB.connection import get_db_connection
-from src.Backend.DB.statistics import read_from_match_statistics
-from src.Backend.DB.teams import get_or_create_team
+from src.Backend.DB.teams import upsert_teams
+from src.config import DB_IN_CHUNK_SIZE
 
 
 def write_to_fixtures(data):
+    """
+    Mérkőzések tömeges mentése egy tranzakcióban: előbb a bennük szereplő csapatok egyetlen többsoros
+    upserttel, majd a mérkőzések egy executemany hívással (a connector ezt egy többsoros INSERT-té
+    alakítja), így egy szezonnyi mérkőzés is néhány adatbázis körút.
+    """
+    data = list(data)
+    if not data:
+        return
+
     connection = get_db_connection()
     if connection is None:
         return
@@ -17,28 +29,25 @@ def write_to_fixtures(data):
         away_team_id=VALUES(away_team_id), score_home=VALUES(score_home), 
         score_away=VALUES(score_away), status=VALUES(status)
     """
+    teams = {}
+    fixture_rows = []
+    for fixture in data:
+        # Csapatonként egy sor (az utolsó előfordulás adataival)
+        teams[fixture['home_team_id']] = (fixture['home_team_id'], fixture['home_team_name'],
+                                          fixture['home_team_country'], fixture['home_team_logo'])
+        teams[fixture['away_team_id']] = (fixture['away_team_id'], fixture['away_team_name'],
+                                          fixture['away_team_country'], fixture['away_team_logo'])
+
+        status = fixture['status']['short'] if isinstance(fixture['status'], dict) else fixture['status']
+        fixture_rows.append((fixture['id'], fixture['date'], fixture['home_team_id'], fixture['away_team_id'],
+                             fixture['score_home'], fixture['score_away'], status))
     try:
-        for fixture in data:
-            home_team_id = fixture['home_team_id']
-            away_team_id = fixture['away_team_id']
-
-                # Csapatok létezésének ellenőrzése vagy létrehozása
-            get_or_create_team(home_team_id, fixture['home_team_name'], fixture['home_team_country'], fixture['home_team_logo'])
-            get_or_create_team(away_team_id, fixture['away_team_name'], fixture['away_team_country'], fixture['away_team_logo'])
-
-            status = fixture['status']['short'] if isinstance(fixture['status'], dict) else fixture['status']
-            # Mérkőzés beszúrása
-            cursor.execute(query, (
-                    fixture['id'],
-                    fixture['date'],
-                    home_team_id,
-                    away_team_id,
-                    fixture['score_home'],
-                    fixture['score_away'],
-                    status
-                ))
+        upsert_teams(cursor, list(teams.values()))
+        cursor.executemany(query, fixture_rows)
         connection.commit()
+        _invalidate_prefetched_history(teams)
     except mysql.connector.Error as err:
+        connection.rollback()
         print(f"Adatbázis írási hiba mérkőzések esetén: {err}")
     finally:
         cursor.close()
@@ -137,6 +146,48 @@ def get_fixtures_with_updatable_status():
         connection.close()
 
 
+# Egy csapat utolsó mérkőzései. A "home_team_id = ? OR away_team_id = ?" feltétel helyett két, a
+# (home_team_id, date) ill. (away_team_id, date) indexen futó ágat fűzünk össze (lásd migrations.py).
+# A "<=>" NULL esetén (nincs kizárt ellenfél) egyik mérkőzést sem zárja ki.
+LAST_MATCHES_QUERY = """
+    SELECT f.id, f.date,
+           f.home_team_id, ht.name AS home_team_name,
+           f.away_team_id, at.name AS away_team_name,
+           f.score_home, f.score_away, f.status
+    FROM (
+        (SELECT id, date, home_team_id, away_team_id, score_home, score_away, status
+         FROM fixtures
+         WHERE home_team_id = %s AND date < NOW() AND NOT (away_team_id <=> %s)
+         ORDER BY date DESC LIMIT %s)
+        UNION ALL
+        (SELECT id, date, home_team_id, away_team_id, score_home, score_away, status
+         FROM fixtures
+         WHERE away_team_id = %s AND date < NOW() AND NOT (home_team_id <=> %s)
+         ORDER BY date DESC LIMIT %s)
+    ) f
+    JOIN teams ht ON f.home_team_id = ht.id
+    JOIN teams at ON f.away_team_id = at.id
+    ORDER BY f.date DESC
+    LIMIT %s
+"""
+
+# Egymás elleni mérkőzések, csak a statisztikával rendelkezők (a match_statistics kulcsán futó EXISTS)
+HEAD_TO_HEAD_QUERY = """
+    SELECT f.id, f.date, 
+           f.home_team_id, ht.name AS home_team_name, 
+           f.away_team_id, at.name AS away_team_name, 
+           f.score_home, f.score_away, f.status
+    FROM fixtures f
+    JOIN teams ht ON f.home_team_id = ht.id
+    JOIN teams at ON f.away_team_id = at.id
+    WHERE ((f.home_team_id = %s AND f.away_team_id = %s) 
+        OR (f.home_team_id = %s AND f.away_team_id = %s))
+        AND f.date < NOW()
+        AND EXISTS (SELECT 1 FROM match_statistics ms WHERE ms.fixture_id = f.id)
+    ORDER BY f.date DESC
+"""
+
+
 def get_last_matches(team_id, opponent_id=None, num_matches=10):
     """
     Lekéri egy csapat utolsó X mérkőzését az adatbázisból, kizárva azokat, ahol az ellenfél az opponent_id.
@@ -146,6 +197,11 @@ def get_last_matches(team_id, opponent_id=None, num_matches=10):
     :param num_matches: Hány mérkőzést kérjünk le (alapértelmezett: 10).
     :return: Lista a csapat legutóbbi X mérkőzéséről.
     """
+    opponent = opponent_id or None
+    matches = _prefetched_last_matches(team_id, opponent, num_matches)
+    if matches is not None:
+        return matches
+
     connection = get_db_connection()
     if connection is None:
         print("❌ Nem sikerült csatlakozni az adatbázishoz.")
@@ -154,28 +210,9 @@ def get_last_matches(team_id, opponent_id=None, num_matches=10):
     cursor = connection.cursor(dictionary=True)
 
     try:
-        query = """
-                SELECT f.id, f.date, 
-                       f.home_team_id, ht.name AS home_team_name, 
-                       f.away_team_id, at.name AS away_team_name, 
-                       f.score_home, f.score_away, f.status
-                FROM fixtures f
-                JOIN teams ht ON f.home_team_id = ht.id
-                JOIN teams at ON f.away_team_id = at.id
-                WHERE (f.home_team_id = %s OR f.away_team_id = %s)
-                AND f.date < NOW()
-        """
-
-        # Ha van megadott ellenfél (opponent_id), kizárjuk azokat a mérkőzéseket
-        params = [team_id, team_id]
-        if opponent_id:
-            query += " AND NOT (f.home_team_id = %s AND f.away_team_id = %s) AND NOT (f.home_team_id = %s AND f.away_team_id = %s)"
-            params.extend([opponent_id, team_id, team_id, opponent_id])
-
-        query += " ORDER BY f.date DESC LIMIT %s"
-        params.append(num_matches)
-
-        cursor.execute(query, tuple(params))
+        # Ha van megadott ellenfél (opponent_id), kizárjuk az ellene játszott mérkőzéseket
+        cursor.execute(LAST_MATCHES_QUERY, (team_id, opponent, num_matches, team_id, opponent, num_matches,
+                                            num_matches))
         matches = cursor.fetchall()
 
         if not matches:
@@ -193,6 +230,149 @@ def get_last_matches(team_id, opponent_id=None, num_matches=10):
         cursor.close()
         connection.close()
 
+def last_matches_bulk_query(team_count, excluded_count=0):
+    """
+    Több csapat utolsó mérkőzései egy lekérdezésben. A két UNION ág csapatonként egy-egy sort ad
+    (csapat, ellenfél, mérkőzés) a (home_team_id, date) ill. (away_team_id, date) indexeken, a
+    ROW_NUMBER() csapatonként dátum szerint csökkenően számozza őket, és csak az első %s marad meg.
+    Paraméterek: csapatok, csapatok, [(csapat, kizárt ellenfél) párok], mérkőzésszám.
+    """
+    teams = ", ".join(["%s"] * team_count)
+    exclude = ""
+    if excluded_count:
+        pairs = ", ".join(["(%s, %s)"] * excluded_count)
+        exclude = f"WHERE (t.team_id, t.opponent_id) NOT IN ({pairs})"
+    return f"""
+        SELECT h.team_id, h.id, h.date,
+               h.home_team_id, ht.name AS home_team_name,
+               h.away_team_id, at.name AS away_team_name,
+               h.score_home, h.score_away, h.status
+        FROM (
+            SELECT t.*, ROW_NUMBER() OVER (PARTITION BY t.team_id ORDER BY t.date DESC, t.id DESC) AS rn
+            FROM (
+                SELECT home_team_id AS team_id, away_team_id AS opponent_id,
+                       id, date, home_team_id, away_team_id, score_home, score_away, status
+                FROM fixtures
+                WHERE home_team_id IN ({teams}) AND date < NOW()
+                UNION ALL
+                SELECT away_team_id AS team_id, home_team_id AS opponent_id,
+                       id, date, home_team_id, away_team_id, score_home, score_away, status
+                FROM fixtures
+                WHERE away_team_id IN ({teams}) AND date < NOW()
+            ) t
+            {exclude}
+        ) h
+        JOIN teams ht ON h.home_team_id = ht.id
+        JOIN teams at ON h.away_team_id = at.id
+        WHERE h.rn <= %s
+        ORDER BY h.team_id, h.date DESC, h.id DESC
+    """
+
+
+def get_last_matches_bulk(team_ids, num_matches=10, exclude_opponents=None):
+    """
+    Több csapat utolsó X mérkőzése egyetlen adatbázis körúttal (pl. egy szimuláció összes csapata).
+
+    :param team_ids: A csapatok azonosítói.
+    :param num_matches: Csapatonként hány mérkőzést kérjünk le (alapértelmezett: 10).
+    :param exclude_opponents: {csapat ID: ellenfél ID} - csapatonként kizárja az ellene játszott mérkőzéseket.
+    :return: {csapat ID: a get_last_matches-szel azonos alakú mérkőzéslista}; minden kért csapat szerepel.
+             Adatbázis hiba esetén None (nem üres listák, hogy a hívó meg tudja különböztetni az adathiánytól).
+    """
+    team_ids = list(dict.fromkeys(team_ids))
+    if not team_ids:
+        return {}
+
+    histories = {team_id: [] for team_id in team_ids}
+    excluded = [(team_id, opponent_id) for team_id, opponent_id in (exclude_opponents or {}).items()
+                if team_id in histories and opponent_id]
+
+    connection = get_db_connection()
+    if connection is None:
+        print("❌ Nem sikerült csatlakozni az adatbázishoz.")
+        return None
+
+    cursor = connection.cursor(dictionary=True)
+
+    try:
+        params = [*team_ids, *team_ids, *(value for pair in excluded for value in pair), num_matches]
+        cursor.execute(last_matches_bulk_query(len(team_ids), len(excluded)), params)
+        for match in cursor.fetchall():
+            histories[match.pop("team_id")].append(match)
+
+        total = sum(len(matches) for matches in histories.values())
+        print(f"✅ {total} mérkőzés lekérve {len(team_ids)} csapathoz egy lekérdezésben.")
+        return histories
+
+    except mysql.connector.Error as err:
+        print(f"❌ Adatbázis hiba a mérkőzések tömeges lekérdezésekor: {err}")
+        return None
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+# Az aktuális hatókörben előre betöltött csapattörténetek:
+# ({csapat ID: mérkőzések}, csapatonként betöltött mérkőzésszám)
+_prefetched_history = contextvars.ContextVar("prefetched_last_matches", default=None)
+
+
+@contextmanager
+def prefetched_last_matches(team_ids, num_matches=15):
+    """
+    Hatókör (pl. egy szimuláció előkészítése vagy a predikciók mentése), amelyben a csapatok utolsó
+    mérkőzéseit egyszer, a get_last_matches_bulk-kal töltjük be. A blokkban a get_last_matches ezekből
+    szolgál ki, amíg a kért mérkőzésszám kijön belőlük; egyébként az adatbázishoz fordul.
+    A write_to_fixtures az érintett csapatok előtöltött adatait eldobja.
+    Egymásba ágyazva a külső hatókör marad érvényben. Ha az előtöltés nem sikerül, a blokk előtöltés
+    nélkül fut (a get_last_matches csapatonként kérdez).
+    """
+    if _prefetched_history.get() is not None:
+        yield
+        return
+
+    histories = get_last_matches_bulk(team_ids, num_matches)
+    if histories is None:
+        yield
+        return
+
+    token = _prefetched_history.set((histories, num_matches))
+    try:
+        yield
+    finally:
+        _prefetched_history.reset(token)
+
+
+def _prefetched_last_matches(team_id, opponent_id, num_matches):
+    """
+    :return: A csapat utolsó mérkőzései az előtöltött adatokból,
+             vagy None, ha azokból nem adható pontos válasz.
+    """
+    prefetched = _prefetched_history.get()
+    if prefetched is None or team_id not in prefetched[0]:
+        return None
+
+    histories, loaded = prefetched
+    history = histories[team_id]
+    matches = [match for match in history
+               if opponent_id is None
+               or (match["away_team_id"] if match["home_team_id"] == team_id else match["home_team_id"]) != opponent_id]
+
+    # Ha a betöltött mennyiség kevés volt a szűréshez, az adatbázis dönt (ha a csapatnak ennyi meccse
+    # sincs, a lista teljes)
+    if len(matches) >= num_matches or len(history) < loaded:
+        return matches[:num_matches]
+    return None
+
+
+def _invalidate_prefetched_history(team_ids):
+    prefetched = _prefetched_history.get()
+    if prefetched is not None:
+        for team_id in team_ids:
+            prefetched[0].pop(team_id, None)
+
+
 def fetch_fixtures_for_simulation(simulation_id):
     """Lekéri az adott szimulációhoz tartozó mérkőzéseket, beleértve az aktuális állapotot és végeredményt is."""
     connection = get_db_connection()
@@ -229,8 +409,9 @@ def fetch_fixtures_for_simulation(simulation_id):
 
 def read_head_to_head_stats(home_team_id, away_team_id):
     """
-    Lekérdezi az utolsó 5 egymás elleni mérkőzést a fixtures táblából, kizárólag azokat,
-    amelyekhez van elmentett statisztika. Ha nincs, törli a mérkőzést az adatbázisból.
+    Lekérdezi a két csapat egymás elleni mérkőzéseit a fixtures táblából, kizárólag azokat, amelyekhez
+    van elmentett statisztika – egyetlen lekérdezéssel. Csak olvas: a statisztika nélküli meccsek
+    takarítása a karbantartó feladat dolga (lásd delete_fixtures_without_statistics).
     """
     connection = get_db_connection()
     if connection is None:
@@ -239,37 +420,15 @@ def read_head_to_head_stats(home_team_id, away_team_id):
 
     cursor = connection.cursor(dictionary=True)
     try:
-        query = """
-            SELECT f.id, f.date, 
-                   f.home_team_id, ht.name AS home_team_name, 
-                   f.away_team_id, at.name AS away_team_name, 
-                   f.score_home, f.score_away, f.status
-            FROM fixtures f
-            JOIN teams ht ON f.home_team_id = ht.id
-            JOIN teams at ON f.away_team_id = at.id
-            WHERE ((f.home_team_id = %s AND f.away_team_id = %s) 
-                OR (f.home_team_id = %s AND f.away_team_id = %s))
-                AND f.date < NOW()
-            ORDER BY f.date DESC
-        """
-        cursor.execute(query, (home_team_id, away_team_id, away_team_id, home_team_id))
+        cursor.execute(HEAD_TO_HEAD_QUERY, (home_team_id, away_team_id, away_team_id, home_team_id))
         matches = cursor.fetchall()
 
-        valid_matches = []
-        for match in matches:
-            stats = read_from_match_statistics(match["id"])
-            if stats:
-                valid_matches.append(match)
-            else:
-                print(f"❌ Nincs stat az API-ban sem, törlés: {match['id']}")
-                delete_fixture_by_id(match["id"])
-
-        if valid_matches:
-            print(f"📊 Összesen {len(valid_matches)} H2H meccshez van statisztika ({home_team_id} vs {away_team_id}).")
+        if matches:
+            print(f"📊 Összesen {len(matches)} H2H meccshez van statisztika ({home_team_id} vs {away_team_id}).")
         else:
             print(f"⚠️ Nincs statisztikával rendelkező H2H meccs az adatbázisban ({home_team_id} vs {away_team_id}).")
 
-        return valid_matches  # max 5 visszaadva
+        return matches
 
     except mysql.connector.Error as err:
         print(f"❌ Adatbázis hiba H2H statisztikák lekérdezésekor: {err}")
@@ -375,6 +534,48 @@ def delete_fixture_by_id(fixture_id):
         cursor.close()
         connection.close()
 
+def delete_fixtures_without_statistics(min_age_days, batch_size=DB_IN_CHUNK_SIZE):
+    """
+    Karbantartás: törli azokat a legalább `min_age_days` napos mérkőzéseket, amelyekhez nincs statisztika,
+    és a missing_statistics szerint az API-ban sincs. Amire odds, predikció vagy mérkőzéscsoport hivatkozik,
+    az megmarad. A missing_statistics bejegyzés is megmarad, így egy újra beszúrt ilyen meccs statisztikáját
+    nem kérjük le feleslegesen. Kötegenként (batch_size sor) töröl és véglegesít, hogy ne tartson
+    hosszú zárat.
+    :return: A törölt mérkőzések száma.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        print("❌ Nem sikerült csatlakozni az adatbázishoz a törléshez.")
+        return 0
+
+    cursor = connection.cursor()
+    deleted = 0
+    try:
+        while True:
+            cursor.execute("""
+                DELETE FROM fixtures
+                WHERE date < NOW() - INTERVAL %s DAY
+                  AND id IN (SELECT fixture_id FROM missing_statistics)
+                  AND NOT EXISTS (SELECT 1 FROM match_statistics ms WHERE ms.fixture_id = fixtures.id)
+                  AND NOT EXISTS (SELECT 1 FROM odds o WHERE o.fixture_id = fixtures.id)
+                  AND NOT EXISTS (SELECT 1 FROM model_predictions mp WHERE mp.fixture_id = fixtures.id)
+                  AND NOT EXISTS (SELECT 1 FROM match_group_fixtures mgf WHERE mgf.fixture_id = fixtures.id)
+                LIMIT %s
+            """, (min_age_days, batch_size))
+            connection.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+    except mysql.connector.Error as err:
+        connection.rollback()
+        print(f"❌ Adatbázis hiba a statisztika nélküli mérkőzések törlésekor: {err}")
+    finally:
+        cursor.close()
+        connection.close()
+
+    print(f"🗑️ {deleted} statisztika nélküli mérkőzés törölve (legalább {min_age_days} napos).")
+    return deleted
+
 def get_fixture_result(fixture_id):
     """
     Visszaadja a mérkőzés valós eredményét és az oddsokat, ha a mérkőzés lezárult.
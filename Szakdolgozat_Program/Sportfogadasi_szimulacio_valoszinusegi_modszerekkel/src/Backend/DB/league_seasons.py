@@ -0,0 +1,59 @@
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection
+
+
+def read_league_season_backfill(league_seasons):
+    """
+    Visszaadja a megadott liga-szezonok feltöltési állapotát.
+    :param league_seasons: (league_id, season) párok listája.
+    :return: Szótár {(league_id, season): {"fixture_count", "is_complete", "backfilled_at"}}.
+    """
+    league_seasons = list(league_seasons)
+    if not league_seasons:
+        return {}
+
+    connection = get_db_connection()
+    if connection is None:
+        return {}
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        placeholders = ", ".join(["(%s, %s)"] * len(league_seasons))
+        cursor.execute(f"""
+            SELECT league_id, season, fixture_count, is_complete, backfilled_at
+            FROM league_season_backfill
+            WHERE (league_id, season) IN ({placeholders})
+        """, tuple(value for pair in league_seasons for value in pair))
+        return {(row["league_id"], row["season"]): row for row in cursor.fetchall()}
+    except mysql.connector.Error as err:
+        print(f"Database read error for league season backfill: {err}")
+        return {}
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def write_league_season_backfill(league_id, season, fixture_count, is_complete):
+    """
+    Rögzíti egy liga-szezon feltöltését. A lezárult (minden meccse végleges) szezont
+    többé nem kell az API-ból lekérni.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO league_season_backfill (league_id, season, fixture_count, is_complete, backfilled_at)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE fixture_count = VALUES(fixture_count),
+                is_complete = VALUES(is_complete), backfilled_at = VALUES(backfilled_at)
+        """, (league_id, season, fixture_count, int(is_complete)))
+        connection.commit()
+    except mysql.connector.Error as err:
+        print(f"Database write error for league season backfill: {err}")
+    finally:
+        cursor.close()
+        connection.close()
@@ -0,0 +1,229 @@
+"""
+Verziózott sémamigrációk és a gyakori lekérdezések végrehajtási tervének ellenőrzése.
+
+A repó nem tartalmaz sémát, ezért a gyakori lekérdezésekhez szükséges indexeket és a nyilvántartó
+táblákat itt, sorszámozott migrációkban hozzuk létre; a DB modulok futás közben nem adnak ki DDL-t.
+Az alkalmazott verziókat a schema_migrations tábla tartja nyilván, így minden migráció egyszer fut le.
+A MySQL-ben nincs "CREATE INDEX IF NOT EXISTS", ezért az indexet csak akkor hozzuk létre, ha még nincs
+ilyen nevű az adott táblán.
+
+Futtatás a projekt gyökeréből:
+    python -m src.Backend.DB.migrations            (migrációk futtatása)
+    python -m src.Backend.DB.migrations --check    (utána EXPLAIN ellenőrzés; teljes táblabejárásnál hibakód 1)
+"""
+import argparse
+import sys
+
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection
+from src.Backend.DB.fixtures import LAST_MATCHES_QUERY, HEAD_TO_HEAD_QUERY, last_matches_bulk_query
+from src.Backend.DB.predictions import STRATEGY_INPUTS_QUERY
+
+# (verzió, leírás, [lépések]); egy lépés vagy (tábla, index neve, oszlopok), vagy egy DDL utasítás szövege
+MIGRATIONS = [
+    (1, "Indexek a gyakori lekérdezésekhez", [
+        # get_last_matches: a két UNION ág (csapat + dátum szerint csökkenő sorrend)
+        ("fixtures", "idx_fixtures_home_date", "home_team_id, date"),
+        ("fixtures", "idx_fixtures_away_date", "away_team_id, date"),
+        # read_head_to_head_stats: csapatpár (mindkét irányban) + dátum
+        ("fixtures", "idx_fixtures_home_away_date", "home_team_id, away_team_id, date"),
+        # get_prediction_by_model_id
+        ("model_predictions", "idx_model_predictions_fixture_group_model", "fixture_id, match_group_id, model_id"),
+        # get_best_odds_for_fixture, odds_already_saved, read_odds_by_fixture
+        ("odds", "idx_odds_fixture_bookmaker", "fixture_id, bookmaker_id"),
+    ]),
+    (2, "Index a csoportonkénti predikció betöltéshez", [
+        # update_strategy_profit: egy mérkőzéscsoport összes predikciója
+        ("model_predictions", "idx_model_predictions_group_fixture", "match_group_id, fixture_id"),
+    ]),
+    (3, "Nyilvántartó táblák (API kvóta, hiányzó statisztikák, liga-szezonok, pre-match szinkron)", [
+        # api_usage.py: napi, végpontonkénti hívásszámok és az utolsó ismert kvóta
+        """
+        CREATE TABLE IF NOT EXISTS api_usage (
+            usage_date DATE NOT NULL,
+            endpoint VARCHAR(64) NOT NULL,
+            calls INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (usage_date, endpoint)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS api_quota (
+            usage_date DATE NOT NULL PRIMARY KEY,
+            daily_limit INT NULL,
+            daily_remaining INT NULL,
+            updated_at DATETIME NOT NULL
+        )
+        """,
+        # missing_statistics.py: az API-ban sem elérhető statisztikájú mérkőzések
+        """
+        CREATE TABLE IF NOT EXISTS missing_statistics (
+            fixture_id INT NOT NULL PRIMARY KEY,
+            checked_at DATETIME NOT NULL,
+            check_count INT NOT NULL DEFAULT 1
+        )
+        """,
+        # league_seasons.py: liga-szezon feltöltések
+        """
+        CREATE TABLE IF NOT EXISTS league_season_backfill (
+            league_id INT NOT NULL,
+            season INT NOT NULL,
+            fixture_count INT NOT NULL DEFAULT 0,
+            is_complete TINYINT(1) NOT NULL DEFAULT 0,
+            backfilled_at DATETIME NOT NULL,
+            PRIMARY KEY (league_id, season)
+        )
+        """,
+        # pre_match_sync.py: napi vízjel és mérkőzésenkénti tartalom-hash
+        """
+        CREATE TABLE IF NOT EXISTS pre_match_sync (
+            match_date DATE NOT NULL PRIMARY KEY,
+            fixture_count INT NOT NULL DEFAULT 0,
+            synced_at DATETIME NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS pre_match_fixture_hashes (
+            fixture_id INT NOT NULL PRIMARY KEY,
+            match_date DATE NOT NULL,
+            content_hash CHAR(40) NOT NULL,
+            has_odds TINYINT(1) NOT NULL DEFAULT 0,
+            synced_at DATETIME NOT NULL
+        )
+        """,
+    ]),
+]
+
+# Ezeken a táblákon a gyakori lekérdezések nem járhatják be a teljes táblát
+# (az EXPLAIN a tábla aliasát mutatja, ezért a HOT_QUERIES-ben használt aliasok is szerepelnek:
+# fixtures "f", match_statistics "ms", model_predictions "mp")
+CHECKED_TABLES = {"fixtures", "f", "match_statistics", "ms", "model_predictions", "mp", "odds"}
+
+# (név, lekérdezés, minta paraméterek) - az EXPLAIN-hez az értékek tetszőlegesek
+HOT_QUERIES = [
+    ("get_last_matches", LAST_MATCHES_QUERY, (1, 2, 10, 1, 2, 10, 10)),
+    ("get_last_matches_bulk", last_matches_bulk_query(2, 1), (1, 2, 1, 2, 1, 2, 10)),
+    ("read_head_to_head_stats", HEAD_TO_HEAD_QUERY, (1, 2, 2, 1)),
+    ("update_strategy_profit", STRATEGY_INPUTS_QUERY, (1, 1)),
+    ("get_prediction_by_model_id", """
+        SELECT predicted_outcome, was_correct, probability
+        FROM model_predictions
+        WHERE fixture_id = %s AND model_id = %s AND match_group_id = %s
+    """, (1, 1, 1)),
+    ("get_best_odds_for_fixture", """
+        SELECT bookmaker_id, home_odds AS selected_odds
+        FROM odds
+        WHERE fixture_id = %s
+        ORDER BY selected_odds DESC
+        LIMIT 1
+    """, (1,)),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT NOT NULL PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """)
+
+
+def index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+
+def apply_migrations(migrations=MIGRATIONS):
+    """
+    Lefuttatja a még nem alkalmazott migrációkat. A verziót a migráció végén rögzítjük; mivel a DDL
+    azonnal véglegesül, egy félbeszakadt migráció újrafuttatásakor a már létező indexeket kihagyjuk,
+    a táblák pedig "IF NOT EXISTS" feltétellel készülnek.
+    :return: A most alkalmazott verziók listája.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return []
+
+    cursor = connection.cursor()
+    applied_now = []
+    try:
+        ensure_migrations_table(cursor)
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+
+        for version, description, steps in migrations:
+            if version in applied:
+                continue
+            for step in steps:
+                if isinstance(step, str):
+                    cursor.execute(step)
+                    print(f"🗂️ DDL lefuttatva: {step.strip().split('(')[0].strip()}")
+                    continue
+                table, index_name, columns = step
+                if not index_exists(cursor, table, index_name):
+                    cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+                    print(f"🗂️ Index létrehozva: {table}.{index_name} ({columns})")
+            cursor.execute("INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, NOW())",
+                           (version, description))
+            connection.commit()
+            applied_now.append(version)
+            print(f"✅ Migráció alkalmazva: {version} - {description}")
+    except mysql.connector.Error as err:
+        connection.rollback()
+        print(f"❌ Adatbázis hiba a migrációk futtatásakor: {err}")
+    finally:
+        cursor.close()
+        connection.close()
+    return applied_now
+
+
+def check_query_plans(hot_queries=HOT_QUERIES, checked_tables=CHECKED_TABLES):
+    """
+    EXPLAIN alapján ellenőrzi, hogy a gyakori lekérdezések egyike sem jár be teljes táblát
+    (type = ALL) a nagy táblákon. Néhány soros táblán az optimalizáló indextől függetlenül is
+    választhat teljes bejárást, ezért az ellenőrzést valós méretű adatbázison érdemes futtatni.
+    :return: A hibás tervek listája: [(lekérdezés neve, tábla)]; üres lista, ha minden rendben.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return [("connection", None)]
+
+    cursor = connection.cursor(dictionary=True)
+    full_scans = []
+    try:
+        for name, query, params in hot_queries:
+            cursor.execute("EXPLAIN " + query, params)
+            for row in cursor.fetchall():
+                if row.get("table") in checked_tables and row.get("type") == "ALL":
+                    full_scans.append((name, row["table"]))
+                    print(f"❌ Teljes táblabejárás: {name} ({row['table']}, kb. {row.get('rows')} sor)")
+    except mysql.connector.Error as err:
+        print(f"❌ Adatbázis hiba az EXPLAIN ellenőrzéskor: {err}")
+        full_scans.append(("explain", None))
+    finally:
+        cursor.close()
+        connection.close()
+
+    if not full_scans:
+        print(f"✅ {len(hot_queries)} gyakori lekérdezés egyike sem jár be teljes táblát.")
+    return full_scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sémamigrációk és EXPLAIN ellenőrzés")
+    parser.add_argument("--check", action="store_true", help="A migrációk után a lekérdezési tervek ellenőrzése")
+    args = parser.parse_args()
+
+    apply_migrations()
+    if args.check and check_query_plans():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection
+
+
+def read_missing_statistics(fixture_ids, recheck_days):
+    """
+    Visszaadja azokat a mérkőzéseket, amelyekről az utolsó `recheck_days` napban kiderült,
+    hogy az API-ban sincs statisztikájuk.
+    :return: A fixture azonosítók halmaza.
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    if not fixture_ids:
+        return set()
+
+    connection = get_db_connection()
+    if connection is None:
+        return set()
+
+    cursor = connection.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(fixture_ids))
+        cursor.execute(f"""
+            SELECT fixture_id FROM missing_statistics
+            WHERE fixture_id IN ({placeholders}) AND checked_at >= NOW() - INTERVAL %s DAY
+        """, (*fixture_ids, recheck_days))
+        return {row[0] for row in cursor.fetchall()}
+    except mysql.connector.Error as err:
+        print(f"Database read error for missing statistics: {err}")
+        return set()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def write_missing_statistics(fixture_ids):
+    """
+    Rögzíti, hogy a mérkőzésekhez az API sem adott statisztikát (az ellenőrzés idejével együtt).
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    if not fixture_ids:
+        return
+
+    connection = get_db_connection()
+    if connection is None:
+        return
+
+    cursor = connection.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO missing_statistics (fixture_id, checked_at, check_count)
+            VALUES (%s, NOW(), 1)
+            ON DUPLICATE KEY UPDATE checked_at = VALUES(checked_at), check_count = check_count + 1
+        """, [(fixture_id,) for fixture_id in fixture_ids])
+        connection.commit()
+    except mysql.connector.Error as err:
+        print(f"Database write error for missing statistics: {err}")
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def delete_missing_statistics(fixture_ids):
+    """
+    Törli a nyilvántartásból azokat a mérkőzéseket, amelyekhez utólag mégis érkezett statisztika.
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    if not fixture_ids:
+        return
+
+    connection = get_db_connection()
+    if connection is None:
+        return
+
+    cursor = connection.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(fixture_ids))
+        cursor.execute(f"DELETE FROM missing_statistics WHERE fixture_id IN ({placeholders})", tuple(fixture_ids))
+        connection.commit()
+    except mysql.connector.Error as err:
+        print(f"Database write error for missing statistics: {err}")
+    finally:
+        cursor.close()
+        connection.close()
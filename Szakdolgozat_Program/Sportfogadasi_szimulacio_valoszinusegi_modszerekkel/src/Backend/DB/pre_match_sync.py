@@ -0,0 +1,97 @@
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection
+
+
+def read_pre_match_sync(match_dates):
+    """
+    Visszaadja a megadott napok utolsó teljes szinkronjának idejét.
+    :param match_dates: 'YYYY-MM-DD' dátumok.
+    :return: Szótár {'YYYY-MM-DD': {"fixture_count", "synced_at"}}.
+    """
+    match_dates = list(match_dates)
+    if not match_dates:
+        return {}
+
+    connection = get_db_connection()
+    if connection is None:
+        return {}
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        placeholders = ", ".join(["%s"] * len(match_dates))
+        cursor.execute(f"""
+            SELECT match_date, fixture_count, synced_at FROM pre_match_sync
+            WHERE match_date IN ({placeholders})
+        """, tuple(match_dates))
+        return {row["match_date"].isoformat(): row for row in cursor.fetchall()}
+    except mysql.connector.Error as err:
+        print(f"Database read error for pre-match sync: {err}")
+        return {}
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def read_fixture_hashes(fixture_ids):
+    """
+    Visszaadja a mérkőzések legutóbb szinkronizált tartalom-hash-ét.
+    :return: Szótár {fixture_id: {"content_hash", "has_odds"}}.
+    """
+    fixture_ids = list(fixture_ids)
+    if not fixture_ids:
+        return {}
+
+    connection = get_db_connection()
+    if connection is None:
+        return {}
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        placeholders = ", ".join(["%s"] * len(fixture_ids))
+        cursor.execute(f"""
+            SELECT fixture_id, content_hash, has_odds FROM pre_match_fixture_hashes
+            WHERE fixture_id IN ({placeholders})
+        """, tuple(fixture_ids))
+        return {row["fixture_id"]: row for row in cursor.fetchall()}
+    except mysql.connector.Error as err:
+        print(f"Database read error for pre-match fixture hashes: {err}")
+        return {}
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def write_pre_match_sync(match_date, fixture_hashes, fixture_count=None):
+    """
+    Egy tranzakcióban rögzíti a mérkőzések tartalom-hash-ét, és ha fixture_count meg van adva
+    (teljes napi szinkron), a nap vízjelét is.
+    :param fixture_hashes: (fixture_id, content_hash, has_odds) hármasok.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return
+
+    cursor = connection.cursor()
+    try:
+        if fixture_hashes:
+            cursor.executemany("""
+                INSERT INTO pre_match_fixture_hashes (fixture_id, match_date, content_hash, has_odds, synced_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE match_date = VALUES(match_date), content_hash = VALUES(content_hash),
+                    has_odds = VALUES(has_odds), synced_at = VALUES(synced_at)
+            """, [(fixture_id, match_date, content_hash, int(has_odds))
+                  for fixture_id, content_hash, has_odds in fixture_hashes])
+        if fixture_count is not None:
+            cursor.execute("""
+                INSERT INTO pre_match_sync (match_date, fixture_count, synced_at)
+                VALUES (%s, %s, NOW())
+                ON DUPLICATE KEY UPDATE fixture_count = VALUES(fixture_count), synced_at = VALUES(synced_at)
+            """, (match_date, fixture_count))
+        connection.commit()
+    except mysql.connector.Error as err:
+        connection.rollback()
+        print(f"Database write error for pre-match sync: {err}")
+    finally:
+        cursor.close()
+        connection.close()
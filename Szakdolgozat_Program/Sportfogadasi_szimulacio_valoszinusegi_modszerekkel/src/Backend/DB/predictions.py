@@ -1,6 +1,7 @@
+import numpy as np
+
 from src.Backend.DB.connection import get_db_connection
 from src.Backend.DB.fixtures import get_fixture_result
-from src.Backend.DB.odds import get_best_odds_for_fixture
 from src.Backend.strategies.fibonacci import fibonacci
 from src.Backend.strategies.flatBetting import flat_betting
 from src.Backend.strategies.kellyCriterion import kelly_criterion
@@ -148,7 +149,178 @@ def evaluate_predictions(fixture_id, home_score, away_score):
         connection.close()
 
 
+def evaluate_predictions_for_fixtures(fixture_ids, chunk_size=500):
+    """
+    Halmazalapú kiértékelés: egyetlen UPDATE ... JOIN utasítással állítja be a was_correct mezőt
+    a megadott mérkőzések még ki nem értékelt predikcióinál (nagy listánál csomagokban).
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    if not fixture_ids:
+        return 0
+
+    connection = get_db_connection()
+    if connection is None:
+        print("❌ Nem sikerült csatlakozni az adatbázishoz (evaluate_predictions_for_fixtures).")
+        return 0
+
+    cursor = connection.cursor()
+    updated = 0
+    try:
+        for i in range(0, len(fixture_ids), chunk_size):
+            chunk = fixture_ids[i:i + chunk_size]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = f"""
+                UPDATE model_predictions mp
+                JOIN fixtures f ON mp.fixture_id = f.id
+                SET mp.was_correct = (mp.predicted_outcome = CASE
+                    WHEN f.score_home > f.score_away THEN '1'
+                    WHEN f.score_home < f.score_away THEN '2'
+                    ELSE 'X'
+                END)
+                WHERE mp.was_correct IS NULL
+                  AND f.score_home IS NOT NULL
+                  AND f.score_away IS NOT NULL
+                  AND mp.fixture_id IN ({placeholders})
+            """
+            cursor.execute(query, tuple(chunk))
+            updated += cursor.rowcount
+        connection.commit()
+        print(f"✅ {len(fixture_ids)} mérkőzés kiértékelve, {updated} predikció frissítve.")
+        return updated
+
+    except Exception as e:
+        print(f"❌ Hiba történt az evaluate_predictions_for_fixtures során: {e}")
+        connection.rollback()
+        return 0
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+# Egy mérkőzéscsoport összes predikciója a megjósolt kimenetelre adott legjobb oddsszal, egy lekérdezésben
+# (kimenetelenként a MAX, ugyanaz, mint a get_best_odds_for_fixture ORDER BY ... DESC LIMIT 1-e)
+STRATEGY_INPUTS_QUERY = """
+    SELECT mp.fixture_id, mp.model_id, mp.was_correct, mp.probability,
+           CASE mp.predicted_outcome
+               WHEN '1' THEN bo.home_odds
+               WHEN 'X' THEN bo.draw_odds
+               WHEN '2' THEN bo.away_odds
+           END AS selected_odds
+    FROM model_predictions mp
+    LEFT JOIN (
+        SELECT fixture_id, MAX(home_odds) AS home_odds, MAX(draw_odds) AS draw_odds, MAX(away_odds) AS away_odds
+        FROM odds
+        WHERE fixture_id IN (SELECT fixture_id FROM model_predictions WHERE match_group_id = %s)
+        GROUP BY fixture_id
+    ) bo ON bo.fixture_id = mp.fixture_id
+    WHERE mp.match_group_id = %s
+    ORDER BY mp.id
+"""
+
+STRATEGY_IDS = (1, 2, 3, 4, 5)  # Flat, Value, Martingale, Fibonacci, Kelly
+MODEL_COUNT = 6
+BASE_STAKE = 10.0
+INITIAL_BANKROLL = 10.0
+FIBONACCI_SEQUENCE = np.array([1, 1, 2, 3, 5, 8, 13, 21, 34], dtype=np.float64)
+
+
+def _parse_probability(value):
+    try:
+        return float(str(value).replace(",", ".")) / 100
+    except ValueError:
+        return np.nan
+
+
+def load_strategy_inputs(cursor, sim_id, fixture_ids):
+    """
+    Betölti a csoport predikcióit és legjobb oddsait (modell x mérkőzés) NumPy tömbökbe.
+    :param fixture_ids: A mérkőzések a fogadás sorrendjében.
+    :return: (valid, won, odds, probability) - mind MODEL_COUNT x len(fixture_ids) méretű; valid ott igaz,
+             ahol van predikció és fogadható (1.01 feletti) odds.
+    """
+    shape = (MODEL_COUNT, len(fixture_ids))
+    valid = np.zeros(shape, dtype=bool)
+    won = np.zeros(shape, dtype=bool)
+    odds = np.ones(shape)
+    probability = np.full(shape, np.nan)
+    column = {fixture_id: index for index, fixture_id in enumerate(fixture_ids)}
+
+    cursor.execute(STRATEGY_INPUTS_QUERY, (sim_id, sim_id))
+    for row in cursor.fetchall():
+        index = column.get(row["fixture_id"])
+        if index is None or not 1 <= row["model_id"] <= MODEL_COUNT:
+            continue
+        model = row["model_id"] - 1
+        if valid[model, index] or row["selected_odds"] is None:  # Több sor esetén az első számít
+            continue
+        selected_odds = float(row["selected_odds"])
+        if selected_odds <= 1.01:
+            continue
+        valid[model, index] = True
+        won[model, index] = bool(row["was_correct"])
+        odds[model, index] = selected_odds
+        probability[model, index] = _parse_probability(row["probability"])
+    return valid, won, odds, probability
+
+
+def compute_strategy_results(valid, won, odds, probability):
+    """
+    Az összes stratégia x modell profitja és összes tétje. A Flat és a Value egy lépésben, a teljes tömbön
+    számolódik; a Martingale, a Fibonacci és a Kelly tétje az előző fogadástól függ, ezért ezeket
+    mérkőzésenként, de a hat modellre egyszerre léptetjük.
+    :return: (profits, stakes) - len(STRATEGY_IDS) x MODEL_COUNT méretű tömbök.
+    """
+    profits = np.zeros((len(STRATEGY_IDS), valid.shape[0]))
+    stakes = np.zeros_like(profits)
+    win_return = odds - 1
+
+    # Flat és Value: állandó tét, a Value csak ott fogad, ahol a várható érték pozitív
+    with np.errstate(invalid="ignore"):
+        value_bets = valid & (probability * odds > 1)
+    for row, bets in ((0, valid), (1, value_bets)):
+        profits[row] = np.where(bets, np.where(won, BASE_STAKE * win_return, -BASE_STAKE), 0).sum(axis=1)
+        stakes[row] = BASE_STAKE * bets.sum(axis=1)
+
+    martingale_stake = np.full(valid.shape[0], BASE_STAKE)
+    fibonacci_index = np.zeros(valid.shape[0], dtype=int)
+    bankroll = np.full(valid.shape[0], INITIAL_BANKROLL)
+
+    for fixture in range(valid.shape[1]):
+        bets, wins, b = valid[:, fixture], won[:, fixture], win_return[:, fixture]
+
+        # Martingale: vereség után duplázás, győzelem után alaptét
+        profits[2] += np.where(bets, np.where(wins, martingale_stake * b, -martingale_stake), 0)
+        stakes[2] += np.where(bets, martingale_stake, 0)
+        martingale_stake = np.where(bets, np.where(wins, BASE_STAKE, martingale_stake * 2), martingale_stake)
+
+        # Fibonacci: vereség után egyet előre, győzelem után kettőt vissza a sorozatban
+        current = BASE_STAKE * FIBONACCI_SEQUENCE[fibonacci_index]
+        profits[3] += np.where(bets, np.where(wins, current * b, -current), 0)
+        stakes[3] += np.where(bets, current, 0)
+        stepped = np.where(wins, np.maximum(0, fibonacci_index - 2),
+                           np.minimum(len(FIBONACCI_SEQUENCE) - 1, fibonacci_index + 1))
+        fibonacci_index = np.where(bets, stepped, fibonacci_index)
+
+        # Kelly: a bankroll Kelly-hányadát tesszük meg, ha az pozitív
+        # Csak a fogadható (b > 0) cellákra osztunk, a többi hányad 0 marad
+        fraction = np.divide(probability[:, fixture] * b - (1 - probability[:, fixture]), b,
+                             out=np.zeros_like(b), where=bets & (b > 0))
+        kelly_bets = bets & (fraction > 0)
+        current = np.where(kelly_bets, bankroll * fraction, 0)
+        bankroll = bankroll + np.where(wins, current * b, -current)
+        stakes[4] += current
+
+    profits[4] = bankroll - INITIAL_BANKROLL
+    return profits, stakes
+
+
 def update_strategy_profit(sim_id, completed_fixtures):
+    """
+    Újraszámolja a csoport stratégiáinak modellenkénti profitját és tétjét a lezárult mérkőzésekből.
+    A predikciók és a legjobb oddsok egy lekérdezéssel töltődnek be, a számítás NumPy tömbökön fut,
+    a simulations sorok egy executemany-vel íródnak.
+    """
     connection = get_db_connection()
     if connection is None:
         print("❌ Nem sikerült csatlakozni az adatbázishoz (update_strategy_profit).")
@@ -157,130 +329,34 @@ def update_strategy_profit(sim_id, completed_fixtures):
     cursor = connection.cursor(dictionary=True)
     try:
         completed_fixtures.sort(key=lambda x: x.get("match_date"))
-        strategies = ["1", "2", "3", "4", "5"]
-        base_stake = 10.0
-        initial_bankroll = 10
-
-        for strategy_id in strategies:
-            strategy_profit = 0.0
-            model_profits = [0.0] * 6
-            model_stakes = [0.0] * 6
-
-            for model_id in range(1, 7):
-                model_profit = 0.0
-                model_stake = 0.0
-                stake = base_stake
-                fib_seq = [1, 1, 2, 3, 5, 8, 13, 21, 34]
-                fib_index = 0
-                bankroll = initial_bankroll
-
-                for fixture in completed_fixtures:
-                    fixture_id = fixture["fixture_id"]
-                    home_score = fixture.get("score_home")
-                    away_score = fixture.get("score_away")
-                    if home_score is None or away_score is None:
-                        continue
-
-                    cursor.execute("""
-                        SELECT was_correct, predicted_outcome
-                        FROM model_predictions
-                        WHERE fixture_id = %s AND match_group_id = %s AND model_id = %s
-                    """, (fixture_id, sim_id, model_id))
-                    prediction = cursor.fetchone()
-                    if not prediction:
-                        continue
-
-                    was_correct = prediction["was_correct"]
-                    predicted_outcome = prediction["predicted_outcome"]
-                    best_odds = get_best_odds_for_fixture(fixture_id, predicted_outcome)
-                    odds = best_odds.get("selected_odds") if best_odds else None
-                    if not odds or odds <= 1.01:
-                        continue
-
-                    if strategy_id == "1":  # Flat Betting
-                        match_profit = stake * (odds - 1) if was_correct else -stake
-                        model_profit += match_profit
-                        model_stake += stake
-
-                    elif strategy_id == "2":  # Value Betting
-                        db_prediction = get_prediction_by_model_id(fixture_id, model_id, sim_id)
-                        if not db_prediction:
-                            continue
-                        model_prob = float(str(db_prediction["probability"]).replace(",", ".")) / 100
-                        if (model_prob * odds) > 1:
-                            match_profit = stake * (odds - 1) if was_correct else -stake
-                            model_profit += match_profit
-                            model_stake += stake
-
-                    elif strategy_id == "3":  # Martingale
-                        if was_correct:
-                            model_profit += stake * (odds - 1)
-                            model_stake += stake
-                            stake = base_stake
-                        else:
-                            model_profit -= stake
-                            model_stake += stake
-                            stake *= 2
-
-                    elif strategy_id == "4":  # Fibonacci
-                        current_stake = base_stake * fib_seq[fib_index]
-                        if was_correct:
-                            model_profit += current_stake * (odds - 1)
-                            fib_index = max(0, fib_index - 2)
-                        else:
-                            model_profit -= current_stake
-                            fib_index = min(len(fib_seq) - 1, fib_index + 1)
-                        stake = base_stake * fib_seq[fib_index]
-                        model_stake += current_stake
-
-                    elif strategy_id == "5":  # Kelly
-                        db_prediction = get_prediction_by_model_id(fixture_id, model_id, sim_id)
-                        if not db_prediction:
-                            continue
-                        model_prob = float(str(db_prediction["probability"]).replace(",", ".")) / 100
-                        b = odds - 1
-                        kelly_fraction = (model_prob * b - (1 - model_prob)) / b
-                        if kelly_fraction <= 0:
-                            continue
-                        current_stake = bankroll * kelly_fraction
-                        if was_correct:
-                            bankroll += current_stake * b
-                        else:
-                            bankroll -= current_stake
-                        model_stake += current_stake
-                        model_profit = bankroll - initial_bankroll
-
-                strategy_profit += model_profit
-                model_profits[model_id - 1] = model_profit
-                model_stakes[model_id - 1] = model_stake
-
-            # Mentés az adatbázisba
-            cursor.execute("""
-                UPDATE simulations
-                SET total_profit_loss = %s,
-                    bayes_classic_profit = %s,
-                    monte_carlo_profit = %s,
-                    poisson_profit = %s,
-                    bayes_empirical_profit = %s,
-                    log_reg_profit = %s,
-                    elo_profit = %s,
-                    bayes_classic_stake = %s,
-                    monte_carlo_stake = %s,
-                    poisson_stake = %s,
-                    bayes_empirical_stake = %s,
-                    log_reg_stake = %s,
-                    elo_stake = %s
-                WHERE match_group_id = %s AND strategy_id = %s
-            """, (
-                strategy_profit,
-                model_profits[0], model_profits[1], model_profits[2],
-                model_profits[3], model_profits[4], model_profits[5],
-                model_stakes[0], model_stakes[1], model_stakes[2],
-                model_stakes[3], model_stakes[4], model_stakes[5],
-                sim_id, strategy_id
-            ))
-            connection.commit()
-            print(f"✅ Stratégia {strategy_id} profitjai és tétei elmentve.")
+        fixture_ids = [fixture["fixture_id"] for fixture in completed_fixtures
+                       if fixture.get("score_home") is not None and fixture.get("score_away") is not None]
+
+        profits, stakes = compute_strategy_results(*load_strategy_inputs(cursor, sim_id, fixture_ids))
+
+        # Mentés az adatbázisba
+        cursor.executemany("""
+            UPDATE simulations
+            SET total_profit_loss = %s,
+                bayes_classic_profit = %s,
+                monte_carlo_profit = %s,
+                poisson_profit = %s,
+                bayes_empirical_profit = %s,
+                log_reg_profit = %s,
+                elo_profit = %s,
+                bayes_classic_stake = %s,
+                monte_carlo_stake = %s,
+                poisson_stake = %s,
+                bayes_empirical_stake = %s,
+                log_reg_stake = %s,
+                elo_stake = %s
+            WHERE match_group_id = %s AND strategy_id = %s
+        """, [
+            (float(profits[row].sum()), *profits[row].tolist(), *stakes[row].tolist(), sim_id, strategy_id)
+            for row, strategy_id in enumerate(STRATEGY_IDS)
+        ])
+        connection.commit()
+        print(f"✅ {len(STRATEGY_IDS)} stratégia profitjai és tétei elmentve ({len(fixture_ids)} mérkőzés).")
 
     except Exception as e:
         print(f"❌ Hiba történt az update_strategy_profit során: {e}")
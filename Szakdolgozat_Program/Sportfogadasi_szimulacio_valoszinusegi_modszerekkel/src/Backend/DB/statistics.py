@@ -1,6 +1,69 @@
 import mysql.connector
 
 from src.Backend.DB.connection import get_db_connection
+from src.config import DB_IN_CHUNK_SIZE
+
+
+# API statisztika típus -> match_statistics oszlop
+STATISTIC_COLUMNS = {
+    'Shots on Goal': 'shots_on_goal',
+    'Shots off Goal': 'shots_off_goal',
+    'Total Shots': 'total_shots',
+    'Blocked Shots': 'blocked_shots',
+    'Shots insidebox': 'shots_insidebox',
+    'Shots outsidebox': 'shots_outsidebox',
+    'Fouls': 'fouls',
+    'Corner Kicks': 'corner_kicks',
+    'Offsides': 'offsides',
+    'Ball Possession': 'ball_possession',
+    'Yellow Cards': 'yellow_cards',
+    'Red Cards': 'red_cards',
+    'Goalkeeper Saves': 'goalkeeper_saves',
+    'Total passes': 'total_passes',
+    'Passes accurate': 'passes_accurate',
+    'Passes %': 'passes_percentage',
+}
+
+# SQL query az adatok beszúrásához vagy frissítéséhez
+MATCH_STATISTICS_UPSERT = """
+    INSERT INTO match_statistics (
+        fixture_id, team_id, shots_on_goal, shots_off_goal, total_shots, 
+        blocked_shots, shots_insidebox, shots_outsidebox, fouls, corner_kicks, 
+        offsides, ball_possession, yellow_cards, red_cards, goalkeeper_saves, 
+        total_passes, passes_accurate, passes_percentage
+    ) 
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE 
+        shots_on_goal=VALUES(shots_on_goal), 
+        shots_off_goal=VALUES(shots_off_goal), 
+        total_shots=VALUES(total_shots), 
+        blocked_shots=VALUES(blocked_shots), 
+        shots_insidebox=VALUES(shots_insidebox), 
+        shots_outsidebox=VALUES(shots_outsidebox), 
+        fouls=VALUES(fouls), 
+        corner_kicks=VALUES(corner_kicks), 
+        offsides=VALUES(offsides), 
+        ball_possession=VALUES(ball_possession), 
+        yellow_cards=VALUES(yellow_cards), 
+        red_cards=VALUES(red_cards), 
+        goalkeeper_saves=VALUES(goalkeeper_saves), 
+        total_passes=VALUES(total_passes), 
+        passes_accurate=VALUES(passes_accurate), 
+        passes_percentage=VALUES(passes_percentage)
+"""
+
+
+def match_statistics_row(fixture_id, team_id, statistics):
+    """
+    Az API csapatstatisztika listájából (type/value párok) a MATCH_STATISTICS_UPSERT paramétersora.
+    Az ismeretlen típusokat kihagyja, a hiányzó oszlopok értéke None.
+    """
+    data = dict.fromkeys(STATISTIC_COLUMNS.values())
+    for stat in statistics:
+        column = STATISTIC_COLUMNS.get(stat['type'])
+        if column:
+            data[column] = stat['value']
+    return (fixture_id, team_id, *(data[column] for column in STATISTIC_COLUMNS.values()))
 
 
 def write_to_match_statistics(fixture_id, team_id, statistics):
@@ -9,107 +72,40 @@ def write_to_match_statistics(fixture_id, team_id, statistics):
         return
 
     cursor = connection.cursor()
+    try:
+        #AAdatok beszúrása vagy frissítése az adatbázisba
+        cursor.execute(MATCH_STATISTICS_UPSERT, match_statistics_row(fixture_id, team_id, statistics))
+        connection.commit()
+    except mysql.connector.Error as err:
+        print(f"Adatbázis írási hiba: {err}")
+    finally:
+        cursor.close()
+        connection.close()
 
-    # SQL query az adatok beszúrásához vagy frissítéséhez
-    query = """
-        INSERT INTO match_statistics (
-            fixture_id, team_id, shots_on_goal, shots_off_goal, total_shots, 
-            blocked_shots, shots_insidebox, shots_outsidebox, fouls, corner_kicks, 
-            offsides, ball_possession, yellow_cards, red_cards, goalkeeper_saves, 
-            total_passes, passes_accurate, passes_percentage
-        ) 
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            shots_on_goal=VALUES(shots_on_goal), 
-            shots_off_goal=VALUES(shots_off_goal), 
-            total_shots=VALUES(total_shots), 
-            blocked_shots=VALUES(blocked_shots), 
-            shots_insidebox=VALUES(shots_insidebox), 
-            shots_outsidebox=VALUES(shots_outsidebox), 
-            fouls=VALUES(fouls), 
-            corner_kicks=VALUES(corner_kicks), 
-            offsides=VALUES(offsides), 
-            ball_possession=VALUES(ball_possession), 
-            yellow_cards=VALUES(yellow_cards), 
-            red_cards=VALUES(red_cards), 
-            goalkeeper_saves=VALUES(goalkeeper_saves), 
-            total_passes=VALUES(total_passes), 
-            passes_accurate=VALUES(passes_accurate), 
-            passes_percentage=VALUES(passes_percentage)
+
+def write_match_statistics_bulk(rows):
     """
+    Több mérkőzés csapatstatisztikáinak mentése egyetlen kapcsolaton, egy executemany upserttel és commit-tal.
+    :param rows: (fixture_id, team_id, statistics) hármasok, ahol statistics az API type/value listája.
+    :return: A mentett sorok száma.
+    """
+    params = [match_statistics_row(fixture_id, team_id, statistics) for fixture_id, team_id, statistics in rows]
+    if not params:
+        return 0
 
-    # Az API válasz alapján a megfelelő értékek kinyerése
-    data = {
-        'shots_on_goal': None,
-        'shots_off_goal': None,
-        'total_shots': None,
-        'blocked_shots': None,
-        'shots_insidebox': None,
-        'shots_outsidebox': None,
-        'fouls': None,
-        'corner_kicks': None,
-        'offsides': None,
-        'ball_possession': None,
-        'yellow_cards': None,
-        'red_cards': None,
-        'goalkeeper_saves': None,
-        'total_passes': None,
-        'passes_accurate': None,
-        'passes_percentage': None
-    }
-
-    # Adatok kitöltése a statisztikai típusok alapján
-    for stat in statistics:
-        stat_type = stat['type']
-        stat_value = stat['value']
-
-        if stat_type == 'Shots on Goal':
-            data['shots_on_goal'] = stat_value
-        elif stat_type == 'Shots off Goal':
-            data['shots_off_goal'] = stat_value
-        elif stat_type == 'Total Shots':
-            data['total_shots'] = stat_value
-        elif stat_type == 'Blocked Shots':
-            data['blocked_shots'] = stat_value
-        elif stat_type == 'Shots insidebox':
-            data['shots_insidebox'] = stat_value
-        elif stat_type == 'Shots outsidebox':
-            data['shots_outsidebox'] = stat_value
-        elif stat_type == 'Fouls':
-            data['fouls'] = stat_value
-        elif stat_type == 'Corner Kicks':
-            data['corner_kicks'] = stat_value
-        elif stat_type == 'Offsides':
-            data['offsides'] = stat_value
-        elif stat_type == 'Ball Possession':
-            data['ball_possession'] = stat_value
-        elif stat_type == 'Yellow Cards':
-            data['yellow_cards'] = stat_value
-        elif stat_type == 'Red Cards':
-            data['red_cards'] = stat_value
-        elif stat_type == 'Goalkeeper Saves':
-            data['goalkeeper_saves'] = stat_value
-        elif stat_type == 'Total passes':
-            data['total_passes'] = stat_value
-        elif stat_type == 'Passes accurate':
-            data['passes_accurate'] = stat_value
-        elif stat_type == 'Passes %':
-            data['passes_percentage'] = stat_value
+    connection = get_db_connection()
+    if connection is None:
+        return 0
 
+    cursor = connection.cursor()
     try:
-        #AAdatok beszúrása vagy frissítése az adatbázisba
-        cursor.execute(query, (
-            fixture_id, team_id,
-            data['shots_on_goal'], data['shots_off_goal'], data['total_shots'],
-            data['blocked_shots'], data['shots_insidebox'], data['shots_outsidebox'],
-            data['fouls'], data['corner_kicks'], data['offsides'],
-            data['ball_possession'], data['yellow_cards'], data['red_cards'],
-            data['goalkeeper_saves'], data['total_passes'], data['passes_accurate'],
-            data['passes_percentage']
-        ))
+        cursor.executemany(MATCH_STATISTICS_UPSERT, params)
         connection.commit()
+        return len(params)
     except mysql.connector.Error as err:
-        print(f"Adatbázis írási hiba: {err}")
+        connection.rollback()
+        print(f"Adatbázis írási hiba (tömeges statisztika mentés): {err}")
+        return 0
     finally:
         cursor.close()
         connection.close()
@@ -134,6 +130,44 @@ def read_from_match_statistics(fixture_id):
         connection.close()
 
 
+def read_from_match_statistics_bulk(fixture_ids, exists_only=False):
+    """
+    A read_from_match_statistics több mérkőzésre, egy kapcsolaton, DB_IN_CHUNK_SIZE méretű IN (...) listákkal.
+    :param exists_only: Csak azt nézzük, mely mérkőzésekhez van statisztika (a sorokat nem töltjük le).
+    :return: {fixture_id: [csapatonkénti sorok]} a statisztikával rendelkező mérkőzésekre,
+             exists_only esetén ezek azonosítóinak halmaza.
+    """
+    fixture_ids = list(dict.fromkeys(fixture_ids))
+    found = set() if exists_only else {}
+    if not fixture_ids:
+        return found
+
+    connection = get_db_connection()
+    if connection is None:
+        return found
+
+    cursor = connection.cursor(dictionary=not exists_only)
+    try:
+        for start in range(0, len(fixture_ids), DB_IN_CHUNK_SIZE):
+            chunk = fixture_ids[start:start + DB_IN_CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            if exists_only:
+                cursor.execute(f"SELECT DISTINCT fixture_id FROM match_statistics WHERE fixture_id IN ({placeholders})",
+                               chunk)
+                found.update(row[0] for row in cursor.fetchall())
+            else:
+                cursor.execute(f"SELECT * FROM match_statistics WHERE fixture_id IN ({placeholders})", chunk)
+                for row in cursor.fetchall():
+                    found.setdefault(row["fixture_id"], []).append(row)
+        return found
+    except mysql.connector.Error as err:
+        print(f"Database read error for match statistics (bulk): {err}")
+        return set() if exists_only else {}
+    finally:
+        cursor.close()
+        connection.close()
+
+
 def write_to_cards(data, team_id, season):
     connection = get_db_connection()
     if connection is None:
@@ -41,6 +41,23 @@ def read_from_teams(league_id):
         cursor.close()
         connection.close()
 
+def upsert_teams(cursor, teams):
+    """
+    A csapatok beszúrása egyetlen többsoros INSERT ... ON DUPLICATE KEY UPDATE utasítással,
+    a hívó tranzakciójában (a commit a hívó dolga).
+    Meglévő csapatnál csak a nevet és a logót frissíti: az országot a mérkőzés ligájából vesszük
+    (nemzetközi kupáknál ez nem a csapat országa), a league_id-t pedig a write_to_teams állítja.
+    :param teams: (id, name, country, logo) sorok, csapatonként egy.
+    """
+    if not teams:
+        return
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(teams))
+    cursor.execute(f"""
+        INSERT INTO teams (id, name, country, logo)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE name = VALUES(name), logo = VALUES(logo)
+    """, tuple(value for team in teams for value in team))
+
 def get_or_create_team(team_id, team_name, country, logo):
     connection = get_db_connection()
     if connection is None:
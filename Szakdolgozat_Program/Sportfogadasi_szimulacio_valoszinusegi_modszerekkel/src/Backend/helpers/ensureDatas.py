@@ -1,16 +1,18 @@
-from datetime import datetime
-
-from dateutil import parser
-
-from src.Backend.API.fixtures import get_fixtures_for_team, get_match_statistics, get_head_to_head_stats, \
-    get_fixture_by_id
-from src.Backend.API.odds import fetch_odds_for_fixture
+from src.Backend.API.fixtures import get_fixtures_for_team, get_head_to_head_stats, fetch_fixtures_by_ids, \
+    backfill_league_seasons, fetch_match_statistics_batch, skip_known_missing_statistics
+from src.Backend.API.odds import fetch_odds_for_fixture, parse_match_winner_odds
+from src.Backend.API.parsing import Fixture
+from src.Backend.API.quota_meter import api_quota_meter, ApiBudgetExceeded
+from src.Backend.API.single_flight import run_scoped
 from src.Backend.API.teams import get_team_country_by_id
-from src.Backend.DB.fixtures import get_last_matches, write_to_fixtures, delete_fixture_by_id, read_head_to_head_stats
+from src.Backend.DB.fixtures import get_last_matches, write_to_fixtures, read_head_to_head_stats, \
+    prefetched_last_matches
 from src.Backend.DB.odds import read_odds_by_fixture, write_to_odds
-from src.Backend.DB.statistics import read_from_match_statistics, write_to_match_statistics
+from src.Backend.DB.statistics import read_from_match_statistics_bulk
+from src.config import API_CALLS_PER_FIXTURE
 
 
+@run_scoped
 def ensure_simulation_data_available(fixture_list, num_matches=15):
     """
     Biztosítja, hogy a modellekhez szükséges adatok rendelkezésre álljanak az adatbázisban.
@@ -21,171 +23,186 @@ def ensure_simulation_data_available(fixture_list, num_matches=15):
     :param season: Az aktuális szezon.
     """
     valid_fixtures = []
-    for home_team_id, away_team_id, fixture_id in fixture_list:
-        print(f"\n🔎 **Adatok biztosítása a mérkőzéshez: {home_team_id} vs {away_team_id}** (Fixture ID: {fixture_id})")
-        for team_id in [home_team_id, away_team_id]:
-            matches = get_last_matches(team_id, away_team_id, num_matches)
-
-            # Ha nincs elég meccs, próbáljuk pótolni
-            if not matches or len(matches) < num_matches:
-                print(
-                    f"⚠️ Nem elegendő meccs található az adatbázisban (Csapat ID: {team_id}), API lekérés szükséges...")
-
-                api_matches = get_fixtures_for_team(team_id, num_matches+10)
-                if api_matches:
-                    write_to_fixtures(api_matches)
-                    print(f"✅ {len(api_matches)} mérkőzés elmentve (Csapat ID: {team_id}).")
-                else:
-                    print(f"❌ Nem sikerült meccseket lekérni az API-ból (Csapat ID: {team_id})")
-
-                # Újra lekérjük az adatbázisból
-                matches = get_last_matches(team_id, away_team_id, 30)
-
-            # 🔽 Statisztikával rendelkező meccsek szűrése
-            valid_matches = []
-            consecutive_failures = 0
-
-            for match in matches:
-                stats = read_from_match_statistics(match["id"])
-                if stats:
-                    valid_matches.append(match)
-                    consecutive_failures = 0
-                else:
-                    stats_from_api = get_match_statistics(match["id"])
-                    if stats_from_api:
-                        print(f"✅ Stat lekérve és elmentve: {match['id']}")
-                        valid_matches.append(match)
-                        consecutive_failures = 0
-                    else:
-                        print(f"❌ Nincs stat az API-ban sem, törlés: {match['id']}")
-                        delete_fixture_by_id(match["id"])  # Csak ha tényleg volt mentve
-                        consecutive_failures += 1
-
-                        if consecutive_failures >= 30:
-                            print(f"🛑 3 egymást követő stat hiány, megszakítva (Csapat ID: {team_id})")
-                            break
-
-                if len(valid_matches) >= num_matches:
-                    break
+    over_budget = []
+
+    # A csapatok múltbeli meccseit előbb liga-szezononként, tömegesen töltjük fel
+    backfill_history_for_fixtures(fixture_list)
+
+    # Az összes csapat utolsó meccsei egy lekérdezéssel (a kizárt ellenfél miatt némi tartalékkal)
+    team_ids = [team_id for home_team_id, away_team_id, _ in fixture_list for team_id in (home_team_id, away_team_id)]
+    with prefetched_last_matches(team_ids, num_matches + 5):
+        for home_team_id, away_team_id, fixture_id in fixture_list:
+            try:
+                if _ensure_fixture_data(home_team_id, away_team_id, fixture_id, num_matches):
+                    valid_fixtures.append(fixture_id)
+            except ApiBudgetExceeded:
+                print(f"📉 Elfogyott a napi API keret (tartalék: {api_quota_meter.reserve} hívás), "
+                      f"a mérkőzés adatai nem pótolhatók: {fixture_id}")
+                over_budget.append(fixture_id)
+
+    if over_budget:
+        print(f"⚠️ {len(over_budget)} kiválasztott mérkőzés a napi API keret miatt nem szimulálható: {over_budget}")
+    if valid_fixtures:
+        print("\n✅ **Minden szükséges adat elérhető! A szimuláció futtatható.** 🚀")
+    return valid_fixtures
+
 
-            print(f"📊 {len(valid_matches)} statisztikával rendelkező meccs (Csapat ID: {team_id})")
+def backfill_history_for_fixtures(fixture_list):
+    """
+    A kiválasztott mérkőzések ligáinak aktuális és előző szezonját tölti fel egyben.
+    A ligát és a szezont a mérkőzések multi-id lekéréséből vesszük (20 mérkőzés / hívás).
+    """
+    api_fixtures = fetch_fixtures_by_ids([fixture_id for _, _, fixture_id in fixture_list])
+    league_seasons = set()
+    for api_fixture in api_fixtures.values():
+        league_id = api_fixture["league"]["id"]
+        season = api_fixture["league"]["season"]
+        league_seasons.update({(league_id, season), (league_id, season - 1)})
 
-            if len(valid_matches) < 10:
-                print(
-                    f"⛔ Nem elég statisztikás meccs (min. 10 kellene), ezért a mérkőzés kihagyva (Csapat ID: {team_id})")
-                break  # már az egyik csapatnál sem elég, nem kell nézni tovább
+    if league_seasons:
+        backfill_league_seasons(league_seasons)
 
-        h2h_matches = read_head_to_head_stats(home_team_id, away_team_id)
 
-        if len(h2h_matches) < 10:
+def _ensure_fixture_data(home_team_id, away_team_id, fixture_id, num_matches):
+    """
+    Egy mérkőzés csapat-, H2H- és odds adatainak biztosítása.
+    Minden API lekérés előtt ellenőrzi a napi keretet; ha az elfogyott, ApiBudgetExceeded-et dob.
+    Az adatbázisban már meglévő adatokhoz nem kell API keret.
+    :return: True, ha a mérkőzés minden szükséges adata rendelkezésre áll.
+    """
+    print(f"\n🔎 **Adatok biztosítása a mérkőzéshez: {home_team_id} vs {away_team_id}** (Fixture ID: {fixture_id})")
+    for team_id in [home_team_id, away_team_id]:
+        matches = get_last_matches(team_id, away_team_id, num_matches)
+
+        # Ha nincs elég meccs, próbáljuk pótolni
+        if not matches or len(matches) < num_matches:
             print(
-                f"⚠️ Nem elegendő H2H meccs az adatbázisban ({len(h2h_matches)} db), API lekérés szükséges: ({home_team_id} vs {away_team_id})")
-            h2h_stats = get_head_to_head_stats(home_team_id, away_team_id)
-        else:
-            print(f"✅ Megfelelő számú H2H meccs található az adatbázisban ({len(h2h_matches)} db)")
-            h2h_stats = h2h_matches
+                f"⚠️ Nem elegendő meccs található az adatbázisban (Csapat ID: {team_id}), API lekérés szükséges...")
 
-        valid_matches = []
+            api_quota_meter.require(API_CALLS_PER_FIXTURE)
+            api_matches = get_fixtures_for_team(team_id, num_matches+10)
+            if api_matches:
+                write_to_fixtures(api_matches)
+                print(f"✅ {len(api_matches)} mérkőzés elmentve (Csapat ID: {team_id}).")
+            else:
+                print(f"❌ Nem sikerült meccseket lekérni az API-ból (Csapat ID: {team_id})")
 
-        for match in h2h_stats:
-            match_date = parser.isoparse(match["date"]) if isinstance(match["date"], str) else match["date"]
-            match_date = match_date.replace(tzinfo=None)
+            # Újra lekérjük az adatbázisból
+            matches = get_last_matches(team_id, away_team_id, 30)
 
-            if match.get("status") in ("NS", "TBD", "POSTP"):
-                continue
+        # 🔽 Statisztikával rendelkező meccsek szűrése, a hiányzó statokat egy csomagban kérjük le
+        # (az ismerten statisztika nélküli meccseket kihagyva)
+        with_statistics = read_from_match_statistics_bulk([match["id"] for match in matches], exists_only=True)
+        missing_ids = [match["id"] for match in matches if match["id"] not in with_statistics]
+        to_fetch = skip_known_missing_statistics(missing_ids) if missing_ids else []
+        fetched = {}
+        if to_fetch:
+            api_quota_meter.require(API_CALLS_PER_FIXTURE)
+            fetched = fetch_match_statistics_batch(to_fetch)
 
-            stats = read_from_match_statistics(match["id"])
-            if stats:
+        valid_matches = []
+        consecutive_failures = 0
+
+        for match in matches:
+            if match["id"] not in missing_ids:
                 valid_matches.append(match)
-                continue
-
-            stats = get_match_statistics(match["id"])
-            if not stats or not any(
-                    any(item.get("value") not in [None, 0, ""] for item in team["statistics"]) for team in stats):
-                print(f"❌ Nincs használható stat ehhez a H2H meccshez: {match['id']}")
-                continue
-
-            fixture = get_fixture_by_id(match["id"])
-            if not fixture:
-                continue
-
-            match["home_team_id"] = fixture["teams"]["home"]["id"]
-            match["home_team_name"] = fixture["teams"]["home"]["name"]
-            match["home_team_logo"] = fixture["teams"]["home"]["logo"]
-            match["home_team_country"] = get_team_country_by_id(match["home_team_id"]) or None
-
-            match["away_team_id"] = fixture["teams"]["away"]["id"]
-            match["away_team_name"] = fixture["teams"]["away"]["name"]
-            match["away_team_logo"] = fixture["teams"]["away"]["logo"]
-            match["away_team_country"] = get_team_country_by_id(match["away_team_id"]) or None
-
-            match["date"] = parser.isoparse(fixture["fixture"]["date"])
-            match["status"] = fixture["fixture"]["status"]
-            match["score_home"] = fixture["goals"]["home"]
-            match["score_away"] = fixture["goals"]["away"]
-
-            write_to_fixtures([match])
-            for team_stats in stats:
-                team_id = team_stats["team"]["id"]
-                write_to_match_statistics(match["id"], team_id, team_stats["statistics"])
-
-            print(f"✅ Fixture és stat mentve: {match['id']}")
-            valid_matches.append(match)
+                consecutive_failures = 0
+            elif match["id"] in fetched:
+                print(f"✅ Stat lekérve és elmentve: {match['id']}")
+                valid_matches.append(match)
+                consecutive_failures = 0
+            else:
+                # Nem töröljük: a törölt meccset a következő lekérés újra beszúrná, a statja pedig
+                # a missing_statistics táblában van nyilvántartva
+                print(f"❌ Nincs stat az API-ban sem, kihagyva: {match['id']}")
+                consecutive_failures += 1
 
-        # ✅ Végső ellenőrzés
-        if len(valid_matches) < 5:
-            print(f"⛔ Nem elég H2H meccs statisztikával (csak {len(valid_matches)}), mérkőzés kihagyva.")
-            continue
-        else:
-            print(f"📊 Összesen {len(valid_matches)} H2H meccshez van statisztika.")
+                if consecutive_failures >= 30:
+                    print(f"🛑 3 egymást követő stat hiány, megszakítva (Csapat ID: {team_id})")
+                    break
 
-        # Újra lekérjük az összes H2H meccset a végső ellenőrzéshez
-        valid_final_h2h = []
-        all_h2h_matches = read_head_to_head_stats(home_team_id, away_team_id)
-        for match in all_h2h_matches:
-            stats = read_from_match_statistics(match["id"])
-            print(f"📂 Fixture ID: {match['id']} → {len(stats)} stat sor található.")
-            if stats:
-                valid_final_h2h.append(match)
+            if len(valid_matches) >= num_matches:
+                break
 
-        print(f"📊 Összesen {len(valid_final_h2h)} H2H meccshez van statisztika elmentve.")
+        print(f"📊 {len(valid_matches)} statisztikával rendelkező meccs (Csapat ID: {team_id})")
 
-        if len(valid_final_h2h) < 5:
-            print(f"⛔ Nem elég H2H adat (min. 5 statisztikás meccs kellene), ezért a mérkőzés kihagyva.")
+        if len(valid_matches) < 10:
+            print(
+                f"⛔ Nem elég statisztikás meccs (min. 10 kellene), ezért a mérkőzés kihagyva (Csapat ID: {team_id})")
+            break  # már az egyik csapatnál sem elég, nem kell nézni tovább
+
+    h2h_matches = read_head_to_head_stats(home_team_id, away_team_id)
+
+    if len(h2h_matches) < 10:
+        print(
+            f"⚠️ Nem elegendő H2H meccs az adatbázisban ({len(h2h_matches)} db), API lekérés szükséges: ({home_team_id} vs {away_team_id})")
+        api_quota_meter.require(API_CALLS_PER_FIXTURE)
+        h2h_stats = get_head_to_head_stats(home_team_id, away_team_id)
+    else:
+        print(f"✅ Megfelelő számú H2H meccs található az adatbázisban ({len(h2h_matches)} db)")
+        h2h_stats = h2h_matches
+
+    played_h2h = [match for match in h2h_stats if match.get("status") not in ("NS", "TBD", "POSTP")]
+    with_statistics = read_from_match_statistics_bulk([match["id"] for match in played_h2h], exists_only=True)
+    missing_ids = [match["id"] for match in played_h2h if match["id"] not in with_statistics]
+    to_fetch = skip_known_missing_statistics(missing_ids) if missing_ids else []
+    fetched = {}
+    if to_fetch:
+        api_quota_meter.require(API_CALLS_PER_FIXTURE)
+        fetched = fetch_match_statistics_batch(to_fetch)
+
+    valid_matches = []
+
+    for match in played_h2h:
+        if match["id"] not in missing_ids:
+            valid_matches.append(match)
+            continue
+
+        # A multi-id keresés a mérkőzés adatait is visszaadja, a statisztikák már el vannak mentve
+        fixture = fetched.get(match["id"])
+        if not fixture:
+            print(f"❌ Nincs használható stat ehhez a H2H meccshez: {match['id']}")
             continue
 
-        if not read_odds_by_fixture(fixture_id):
-            print(f"⚠️ Hiányzó oddsok: {fixture_id}, API lekérés...")
-            odds = fetch_odds_for_fixture(fixture_id)
-            if odds:
-                processed_odds = []
-                for bookmaker in odds:  # A fogadóirodákat tartalmazó lista
-                    for bet in bookmaker.get("bookmakers", []):
-                        for bet_option in bet.get("bets", []):
-                            if bet_option.get("name") == "Match Winner":
-                                try:
-                                    processed_odds.append({
-                                        "fixture_id": fixture_id,
-                                        "bookmaker_id": bet["id"],
-                                        "home_odds": bet_option["values"][0]["odd"],
-                                        "draw_odds": bet_option["values"][1]["odd"],
-                                        "away_odds": bet_option["values"][2]["odd"],
-                                        "updated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                    })
-                                except (IndexError, KeyError):
-                                    print(f"⚠️ Hiányos odds adatok a következő fogadóirodánál: {bet['id']}")
-                                    continue
-
-                if processed_odds:
-                    write_to_odds(processed_odds)  # Oddsok mentése
-                    print(f"✅ Oddsok elmentve a mérkőzéshez: {fixture_id}")
-                else:
-                    print(f"❌ Nem sikerült oddsokat feldolgozni: {fixture_id}")
-                    continue
+        match.update(Fixture.from_api(fixture).to_row())
+        match["home_team_country"] = get_team_country_by_id(match["home_team_id"]) or None
+        match["away_team_country"] = get_team_country_by_id(match["away_team_id"]) or None
+
+        write_to_fixtures([match])
+        print(f"✅ Fixture és stat mentve: {match['id']}")
+        valid_matches.append(match)
+
+    # ✅ Végső ellenőrzés
+    if len(valid_matches) < 5:
+        print(f"⛔ Nem elég H2H meccs statisztikával (csak {len(valid_matches)}), mérkőzés kihagyva.")
+        return False
+    else:
+        print(f"📊 Összesen {len(valid_matches)} H2H meccshez van statisztika.")
+
+    # Újra lekérjük az összes H2H meccset a végső ellenőrzéshez (csak a statisztikával rendelkezők jönnek)
+    valid_final_h2h = read_head_to_head_stats(home_team_id, away_team_id)
+
+    print(f"📊 Összesen {len(valid_final_h2h)} H2H meccshez van statisztika elmentve.")
+
+    if len(valid_final_h2h) < 5:
+        print(f"⛔ Nem elég H2H adat (min. 5 statisztikás meccs kellene), ezért a mérkőzés kihagyva.")
+        return False
+
+    if not read_odds_by_fixture(fixture_id):
+        print(f"⚠️ Hiányzó oddsok: {fixture_id}, API lekérés...")
+        api_quota_meter.require(API_CALLS_PER_FIXTURE)
+        odds = fetch_odds_for_fixture(fixture_id)
+        if odds:
+            _, odds_by_fixture = parse_match_winner_odds(odds)
+            processed_odds = [dict(row, fixture_id=fixture_id) for rows in odds_by_fixture.values() for row in rows]
+
+            if processed_odds:
+                write_to_odds(processed_odds)  # Oddsok mentése
+                print(f"✅ Oddsok elmentve a mérkőzéshez: {fixture_id}")
             else:
-                print(f"❌ Nem sikerült lekérni az oddsokat: {fixture_id}")
-                continue
-        valid_fixtures.append(fixture_id)
-    if valid_fixtures:
-        print("\n✅ **Minden szükséges adat elérhető! A szimuláció futtatható.** 🚀")
-    return valid_fixtures
\ No newline at end of file
+                print(f"❌ Nem sikerült oddsokat feldolgozni: {fixture_id}")
+                return False
+        else:
+            print(f"❌ Nem sikerült lekérni az oddsokat: {fixture_id}")
+            return False
+    return True
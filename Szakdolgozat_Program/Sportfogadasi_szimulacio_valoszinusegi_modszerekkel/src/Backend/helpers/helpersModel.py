@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from src.Backend.API.fixtures import get_league_id_by_fixture
+from src.Backend.API.single_flight import run_scoped
 from src.Backend.DB.predictions import save_model_prediction
 from src.Backend.DB.teams import get_league_by_team, write_league_id_to_team
 from src.Backend.probability_models.veto_model import predict_with_veto_model
@@ -11,6 +12,7 @@ from src.Backend.probability_models.monte_carlo_model import monte_carlo_predict
 from src.Backend.probability_models.poisson_model import poisson_predict
 
 
+@run_scoped
 def save_all_predictions(fixture_id, home_team_id, away_team_id, match_group_id):
     """
     Elmenti az összes modell előrejelzését egy adott mérkőzésre.
@@ -0,0 +1,37 @@
+"""
+Kötegelt adatbázis karbantartás, a lekérdezésektől külön futtatva.
+
+A read_head_to_head_stats csak olvas, ezért a statisztika nélküli (és az API-ban sem elérhető) régi
+mérkőzések törlése itt történik, nem olvasás közben mellékhatásként.
+
+Futtatás a projekt gyökeréből:
+    python -m src.Backend.helpers.maintenance
+    python -m src.Backend.helpers.maintenance --min-age-days 60
+"""
+import argparse
+
+from src.Backend.DB.fixtures import delete_fixtures_without_statistics
+from src.Backend.DB.migrations import apply_migrations
+from src.config import STATISTICLESS_FIXTURE_MIN_AGE_DAYS
+
+
+def run_maintenance(min_age_days=STATISTICLESS_FIXTURE_MIN_AGE_DAYS):
+    """
+    :return: {feladat neve: érintett sorok száma}
+    """
+    return {"fixtures_without_statistics": delete_fixtures_without_statistics(min_age_days)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kötegelt adatbázis karbantartás")
+    parser.add_argument("--min-age-days", type=int, default=STATISTICLESS_FIXTURE_MIN_AGE_DAYS,
+                        help="Csak az ennél régebbi, statisztika nélküli mérkőzések törlődnek")
+    args = parser.parse_args()
+
+    # A missing_statistics táblát a migrációk hozzák létre
+    apply_migrations()
+    run_maintenance(args.min_age_days)
+
+
+if __name__ == "__main__":
+    main()
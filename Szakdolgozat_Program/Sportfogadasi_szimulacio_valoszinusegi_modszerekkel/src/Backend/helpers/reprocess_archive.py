@@ -0,0 +1,172 @@
+"""
+A fixtures, match_statistics és odds táblák újraépítése a nyers API archívumból, hálózati hívás nélkül.
+Parser változás vagy új oszlop (pl. több statisztika típus) után így nem kell újra letölteni az adatokat.
+
+Futtatás a projekt gyökeréből:
+    python -m src.Backend.helpers.reprocess_archive                       (a teljes archívum)
+    python -m src.Backend.helpers.reprocess_archive --since 2024-01-01 --only statistics
+
+Ugyanarra a mérkőzésre (ill. mérkőzés-csapat / mérkőzés-iroda párra) mindig a legutóbb archivált
+válasz érvényes. A mérkőzéseket írjuk először, mert a statisztikák és az oddsok hivatkoznak rájuk.
+"""
+import argparse
+import time
+from datetime import datetime
+
+from src.Backend.API.endpoints import FIXTURES, HEAD_TO_HEAD, FIXTURE_STATISTICS, ODDS
+from src.Backend.API.fixtures import has_usable_statistics
+from src.Backend.API.odds import parse_match_winner_odds
+from src.Backend.API.parsing import Fixture
+from src.Backend.API.raw_archive import raw_archive
+from src.Backend.DB.bookmakers import save_bookmakers
+from src.Backend.DB.fixtures import write_to_fixtures
+from src.Backend.DB.odds import write_to_odds
+from src.Backend.DB.statistics import write_match_statistics_bulk
+
+TABLES = ("fixtures", "statistics", "odds")
+WRITE_CHUNK = 1000  # Ennyi sort adunk át egyszerre az író függvényeknek
+
+
+def is_pre_match_day_list(entry):
+    """
+    A save_pre_match_fixtures napi NS listája: ebből élesben csak az oddsszal rendelkező mérkőzéseket mentjük.
+    """
+    params = entry["params"] or {}
+    return entry["endpoint"] == FIXTURES and "date" in params and params.get("status") == "NS"
+
+
+def collect_from_archive(archive, tables=TABLES, since=None, until=None):
+    """
+    Végigolvassa az archívumot, és táblánként összegyűjti a legfrissebb sorokat.
+    A napi pre-match listák mérkőzései közül (az éles szinkronhoz hasonlóan) csak azok maradnak, amelyekhez
+    az archívumban van Match Winner odds. A hibás szerkezetű elemeket kihagyjuk és megszámoljuk.
+    :return: {"fixtures": {id: sor}, "statistics": {(fixture_id, team_id): statisztikák},
+              "odds": {(fixture_id, bookmaker_id): sor}, "bookmakers": {id: név}, "skipped": kihagyott elemek}
+    """
+    fixtures, statistics, odds, bookmakers = {}, {}, {}, {}
+    pre_match = []  # (mérkőzés sor, archiválás ideje) - az oddsok ismeretében döntünk róluk
+    fixtures_with_odds = set()
+    skipped = 0
+    endpoints = set()
+    if "fixtures" in tables:
+        endpoints.update([FIXTURES, HEAD_TO_HEAD, ODDS])  # Az oddsok a pre-match mérkőzések szűréséhez kellenek
+    if "statistics" in tables:
+        endpoints.update([FIXTURES, FIXTURE_STATISTICS])  # Az "ids" lekérés beágyazva adja a statisztikát
+    if "odds" in tables:
+        endpoints.add(ODDS)
+
+    # Partíciónként több végpont fájl is van, ezért az archiválás ideje dönti el, melyik sor a frissebb
+    archived_at = {"fixtures": {}, "statistics": {}, "odds": {}}
+
+    def keep(table, target, key, value, timestamp):
+        if timestamp >= archived_at[table].get(key, float("-inf")):
+            archived_at[table][key] = timestamp
+            target[key] = value
+
+    for entry in archive.iter_entries(endpoints=sorted(endpoints), since=since, until=until):
+        body = entry["body"] if isinstance(entry["body"], dict) else {}
+        items = body.get("response") or []
+        timestamp = entry["archived_at"]
+        if not isinstance(items, list):
+            skipped += 1
+            continue
+
+        # A statisztika végpontnál az egész válasz (mindkét csapat) dönti el, hogy használható-e
+        usable_statistics = False
+        if entry["endpoint"] == FIXTURE_STATISTICS:
+            try:
+                usable_statistics = has_usable_statistics(items)
+            except (KeyError, TypeError, AttributeError):
+                skipped += len(items)  # Hibás elem miatt a válasz egésze megbízhatatlan
+                continue
+
+        for item in items:
+            try:
+                if entry["endpoint"] in (FIXTURES, HEAD_TO_HEAD):
+                    if "fixtures" in tables:
+                        fixture = Fixture.from_api(item)
+                        if is_pre_match_day_list(entry):
+                            pre_match.append((fixture.to_row(), timestamp))
+                        else:
+                            keep("fixtures", fixtures, fixture.id, fixture.to_row(), timestamp)
+                    if "statistics" in tables and has_usable_statistics(item.get("statistics")):
+                        for team_stat in item["statistics"]:
+                            keep("statistics", statistics, (item["fixture"]["id"], team_stat["team"]["id"]),
+                                 team_stat["statistics"], timestamp)
+
+                elif entry["endpoint"] == FIXTURE_STATISTICS:
+                    if usable_statistics:
+                        keep("statistics", statistics, (int(entry["params"]["fixture"]), item["team"]["id"]),
+                             item["statistics"], timestamp)
+
+                elif entry["endpoint"] == ODDS:
+                    item_bookmakers, odds_by_fixture = parse_match_winner_odds([item])
+                    fixtures_with_odds.update(odds_by_fixture)
+                    if "odds" in tables:
+                        bookmakers.update(item_bookmakers)
+                        updated_at = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+                        for fixture_odds in odds_by_fixture.values():
+                            for row in fixture_odds:
+                                row["updated_at"] = updated_at  # A lekérés ideje, nem az újrafeldolgozásé
+                                keep("odds", odds, (row["fixture_id"], row["bookmaker_id"]), row, timestamp)
+            except (KeyError, TypeError, ValueError, AttributeError, IndexError):
+                skipped += 1
+
+    for row, timestamp in pre_match:
+        if row["id"] in fixtures_with_odds:
+            keep("fixtures", fixtures, row["id"], row, timestamp)
+
+    return {"fixtures": fixtures, "statistics": statistics, "odds": odds, "bookmakers": bookmakers,
+            "skipped": skipped}
+
+
+def chunks(rows, size=WRITE_CHUNK):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def reprocess_archive(archive=raw_archive, tables=TABLES, since=None, until=None):
+    """
+    Újraépíti a kért táblákat az archívumból.
+    Az oddsokat csak az archívumban is szereplő mérkőzésekhez írjuk (a pre-match szinkron is csak ezeket menti).
+    :return: Táblánként a kiírt sorok száma.
+    """
+    start = time.perf_counter()
+    collected = collect_from_archive(archive, tables, since, until)
+
+    fixture_rows = list(collected["fixtures"].values())
+    for chunk in chunks(fixture_rows):
+        write_to_fixtures(chunk)
+
+    statistic_rows = [(fixture_id, team_id, statistics)
+                      for (fixture_id, team_id), statistics in collected["statistics"].items()]
+    for chunk in chunks(statistic_rows):
+        write_match_statistics_bulk(chunk)
+
+    odds_rows = list(collected["odds"].values())
+    if "fixtures" in tables:
+        odds_rows = [row for row in odds_rows if row["fixture_id"] in collected["fixtures"]]
+    if odds_rows:
+        save_bookmakers(collected["bookmakers"])
+    for chunk in chunks(odds_rows):
+        write_to_odds(chunk)
+
+    counts = {"fixtures": len(fixture_rows), "statistics": len(statistic_rows), "odds": len(odds_rows),
+              "skipped": collected["skipped"]}
+    print(f"♻️ Archívum újrafeldolgozva {time.perf_counter() - start:.1f} mp alatt: {counts['fixtures']} mérkőzés, "
+          f"{counts['statistics']} statisztika sor, {counts['odds']} odds, {counts['skipped']} hibás elem kihagyva.")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Táblák újraépítése a nyers API archívumból (hálózat nélkül)")
+    parser.add_argument("--since", help="Első feldolgozott partíció (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Utolsó feldolgozott partíció (YYYY-MM-DD)")
+    parser.add_argument("--only", choices=TABLES, action="append", help="Csak a megadott tábla (ismételhető)")
+    args = parser.parse_args()
+
+    reprocess_archive(tables=tuple(args.only or TABLES), since=args.since, until=args.until)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.model_selection import cross_val_score
 
-from src.Backend.API.fixtures import get_match_statistics
+from src.Backend.API.fixtures import get_match_statistics_batch
 from src.Backend.DB.fixtures import get_last_matches
 
 
@@ -37,9 +37,14 @@ def prepare_training_data(team_id, num_matches=30):
     print(f"✅ {len(matches)} matches retrieved for team ID: {team_id}")
 
     X, y = [], []
+    if not matches:
+        return np.array(X), np.array(y)
+
+    # Az összes meccs statisztikája egyben: adatbázisból, a hiányzók egy multi-id API kéréscsomagban
+    stats_by_id = get_match_statistics_batch([match['id'] for match in matches])
 
     for match in matches:
-        match_stats_list = get_match_statistics(match['id'])
+        match_stats_list = stats_by_id.get(match['id'])
         print(f"⚽ Match ID: {match['id']} - Stats retrieved: {len(match_stats_list) if match_stats_list else 'None'}")
 
         if not match_stats_list or len(match_stats_list) != 2:
@@ -144,9 +149,10 @@ def get_average_team_statistics(team_id, num_matches=10):
     matches = get_last_matches(team_id, num_matches)
     total_stats = np.zeros(16, dtype=np.float64)
     count = 0
+    stats_by_id = get_match_statistics_batch([match['id'] for match in matches])
 
     for match in matches:
-        match_stats_list = get_match_statistics(match['id'])
+        match_stats_list = stats_by_id.get(match['id'])
         if not match_stats_list:
             continue
 
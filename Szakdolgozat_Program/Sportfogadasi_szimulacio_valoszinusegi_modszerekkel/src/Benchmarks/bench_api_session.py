@@ -0,0 +1,90 @@
+"""
+Benchmark: kérésenkénti requests.get vs. közös keep-alive session (make_api_request).
+
+Egy helyi, HTTP/1.1-es helyettesítő szervert indít, amely minden új TCP kapcsolatnál
+mesterséges kézfogási késleltetést szimulál (a TLS kézfogás költségét modellezve).
+
+Futtatás a projekt gyökeréből:
+    python -m src.Benchmarks.bench_api_session --calls 200 --handshake-ms 20
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import src.Backend.API.make_api_request as api_module
+from src.Backend.API.rate_limiter import TokenBucket
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive támogatás
+    disable_nagle_algorithm = True  # Különben a késleltetett ACK torzítja a keep-alive méréseket
+    handshake_delay = 0.0
+
+    def setup(self):
+        # Új kapcsolatonként egyszer fut le -> itt szimuláljuk a kézfogás költségét
+        time.sleep(self.handshake_delay)
+        super().setup()
+
+    def do_GET(self):
+        body = json.dumps({"errors": [], "results": 1, "response": [{"ok": True}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(handshake_delay):
+    StandInHandler.handshake_delay = handshake_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(call, calls):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API session benchmark")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server = start_stand_in_server(args.handshake_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    # A rate limitet és a cache-t megkerüljük, hogy csak a hálózati költséget mérjük. A helyettesítő
+    # szerver válaszai (nem a valódi API címe) nem kerülnek a nyers archívumba és a keret mérésébe.
+    api_module.BASE_URL = base_url
+    api_module.api_rate_limiter = TokenBucket(10 ** 9, 1, capacity=10 ** 6)
+    pooled_call = api_module._send_request
+
+    old = measure(lambda: requests.get(f"{base_url}fixtures", params={"id": 1}).json(), args.calls)
+    new = measure(lambda: pooled_call("fixtures", {"id": 1}), args.calls)
+
+    server.shutdown()
+    api_module.close_api_session()
+
+    old_avg, new_avg = statistics.mean(old), statistics.mean(new)
+    print(f"Hívások száma: {args.calls}, szimulált kézfogás: {args.handshake_ms} ms")
+    print(f"requests.get hívásonként: átlag {old_avg:.2f} ms, medián {statistics.median(old):.2f} ms")
+    print(f"Közös session:            átlag {new_avg:.2f} ms, medián {statistics.median(new):.2f} ms")
+    print(f"Megtakarítás hívásonként: {old_avg - new_avg:.2f} ms ({(1 - new_avg / old_avg):.0%})")
+
+
+if __name__ == "__main__":
+    main()
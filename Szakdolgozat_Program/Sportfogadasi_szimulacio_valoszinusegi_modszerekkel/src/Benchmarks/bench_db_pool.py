@@ -0,0 +1,69 @@
+"""
+Benchmark: lekérdezésenként új MySQL kapcsolat vs. közös kapcsolatkészlet (get_db_connection).
+
+Egy 1000 mérkőzéses, soronkénti betöltés kapcsolatkezelését modellezi (ahogy a write_to_fixtures
+a tömeges írás előtt működött): mérkőzésenként egy kapcsolat, a get_or_create_team csapatonként még
+egyet-egyet nyit, mindegyiken egy rövid lekérdezéssel.
+Az adatbázist nem módosítja (SELECT 1), így bármelyik futó MySQL ellen mérhető.
+
+Futtatás a projekt gyökeréből (futó MySQL szerver kell, DB_CONFIG szerint):
+    python -m src.Benchmarks.bench_db_pool --fixtures 1000
+
+Eredmények: NINCSENEK. A benchmarkot még nem futtattuk valós MySQL ellen (a fejlesztői környezetben
+nem volt elérhető szerver: "2003: Can't connect to MySQL server on '127.0.0.1:3306'"), így a
+kapcsolatkészlet gyorsítása nincs számokkal alátámasztva. Az első futás előtte/utána eredményét
+(medián, p95, összidő mindkét módban, a szerver és a kliens helye) ide kell beírni.
+"""
+import argparse
+import statistics
+import time
+
+import mysql.connector
+
+from src.Backend.DB.connection import get_db_connection, get_db_pool
+from src.config import DB_CONFIG, DB_POOL_SIZE
+
+CONNECTIONS_PER_FIXTURE = 3  # Mérkőzés + hazai és vendég csapat
+
+
+def run_query(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def ingest(connect, fixtures):
+    """
+    Lekérdezésenkénti időket (ms) ad vissza, a kapcsolat megnyitásával / kivételével együtt.
+    """
+    timings = []
+    for _ in range(fixtures * CONNECTIONS_PER_FIXTURE):
+        start = time.perf_counter()
+        run_query(connect())
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MySQL connection pool benchmark")
+    parser.add_argument("--fixtures", type=int, default=1000)
+    args = parser.parse_args()
+
+    old = ingest(lambda: mysql.connector.connect(**DB_CONFIG), args.fixtures)
+    get_db_pool()  # A készlet megnyitása nem része a lekérdezésenkénti mérésnek
+    new = ingest(get_db_connection, args.fixtures)
+
+    queries = args.fixtures * CONNECTIONS_PER_FIXTURE
+    print(f"{args.fixtures} mérkőzés betöltése = {queries} lekérdezés, készletméret: {DB_POOL_SIZE}")
+    for label, timings in (("új kapcsolat / lekérdezés:", old), ("kapcsolatkészlet:", new)):
+        print(f"{label:<28} medián {statistics.median(timings):.3f} ms, "
+              f"p95 {statistics.quantiles(timings, n=20)[-1]:.3f} ms, összesen {sum(timings) / 1000:.2f} s")
+    print(f"Gyorsulás:                   {sum(old) / sum(new):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: egy teljes szezon `fixtures` válaszának feldolgozása.
+Régi út: json.loads + kézzel épített, egymásba ágyazott indexelésű szótárak.
+Új út: parsing.loads (orjson, ha telepítve van) + Fixture.from_api (__slots__ dataclass).
+
+Futtatás a projekt gyökeréből:
+    python -m src.Benchmarks.bench_parsing --fixtures 380 --seasons 10 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+from src.Backend.API.parsing import JSON_BACKEND, loads, parse_fixtures
+
+
+def make_season_payload(fixture_count):
+    """
+    Valósághű szerkezetű (és méretű) `fixtures?league=&season=` válasz.
+    """
+    response = []
+    for i in range(fixture_count):
+        response.append({
+            "fixture": {
+                "id": 1000000 + i, "referee": "Referee Name", "timezone": "Europe/Budapest",
+                "date": "2023-08-11T21:00:00+02:00", "timestamp": 1691780400,
+                "periods": {"first": 1691780400, "second": 1691784000},
+                "venue": {"id": 500 + i % 20, "name": "Stadium", "city": "City"},
+                "status": {"long": "Match Finished", "short": "FT", "elapsed": 90},
+            },
+            "league": {"id": 39, "name": "Premier League", "country": "England", "logo": "league.png",
+                       "flag": "flag.svg", "season": 2023, "round": f"Regular Season - {i // 10 + 1}"},
+            "teams": {
+                "home": {"id": 30 + i % 20, "name": f"Home {i % 20}", "logo": "home.png", "winner": True},
+                "away": {"id": 30 + (i + 7) % 20, "name": f"Away {(i + 7) % 20}", "logo": "away.png",
+                         "winner": False},
+            },
+            "goals": {"home": 2, "away": 1},
+            "score": {"halftime": {"home": 1, "away": 0}, "fulltime": {"home": 2, "away": 1},
+                      "extratime": {"home": None, "away": None}, "penalty": {"home": None, "away": None}},
+        })
+    return json.dumps({"get": "fixtures", "parameters": {"league": "39", "season": "2023"}, "errors": [],
+                       "results": fixture_count, "paging": {"current": 1, "total": 1},
+                       "response": response}).encode()
+
+
+def old_path(raw):
+    data = json.loads(raw)
+    return [
+        {
+            "id": fixture['fixture']['id'],
+            "date": fixture['fixture']['date'],
+            "home_team_id": fixture['teams']['home']['id'],
+            "home_team_name": fixture['teams']['home']['name'],
+            "home_team_country": fixture['league'].get('country', 'Unknown'),
+            "home_team_logo": fixture['teams']['home']['logo'],
+            "away_team_id": fixture['teams']['away']['id'],
+            "away_team_name": fixture['teams']['away']['name'],
+            "away_team_country": fixture['league'].get('country', 'Unknown'),
+            "away_team_logo": fixture['teams']['away']['logo'],
+            "score_home": fixture['score']['fulltime']['home'],
+            "score_away": fixture['score']['fulltime']['away'],
+            "status": fixture['fixture']['status']['short'],
+        }
+        for fixture in data.get('response', [])
+    ]
+
+
+def new_path(raw):
+    return parse_fixtures(loads(raw)["response"])
+
+
+def measure(func, payloads, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in payloads:
+            func(raw)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixture parsing benchmark")
+    parser.add_argument("--fixtures", type=int, default=380, help="Mérkőzések száma szezononként")
+    parser.add_argument("--seasons", type=int, default=10, help="Feldolgozott szezon válaszok száma")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [make_season_payload(args.fixtures) for _ in range(args.seasons)]
+    assert old_path(payloads[0]) == new_path(payloads[0])
+
+    old = measure(old_path, payloads, args.repeat)
+    new = measure(new_path, payloads, args.repeat)
+
+    size_kb = sum(len(raw) for raw in payloads) / 1024
+    print(f"{args.seasons} szezon × {args.fixtures} mérkőzés ({size_kb:.0f} KB), JSON backend: {JSON_BACKEND}")
+    print(f"json + kézi szótárak:      medián {statistics.median(old):.2f} ms")
+    print(f"parsing modul:             medián {statistics.median(new):.2f} ms")
+    print(f"Gyorsulás:                 {statistics.median(old) / statistics.median(new):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Helyi API helyettesítő szerver: egy felvett kazetta (lásd src/Backend/API/cassette.py) visszajátszása.
+
+Felvétel élő API-ról:
+    API_RECORD_CASSETTE=refresh.jsonl.gz python -m src.main     (-> data/cassettes/refresh.jsonl.gz)
+
+Felvétel közben a make_api_request megkerüli a cache-t, így a kazetta minden kérést tartalmaz.
+
+Visszajátszás, majd a program / benchmark futtatása a helyettesítő ellen:
+    python -m src.Benchmarks.cassette_server refresh.jsonl.gz --port 8765 --latency-ms 120
+    API_BASE_URL=http://127.0.0.1:8765/ python -m src.main
+
+Ugyanarra a kérésre a felvett válaszokat sorrendben adja vissza (az utolsót ismételve).
+A szerver a késleltetést, a percenkénti és a napi keretet is szimulálja (429 + Retry-After,
+x-ratelimit fejlécek, elfogyott napi keretnél "requests" hiba), így a rate limit kezelés
+is mérhető élő API nélkül.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from src.Backend.API.cassette import load_cassette
+from src.Backend.API.response_cache import make_cache_key
+
+EMPTY_BODY = {"errors": [], "results": 0, "paging": {"current": 1, "total": 1}, "response": []}
+# Az api-sports válasza, ha a napi keret elfogyott (HTTP 200, hibaüzenettel)
+DAILY_LIMIT_BODY = {
+    "errors": {"requests": "You have reached the request limit for the day, Go to "
+                           "https://dashboard.api-football.com to upgrade your plan."},
+    "results": 0, "paging": {"current": 1, "total": 1}, "response": []
+}
+
+
+class CassetteReplay:
+    """
+    A visszajátszás állapota: kazetta tartalma, kulcsonkénti pozíció, keretek és statisztika.
+    """
+
+    def __init__(self, entries, latency=0.0, jitter=0.0, per_minute=None, daily_limit=None):
+        self.entries = entries
+        self.latency = latency
+        self.jitter = jitter
+        self.per_minute = per_minute
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._window = deque()
+        self.served = 0
+        self.misses = 0
+        self.throttled = 0
+        self.exhausted = 0
+
+    def next_entry(self, key):
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                self.misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return recorded[min(position, len(recorded) - 1)]
+
+    def daily_exhausted(self):
+        with self._lock:
+            if self.daily_limit is not None and self.served >= self.daily_limit:
+                self.exhausted += 1
+                return True
+            return False
+
+    def admit(self):
+        """
+        Csúszó egyperces ablak: (engedélyezve, Retry-After másodperc, percenként hátralévő hívás).
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if self.per_minute is not None and len(self._window) >= self.per_minute:
+                self.throttled += 1
+                return False, max(int(60 - (now - self._window[0])) + 1, 1), 0
+            self._window.append(now)
+            self.served += 1
+            remaining = None if self.per_minute is None else self.per_minute - len(self._window)
+            return True, 0, remaining
+
+    def quota_headers(self, minute_remaining):
+        headers = {}
+        if self.daily_limit is not None:
+            headers["x-ratelimit-requests-limit"] = str(self.daily_limit)
+            headers["x-ratelimit-requests-remaining"] = str(max(self.daily_limit - self.served, 0))
+        if self.per_minute is not None:
+            headers["X-RateLimit-Limit"] = str(self.per_minute)
+            headers["X-RateLimit-Remaining"] = str(minute_remaining)
+        return headers
+
+    def stats(self):
+        return {"served": self.served, "misses": self.misses, "throttled": self.throttled,
+                "exhausted": self.exhausted}
+
+
+class CassetteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    replay = None
+
+    def do_GET(self):
+        replay = self.replay
+        url = urlsplit(self.path)
+        key = make_cache_key(url.path.lstrip("/"), dict(parse_qsl(url.query)))
+
+        if replay.latency or replay.jitter:
+            time.sleep(replay.latency + random.uniform(0, replay.jitter))
+
+        if replay.daily_exhausted():
+            self._send(200, DAILY_LIMIT_BODY, replay.quota_headers(0))
+            return
+
+        allowed, retry_after, minute_remaining = replay.admit()
+        if not allowed:
+            self._send(429, {"errors": {"rateLimit": "Too many requests. Your rate limit is exceeded."}},
+                       {"Retry-After": str(retry_after), **replay.quota_headers(0)})
+            return
+
+        entry = replay.next_entry(key)
+        status, body, headers = (200, EMPTY_BODY, {}) if entry is None else \
+            (entry["status"], entry["body"], entry["headers"])
+        self._send(status, body, {**headers, **replay.quota_headers(minute_remaining)})
+
+    def _send(self, status, body, headers):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            if name.lower() != "content-type":
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_cassette_server(replay, host="127.0.0.1", port=0):
+    """
+    Elindítja a visszajátszó szervert háttérszálon. A szerver címe: server.server_address.
+    """
+    handler = type("BoundCassetteHandler", (CassetteHandler,), {"replay": replay})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API kazetta visszajátszó szerver")
+    parser.add_argument("cassette", help="A felvett .jsonl.gz kazetta útvonala (puszta név: CASSETTE_DIR-ből)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fix válaszkésleltetés")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Véletlen többletkésleltetés felső határa")
+    parser.add_argument("--per-minute", type=int, default=None, help="Percenkénti keret (429 felette)")
+    parser.add_argument("--daily-limit", type=int, default=None,
+                        help="Napi keret: x-ratelimit fejlécek, elfogyása után \"requests\" hibaüzenet")
+    args = parser.parse_args()
+
+    entries = load_cassette(args.cassette)
+    replay = CassetteReplay(entries, args.latency_ms / 1000, args.jitter_ms / 1000, args.per_minute, args.daily_limit)
+    server = start_cassette_server(replay, args.host, args.port)
+    print(f"📼 {sum(len(items) for items in entries.values())} felvett válasz ({len(entries)} egyedi kérés) "
+          f"visszajátszása: http://{args.host}:{server.server_address[1]}/")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"📊 Visszajátszás statisztika: {replay.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import time
 from tkinter import messagebox
 
 from src.Backend.API.leagues import get_leagues
@@ -26,5 +27,24 @@ def refresh_main_menu_styles(app):
     if current_frame and hasattr(current_frame, 'update_fixture_styles'):
         current_frame.update_fixture_styles()
 
+class StartupTimer:
+    """
+    Az indítás szakaszainak időmérése (pl. fogadóiroda ellenőrzés, főmenü felépítése, első ablak).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        print("⏱️ Indítási idők:")
+        previous = self.started
+        for label, at in self.marks:
+            print(f"   {label:<28} {(at - previous) * 1000:8.1f} ms   (összesen {(at - self.started) * 1000:8.1f} ms)")
+            previous = at
+
 selected_fixtures = []
 selected_window = None
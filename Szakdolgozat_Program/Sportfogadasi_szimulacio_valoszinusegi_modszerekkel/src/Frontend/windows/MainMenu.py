@@ -2,6 +2,7 @@ from datetime import datetime
 from tkinter import ttk, messagebox
 import tkinter as tk
 from src.Backend.API.helpersAPI import save_odds_for_fixture
+from src.Backend.API.request_scheduler import with_priority, INTERACTIVE
 from src.Backend.DB.fixtures import get_pre_match_fixtures
 from src.Backend.DB.odds import get_odds_by_fixture_id
 from src.Frontend import helpersGUI
@@ -158,6 +159,7 @@ class MainMenu(tk.Frame):
         simulations_button = ttk.Button(button_frame, text="Meglévő szimulációk", command=self.show_simulations)
         simulations_button.pack(side="left", padx=5)
 
+    @with_priority(INTERACTIVE)
     def on_fixture_click(self, event):
         # Ellenőrizzük, hogy a kattintás a fejlécen történt-e
         region = self.treeview.identify("region", event.x, event.y)
@@ -178,6 +180,7 @@ class MainMenu(tk.Frame):
         save_odds_for_fixture(fixture_id)
         self.show_odds_window(fixture_data)
 
+    @with_priority(INTERACTIVE)
     def show_odds_window(self, fixture_data):
         """
         Megjeleníti az oddsokat egy külön ablakban, a kiválasztott mérkőzés adataival együtt,
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.Backend.API.fixtures import get_fixtures, get_match_statistics
+from src.Backend.API.request_scheduler import with_priority, INTERACTIVE
 from src.Backend.DB.fixtures import read_from_fixtures, write_to_fixtures
 from src.Backend.DB.leagues import read_from_leagues
 from src.Backend.DB.statistics import read_from_match_statistics
@@ -98,6 +99,7 @@ class PastResultsApp(tk.Frame):
         except Exception as e:
             messagebox.showerror("Hiba", f"A dátumválasztó frissítése nem sikerült: {str(e)}")
 
+    @with_priority(INTERACTIVE)
     def get_past_fixtures(self):
         selected_league = self.league_combo.get()
         season = self.season_combo.get()
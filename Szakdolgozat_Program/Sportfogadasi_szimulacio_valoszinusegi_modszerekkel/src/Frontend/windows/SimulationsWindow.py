@@ -163,7 +163,7 @@ class SimulationsWindow(tk.Toplevel):
                 away_score = fixture.get("score_away")
                 if home_score is not None and away_score is not None:
                     evaluate_predictions(fixture["fixture_id"], home_score, away_score)
-                update_strategy_profit(sim_id, completed_fixtures)
+            update_strategy_profit(sim_id, completed_fixtures)
 
         # Ha vannak folyamatban lévő mérkőzések, figyelmeztetést adunk
         if pending_fixtures:
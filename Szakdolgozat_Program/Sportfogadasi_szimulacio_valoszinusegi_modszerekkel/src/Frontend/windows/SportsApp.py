@@ -1,6 +1,5 @@
-from src.Backend.API.helpersAPI import sync_bookmakers
-from src.Backend.API.odds import fetch_odds_for_fixture
-from src.Backend.DB.fixtures import get_pre_match_fixtures
+from src.Backend.API.helpersAPI import start_bookmaker_sync_if_stale
+from src.Frontend.helpersGUI import StartupTimer
 from src.Frontend.windows.MainMenu import MainMenu
 from src.Frontend.windows.PastResultsApp import PastResultsApp
 from src.Frontend.windows.TeamsApp import TeamsApp
@@ -8,6 +7,7 @@ from src.Frontend.windows.TeamsApp import TeamsApp
 
 class SportsApp:
     def __init__(self, root):
+        self.startup_timer = StartupTimer()
         self.root = root
         self.root.title("Sports Betting Simulation")
 
@@ -19,22 +19,28 @@ class SportsApp:
 
         # Fogadóirodák szinkronizálása az első indításkor
         self.sync_initial_bookmakers()
+        self.startup_timer.mark("Fogadóirodák ellenőrzése")
 
         self.current_frame = None
         self.show_main_menu()
+        self.startup_timer.mark("Főmenü felépítése")
+
+        # Az első tétlen eseménykor az ablak már kirajzolódott
+        self.root.after_idle(self.report_startup)
 
     def sync_initial_bookmakers(self):
         """
-        Ellenőrzi és szinkronizálja a fogadóirodák listáját az első indításkor.
+        Ellenőrzi a fogadóirodák listáját az első indításkor.
+        Ha elavult, háttérszálon szinkronizálja a helyben tárolt odds válaszokból (API hívás nélkül).
+        """
+        self.bookmaker_sync = start_bookmaker_sync_if_stale()
+
+    def report_startup(self):
+        """
+        Kiírja az indítás szakaszainak idejét az első ablak megjelenéséig.
         """
-        print("Fogadóirodák szinkronizálása az első indításkor...")
-        fixtures = get_pre_match_fixtures()  # Mérkőzések lekérése
-        if fixtures:
-            fixture_id = fixtures[0]['fixture_id']  # Egy első mérkőzés ID kiválasztása
-            odds = fetch_odds_for_fixture(fixture_id)  # Oddsok lekérése
-            sync_bookmakers(odds)  # Fogadóirodák szinkronizálása
-        else:
-            print("Nincsenek elérhető mérkőzések az első indításhoz.")
+        self.startup_timer.mark("Első ablak megjelenítése")
+        self.startup_timer.report()
 
     def show_frame(self, frame_class):
         """Eltávolítja a jelenlegi frame-et, és betölti az újat."""
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from src.Backend.API.teams import get_teams, get_team_statistics
+from src.Backend.API.request_scheduler import with_priority, INTERACTIVE
 from src.Backend.DB.statistics import read_from_cards, write_to_cards
 from src.Backend.DB.teams import write_to_teams
 from src.Frontend.helpersGUI import save_leagues_if_not_exists
@@ -125,6 +126,7 @@ class TeamsApp(tk.Frame):
             except Exception as e:
                 print(f"Képbetöltési hiba: {e}")
 
+    @with_priority(INTERACTIVE)
     def show_team_statistics(self, team_id, league_id, season):
         stats = get_team_statistics(league_id, season, team_id)
         selected_team = next((t for t in self.teams if t['id'] == team_id), None)
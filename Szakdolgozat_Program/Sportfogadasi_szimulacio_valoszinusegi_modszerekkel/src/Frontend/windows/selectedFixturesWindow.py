@@ -2,6 +2,7 @@
 from datetime import datetime
 from tkinter import ttk, messagebox
 import tkinter as tk
+from src.Backend.DB.fixtures import prefetched_last_matches
 from src.Backend.DB.simulations import check_group_name_exists, create_simulation, save_match_group, save_match_to_group
 from src.Backend.DB.strategies import get_all_strategies
 from src.Backend.DB.teams import get_team_id_by_name
@@ -155,14 +156,13 @@ class SelectedFixturesWindow(tk.Toplevel):
             messagebox.showerror("Hiba", "Nem sikerült elmenteni a mérkőzéscsoportot!",parent=self)
             return
 
-        # 🔮 Predikciók mentése
-        for fixture_id in valid_fixture_ids:
-            home_team_name = id_to_fixture[fixture_id][1]
-            away_team_name = id_to_fixture[fixture_id][2]
-            home_team_id = get_team_id_by_name(home_team_name)
-            away_team_id = get_team_id_by_name(away_team_name)
-
-            save_all_predictions(fixture_id, home_team_id, away_team_id, match_group_id)
+        # 🔮 Predikciók mentése (a modellek a csapatok egyszerre betöltött utolsó meccseiből dolgoznak)
+        teams_by_fixture = {fixture_id: (home_id, away_id) for home_id, away_id, fixture_id in fixture_list}
+        team_ids = [team_id for fixture_id in valid_fixture_ids for team_id in teams_by_fixture[fixture_id]]
+        with prefetched_last_matches(team_ids):
+            for fixture_id in valid_fixture_ids:
+                home_team_id, away_team_id = teams_by_fixture[fixture_id]
+                save_all_predictions(fixture_id, home_team_id, away_team_id, match_group_id)
 
         # 🧠 Stratégia mentések
         strategies = get_all_strategies()
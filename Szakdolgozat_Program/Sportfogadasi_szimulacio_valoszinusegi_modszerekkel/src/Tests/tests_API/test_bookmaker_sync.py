@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.Backend.API.helpersAPI import sync_bookmakers_from_archive, start_bookmaker_sync_if_stale
+from src.Backend.API.raw_archive import RawArchive
+
+
+def odds_item(fixture_id, bookmakers):
+    return {"fixture": {"id": fixture_id},
+            "bookmakers": [{"id": bookmaker_id, "name": name, "bets": []} for bookmaker_id, name in bookmakers]}
+
+
+@patch('builtins.print')
+class TestBookmakerSync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.archive = RawArchive(self.tmp_dir.name)
+        self.addCleanup(self.archive.close)
+
+    @patch('src.Backend.API.helpersAPI.save_bookmakers')
+    @patch('src.Backend.API.helpersAPI.read_from_bookmakers', return_value=[{"id": 8, "name": "Bet365"}])
+    def test_sync_reads_recent_archived_odds(self, mock_read, mock_save, mock_print):
+        self.archive.append("odds", {"fixture": 1}, {"response": [odds_item(1, [(1, "Old Name")])]},
+                            archived_at=datetime(2024, 2, 1, 12).timestamp())
+        self.archive.append("odds", {"date": "2024-03-01"},
+                            {"response": [odds_item(2, [(8, "Bet365"), (11, "1xBet")])]},
+                            archived_at=datetime(2024, 3, 1, 12).timestamp())
+        self.archive.append("fixtures", {"id": 3}, {"response": [odds_item(3, [(99, "Not odds")])]},
+                            archived_at=datetime(2024, 3, 1, 12).timestamp())
+
+        sync_bookmakers_from_archive(self.archive, days=1)
+
+        mock_save.assert_called_once_with({11: "1xBet"})
+
+    @patch('src.Backend.API.helpersAPI.save_bookmakers')
+    def test_empty_archive_does_nothing(self, mock_save, mock_print):
+        sync_bookmakers_from_archive(self.archive)
+
+        mock_save.assert_not_called()
+
+    @patch('src.Backend.API.helpersAPI.threading.Thread')
+    @patch('src.Backend.API.helpersAPI.read_unknown_bookmaker_ids')
+    @patch('src.Backend.API.helpersAPI.read_from_bookmakers')
+    def test_background_sync_only_when_stale(self, mock_read, mock_unknown, mock_thread, mock_print):
+        mock_read.return_value = [{"id": 8, "name": "Bet365"}]
+        mock_unknown.return_value = []
+        self.assertIsNone(start_bookmaker_sync_if_stale())
+        mock_thread.assert_not_called()
+
+        mock_unknown.return_value = [11]
+        self.assertIs(start_bookmaker_sync_if_stale(), mock_thread.return_value)
+        self.assertTrue(mock_thread.call_args.kwargs["daemon"])
+        mock_thread.return_value.start.assert_called_once()
+
+        mock_read.return_value = []
+        self.assertIsNotNone(start_bookmaker_sync_if_stale())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src.Backend.API.cassette import CassetteRecorder, load_cassette
+from src.Backend.API.make_api_request import make_api_request
+from src.Backend.API.single_flight import api_run_scope
+from src.Benchmarks.cassette_server import CassetteReplay, start_cassette_server
+
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cassettes", "test.jsonl.gz")
+
+        recorder = CassetteRecorder(self.path)
+        headers = {"Content-Type": "application/json", "x-ratelimit-requests-remaining": "99", "Server": "x"}
+        recorder.record("fixtures", {"id": 1}, 200, headers, {"response": [{"version": 1}]})
+        recorder.record("fixtures", {"id": 1}, 200, headers, {"response": [{"version": 2}]})
+        recorder.record("teams", {"id": 5, "season": None}, 200, headers, {"response": [{"team": 5}]})
+        recorder.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def start_server(self, **kwargs):
+        replay = CassetteReplay(load_cassette(self.path), **kwargs)
+        server = start_cassette_server(replay)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return replay, f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def test_recording_round_trip(self):
+        entries = load_cassette(self.path)
+
+        self.assertEqual(len(entries), 2)
+        fixture_entries = entries['fixtures?{"id":"1"}']
+        self.assertEqual([entry["body"]["response"][0]["version"] for entry in fixture_entries], [1, 2])
+        self.assertNotIn("Server", fixture_entries[0]["headers"])
+        self.assertEqual(entries['teams?{"id":"5"}'][0]["params"], {"id": "5"})
+
+    def test_replay_serves_recordings_in_order(self):
+        replay, base_url = self.start_server()
+
+        versions = [requests.get(f"{base_url}fixtures", params={"id": 1}).json()["response"][0]["version"]
+                    for _ in range(3)]
+        missing = requests.get(f"{base_url}fixtures", params={"id": 2})
+
+        self.assertEqual(versions, [1, 2, 2])
+        self.assertEqual(missing.status_code, 200)
+        self.assertEqual(missing.json()["response"], [])
+        self.assertEqual(replay.stats(), {"served": 4, "misses": 1, "throttled": 0, "exhausted": 0})
+
+    def test_replay_simulates_rate_limits(self):
+        replay, base_url = self.start_server(per_minute=1, daily_limit=100)
+
+        first = requests.get(f"{base_url}teams", params={"id": 5})
+        second = requests.get(f"{base_url}teams", params={"id": 5})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["x-ratelimit-requests-remaining"], "99")
+        self.assertEqual(first.headers["X-RateLimit-Remaining"], "0")
+        self.assertEqual(second.status_code, 429)
+        self.assertIn("rateLimit", second.json()["errors"])
+        self.assertGreater(int(second.headers["Retry-After"]), 0)
+        self.assertEqual(replay.stats()["throttled"], 1)
+
+    def test_replay_rejects_requests_after_daily_limit(self):
+        replay, base_url = self.start_server(daily_limit=1)
+
+        first = requests.get(f"{base_url}teams", params={"id": 5})
+        second = requests.get(f"{base_url}teams", params={"id": 5})
+
+        self.assertEqual(first.json()["response"], [{"team": 5}])
+        self.assertIn("requests", second.json()["errors"])
+        self.assertEqual(second.headers["x-ratelimit-requests-remaining"], "0")
+        self.assertEqual(replay.stats()["exhausted"], 1)
+
+    @patch('src.Backend.API.make_api_request._send_request')
+    def test_recording_bypasses_cache_and_single_flight(self, mock_send):
+        mock_send.return_value = {"errors": [], "response": [{"team": 5}]}
+
+        with patch('src.Backend.API.make_api_request.get_recorder', return_value=MagicMock()), \
+                patch('src.Backend.API.make_api_request.response_cache') as mock_cache, \
+                api_run_scope():
+            make_api_request("teams", {"id": 5})
+            make_api_request("teams", {"id": 5})
+
+        mock_cache.get.assert_not_called()
+        self.assertEqual(mock_send.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
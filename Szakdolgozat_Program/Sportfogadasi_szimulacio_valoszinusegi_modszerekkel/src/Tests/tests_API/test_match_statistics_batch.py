@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.Backend.API.fixtures import fetch_match_statistics_batch, get_match_statistics_batch
+from src.Backend.DB.statistics import write_match_statistics_bulk, read_from_match_statistics_bulk
+
+
+def api_fixture(fixture_id, shots=5, status="FT"):
+    return {
+        "fixture": {"id": fixture_id, "status": {"short": status}},
+        "statistics": [
+            {"team": {"id": 1}, "statistics": [{"type": "Shots on Goal", "value": shots}]},
+            {"team": {"id": 2}, "statistics": [{"type": "Shots on Goal", "value": 0}]},
+        ]
+    }
+
+
+@patch('builtins.print')
+class TestMatchStatisticsBatch(unittest.TestCase):
+
+    def setUp(self):
+        # A statisztika nélküli meccsek nyilvántartása külön tesztelt, itt nem érheti el az adatbázist
+        for name, value in (("read_missing_statistics", set()), ("write_missing_statistics", None),
+                            ("delete_missing_statistics", None)):
+            patcher = patch(f'src.Backend.API.fixtures.{name}', return_value=value)
+            setattr(self, f"mock_{name}", patcher.start())
+            self.addCleanup(patcher.stop)
+
+    @patch('src.Backend.API.fixtures.write_match_statistics_bulk')
+    @patch('src.Backend.API.fixtures.make_api_request')
+    def test_batch_uses_multi_id_lookup_and_one_bulk_write(self, mock_request, mock_bulk, mock_print):
+        fixture_ids = list(range(1, 26))
+        mock_request.side_effect = lambda endpoint, params, use_cache: {"response": [
+            api_fixture(int(fixture_id), shots=0 if fixture_id == "3" else 5)
+            for fixture_id in params["ids"].split("-")
+        ]}
+
+        fetched = fetch_match_statistics_batch(fixture_ids)
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(sorted(fetched), [fixture_id for fixture_id in fixture_ids if fixture_id != 3])
+        mock_bulk.assert_called_once()
+        rows = mock_bulk.call_args.args[0]
+        self.assertEqual(len(rows), 48)
+        self.assertEqual(rows[0], (1, 1, [{"type": "Shots on Goal", "value": 5}]))
+        self.mock_write_missing_statistics.assert_called_once_with([3])
+
+    @patch('src.Backend.API.fixtures.api_quota_meter')
+    @patch('src.Backend.API.fixtures.write_match_statistics_bulk')
+    @patch('src.Backend.API.fixtures.make_api_request')
+    def test_known_missing_statistics_are_not_requested_again(self, mock_request, mock_bulk, mock_meter,
+                                                              mock_print):
+        self.mock_read_missing_statistics.return_value = set(range(1, 22))
+        mock_request.return_value = {"response": [api_fixture(22, shots=0), api_fixture(23, shots=0, status="NS")]}
+
+        with patch('src.Backend.API.fixtures.read_from_match_statistics_bulk', return_value={}):
+            statistics = get_match_statistics_batch(range(1, 24))
+
+        self.assertEqual(statistics, {})
+        self.assertEqual(mock_request.call_args.args[1]["ids"], "22-23")
+        mock_meter.record_saved.assert_called_once_with(1)
+        # Csak a lezárult meccs kerül a nyilvántartásba, a még el nem kezdődött nem
+        self.mock_write_missing_statistics.assert_called_once_with([22])
+
+    @patch('src.Backend.API.fixtures.fetch_match_statistics_batch')
+    @patch('src.Backend.API.fixtures.read_from_match_statistics_bulk')
+    def test_stored_statistics_are_not_requested(self, mock_read, mock_fetch, mock_print):
+        mock_read.return_value = {1: [{"team_id": 1}]}
+        mock_fetch.return_value = {2: api_fixture(2)}
+
+        statistics = get_match_statistics_batch([1, 2, 3])
+
+        mock_read.assert_called_once_with([1, 2, 3])
+        mock_fetch.assert_called_once_with([2, 3])
+        self.assertEqual(statistics, {1: [{"team_id": 1}], 2: api_fixture(2)["statistics"]})
+
+    @patch('src.Backend.DB.statistics.get_db_connection')
+    def test_bulk_write_is_one_executemany(self, mock_connection, mock_print):
+        connection = MagicMock()
+        mock_connection.return_value = connection
+        cursor = connection.cursor.return_value
+
+        saved = write_match_statistics_bulk([
+            (10, 1, [{"type": "Ball Possession", "value": "55%"}, {"type": "Unknown", "value": 1}]),
+            (10, 2, [{"type": "Passes %", "value": "80%"}]),
+        ])
+
+        self.assertEqual(saved, 2)
+        cursor.executemany.assert_called_once()
+        params = cursor.executemany.call_args.args[1]
+        self.assertEqual(len(params[0]), 18)
+        self.assertEqual(params[0][:2] + params[0][11:12], (10, 1, "55%"))
+        self.assertEqual(params[1][-1], "80%")
+        connection.commit.assert_called_once()
+
+    @patch('src.Backend.DB.statistics.DB_IN_CHUNK_SIZE', 2)
+    @patch('src.Backend.DB.statistics.get_db_connection')
+    def test_bulk_read_uses_chunked_in_queries(self, mock_connection, mock_print):
+        connection = MagicMock()
+        mock_connection.return_value = connection
+        cursor = connection.cursor.return_value
+        cursor.fetchall.side_effect = [
+            [{"fixture_id": 1, "team_id": 10}, {"fixture_id": 1, "team_id": 11}, {"fixture_id": 2, "team_id": 12}],
+            [],
+        ]
+
+        statistics = read_from_match_statistics_bulk([1, 2, 3, 2, 4])
+
+        mock_connection.assert_called_once()
+        self.assertEqual([call.args[1] for call in cursor.execute.call_args_list], [[1, 2], [3, 4]])
+        self.assertEqual({fixture_id: len(rows) for fixture_id, rows in statistics.items()}, {1: 2, 2: 1})
+        connection.close.assert_called_once()
+
+    @patch('src.Backend.DB.statistics.get_db_connection')
+    def test_bulk_read_existence_only(self, mock_connection, mock_print):
+        connection = MagicMock()
+        mock_connection.return_value = connection
+        cursor = connection.cursor.return_value
+        cursor.fetchall.return_value = [(1,), (3,)]
+
+        self.assertEqual(read_from_match_statistics_bulk([1, 2, 3], exists_only=True), {1, 3})
+        self.assertIn("SELECT DISTINCT fixture_id", cursor.execute.call_args.args[0])
+        connection.cursor.assert_called_once_with(dictionary=False)
+        self.assertEqual(read_from_match_statistics_bulk([], exists_only=True), set())
+        mock_connection.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
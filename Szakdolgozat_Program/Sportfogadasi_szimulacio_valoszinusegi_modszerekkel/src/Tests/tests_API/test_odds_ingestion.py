@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from src.Backend.API.odds import fetch_odds_by_date, parse_match_winner_odds
+
+
+def odds_item(fixture_id, bookmaker_id=8, bet_name="Match Winner"):
+    return {
+        "fixture": {"id": fixture_id},
+        "bookmakers": [{
+            "id": bookmaker_id,
+            "name": f"Bookmaker {bookmaker_id}",
+            "bets": [{
+                "id": 1,
+                "name": bet_name,
+                "values": [
+                    {"value": "Home", "odd": "2.10"},
+                    {"value": "Draw", "odd": "3.40"},
+                    {"value": "Away", "odd": "3.50"}
+                ]
+            }]
+        }]
+    }
+
+
+class TestOddsIngestion(unittest.TestCase):
+
+    @patch('builtins.print')
+    @patch('src.Backend.API.odds.fetch_many')
+    @patch('src.Backend.API.odds.make_api_request')
+    def test_fetch_odds_by_date_follows_pagination(self, mock_request, mock_fetch_many, mock_print):
+        mock_request.return_value = {"paging": {"current": 1, "total": 3}, "response": [odds_item(1)]}
+        mock_fetch_many.return_value = [
+            {"paging": {"current": 2, "total": 3}, "response": [odds_item(2)]},
+            {"paging": {"current": 3, "total": 3}, "response": [odds_item(3)]}
+        ]
+
+        items = fetch_odds_by_date("2025-03-01")
+
+        self.assertEqual([item["fixture"]["id"] for item in items], [1, 2, 3])
+        self.assertEqual(mock_request.call_args.args[1]["page"], 1)
+        self.assertEqual([params["page"] for _, params in mock_fetch_many.call_args.args[0]], [2, 3])
+
+    @patch('builtins.print')
+    @patch('src.Backend.API.odds.fetch_many')
+    @patch('src.Backend.API.odds.make_api_request')
+    def test_fetch_odds_by_date_single_page(self, mock_request, mock_fetch_many, mock_print):
+        mock_request.return_value = {"paging": {"current": 1, "total": 1}, "response": [odds_item(1)]}
+
+        self.assertEqual(len(fetch_odds_by_date("2025-03-01")), 1)
+        mock_fetch_many.assert_not_called()
+
+    def test_parse_match_winner_odds_groups_by_fixture(self):
+        bookmakers, odds_by_fixture = parse_match_winner_odds([
+            odds_item(1, bookmaker_id=8),
+            odds_item(1, bookmaker_id=6),
+            odds_item(2, bookmaker_id=8, bet_name="Goals Over/Under")
+        ])
+
+        self.assertEqual(bookmakers, {8: "Bookmaker 8", 6: "Bookmaker 6"})
+        self.assertEqual(set(odds_by_fixture), {1})
+        self.assertEqual(len(odds_by_fixture[1]), 2)
+        self.assertEqual(odds_by_fixture[1][0]["home_odds"], "2.10")
+        self.assertEqual(odds_by_fixture[1][0]["away_odds"], "3.50")
+
+
+if __name__ == '__main__':
+    unittest.main()
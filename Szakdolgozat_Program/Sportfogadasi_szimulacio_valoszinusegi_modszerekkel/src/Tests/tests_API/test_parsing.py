@@ -0,0 +1,54 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.Backend.API import parsing
+from src.Backend.API.parsing import Fixture, parse_fixtures, loads, dumps
+
+
+def api_fixture(fixture_id=1, status="FT", home_score=2, away_score=1):
+    return {
+        "fixture": {"id": fixture_id, "date": "2024-03-01T15:00:00+00:00", "status": {"short": status}},
+        "league": {"id": 39, "season": 2023, "country": "England"},
+        "teams": {"home": {"id": 10, "name": "A", "logo": "a.png"}, "away": {"id": 20, "name": "B", "logo": "b.png"}},
+        "score": {"fulltime": {"home": home_score, "away": away_score}},
+    }
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_fixture_from_api(self):
+        fixture = Fixture.from_api(api_fixture())
+
+        self.assertEqual(fixture.to_row(), {
+            "id": 1, "date": "2024-03-01T15:00:00+00:00",
+            "home_team_id": 10, "home_team_name": "A", "home_team_country": "England", "home_team_logo": "a.png",
+            "away_team_id": 20, "away_team_name": "B", "away_team_country": "England", "away_team_logo": "b.png",
+            "score_home": 2, "score_away": 1, "status": "FT",
+        })
+        self.assertFalse(hasattr(fixture, "__dict__"))
+
+    def test_not_started_fixture_has_no_score(self):
+        payload = api_fixture(status="NS", home_score=None, away_score=None)
+        del payload["league"]["country"]
+
+        row = parse_fixtures([payload])[0]
+
+        self.assertEqual((row["score_home"], row["score_away"], row["status"]), (None, None, "NS"))
+        self.assertEqual(row["home_team_country"], "Unknown")
+
+    def test_json_backends_round_trip(self):
+        payload = {"response": [api_fixture()], "errors": []}
+        encoded = json.dumps(payload).encode()
+
+        self.assertEqual(loads(encoded), payload)
+        self.assertEqual(json.loads(dumps(payload)), payload)
+        with patch.object(parsing, "orjson", None):
+            self.assertEqual(loads(encoded), payload)
+            self.assertEqual(json.loads(dumps(payload)), payload)
+            with self.assertRaises(ValueError):
+                loads(b"not json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.Backend.API.fixtures import save_pre_match_fixtures
+from src.Backend.API.parsing import Fixture
+
+DATE = "2024-03-01"
+
+
+def api_fixture(fixture_id, home_name="A"):
+    return {
+        "fixture": {"id": fixture_id, "date": f"{DATE}T15:00:00+00:00", "status": {"short": "NS"}},
+        "league": {"id": 39, "season": 2023, "country": "England"},
+        "teams": {"home": {"id": 1, "name": home_name, "logo": "a.png"},
+                  "away": {"id": 2, "name": "B", "logo": "b.png"}},
+        "score": {"fulltime": {"home": None, "away": None}}
+    }
+
+
+def odds_item(fixture_id):
+    return {"fixture": {"id": fixture_id},
+            "bookmakers": [{"id": 8, "name": "Bet365", "bets": [
+                {"name": "Match Winner", "values": [{"odd": "2.10"}, {"odd": "3.40"}, {"odd": "3.20"}]}]}]}
+
+
+def stored_hash(payload, has_odds=True):
+    return {"content_hash": Fixture.from_api(payload).content_hash(), "has_odds": int(has_odds)}
+
+
+@patch('builtins.print')
+@patch('src.Backend.API.fixtures.write_pre_match_sync')
+@patch('src.Backend.API.fixtures.write_to_odds')
+@patch('src.Backend.API.fixtures.save_bookmakers')
+@patch('src.Backend.API.fixtures.write_to_fixtures')
+@patch('src.Backend.API.fixtures.fetch_odds_for_fixtures')
+@patch('src.Backend.API.fixtures.fetch_odds_by_date')
+@patch('src.Backend.API.fixtures.read_fixture_hashes')
+@patch('src.Backend.API.fixtures.read_pre_match_sync')
+@patch('src.Backend.API.fixtures.fetch_many')
+@patch('src.Backend.API.fixtures.get_next_days_dates', return_value=[DATE])
+class TestPreMatchSync(unittest.TestCase):
+
+    def test_unchanged_fresh_day_is_skipped(self, mock_dates, mock_fetch_many, mock_watermarks, mock_hashes,
+                                            mock_odds_by_date, mock_odds_for_fixtures, mock_write_fixtures,
+                                            mock_bookmakers, mock_write_odds, mock_write_sync, mock_print):
+        fixtures = [api_fixture(1), api_fixture(2)]
+        mock_fetch_many.return_value = [{"response": fixtures}]
+        mock_watermarks.return_value = {DATE: {"fixture_count": 2, "synced_at": datetime.now()}}
+        mock_hashes.return_value = {1: stored_hash(fixtures[0]), 2: stored_hash(fixtures[1], has_odds=False)}
+
+        save_pre_match_fixtures()
+
+        mock_odds_by_date.assert_not_called()
+        mock_odds_for_fixtures.assert_not_called()
+        mock_write_fixtures.assert_not_called()
+        mock_write_odds.assert_not_called()
+        mock_write_sync.assert_not_called()
+
+    def test_fresh_day_fetches_odds_only_for_changed_fixtures(self, mock_dates, mock_fetch_many, mock_watermarks,
+                                                              mock_hashes, mock_odds_by_date, mock_odds_for_fixtures,
+                                                              mock_write_fixtures, mock_bookmakers, mock_write_odds,
+                                                              mock_write_sync, mock_print):
+        mock_fetch_many.return_value = [{"response": [api_fixture(1), api_fixture(2, home_name="A2"), api_fixture(3)]}]
+        mock_watermarks.return_value = {DATE: {"fixture_count": 2, "synced_at": datetime.now() - timedelta(hours=1)}}
+        mock_hashes.return_value = {1: stored_hash(api_fixture(1)), 2: stored_hash(api_fixture(2))}
+        mock_odds_for_fixtures.return_value = [odds_item(2)]
+
+        save_pre_match_fixtures()
+
+        mock_odds_by_date.assert_not_called()
+        mock_odds_for_fixtures.assert_called_once_with([2, 3])
+        self.assertEqual([row["id"] for row in mock_write_fixtures.call_args.args[0]], [2])
+        self.assertEqual([row["fixture_id"] for row in mock_write_odds.call_args.args[0]], [2])
+        hashes = mock_write_sync.call_args.args[1]
+        self.assertEqual([(fixture_id, has_odds) for fixture_id, _, has_odds in hashes], [(2, True), (3, False)])
+        self.assertIsNone(mock_write_sync.call_args.kwargs["fixture_count"])
+
+    def test_new_or_stale_day_is_synced_fully(self, mock_dates, mock_fetch_many, mock_watermarks, mock_hashes,
+                                              mock_odds_by_date, mock_odds_for_fixtures, mock_write_fixtures,
+                                              mock_bookmakers, mock_write_odds, mock_write_sync, mock_print):
+        mock_fetch_many.return_value = [{"response": [api_fixture(1), api_fixture(2)]}]
+        mock_watermarks.return_value = {DATE: {"fixture_count": 2, "synced_at": datetime.now() - timedelta(days=1)}}
+        mock_hashes.return_value = {1: stored_hash(api_fixture(1))}
+        mock_odds_by_date.return_value = [odds_item(1), odds_item(2)]
+
+        save_pre_match_fixtures()
+
+        mock_odds_by_date.assert_called_once_with(DATE)
+        mock_odds_for_fixtures.assert_not_called()
+        # Az 1-es mérkőzés nem változott, csak az oddsai frissülnek
+        self.assertEqual([row["id"] for row in mock_write_fixtures.call_args.args[0]], [2])
+        self.assertEqual([row["fixture_id"] for row in mock_write_odds.call_args.args[0]], [1, 2])
+        mock_bookmakers.assert_called_once_with({8: "Bet365"})
+        self.assertEqual(mock_write_sync.call_args.kwargs["fixture_count"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.Backend.API.quota_meter import QuotaMeter
+
+
+def api_headers(daily_remaining, minute_remaining=299):
+    return {
+        "x-ratelimit-requests-limit": "7500",
+        "x-ratelimit-requests-remaining": str(daily_remaining),
+        "X-RateLimit-Limit": "300",
+        "X-RateLimit-Remaining": str(minute_remaining),
+    }
+
+
+class TestQuotaMeter(unittest.TestCase):
+
+    def setUp(self):
+        self.today = date(2025, 3, 1)
+        self.writer = MagicMock(return_value=True)
+        self.meter = QuotaMeter(reserve=100, flush_every=3, writer=self.writer, clock=lambda: self.today)
+
+    def test_unknown_quota_does_not_hold_back_work(self):
+        self.assertIsNone(self.meter.remaining())
+        self.assertTrue(self.meter.can_spend(10 ** 6))
+        self.assertEqual(self.meter.affordable(50, 40), 50)
+
+    def test_headers_update_budget(self):
+        self.meter.record("fixtures", api_headers(1300, 250))
+
+        snapshot = self.meter.snapshot()
+        self.assertEqual(snapshot["daily_limit"], 7500)
+        self.assertEqual(snapshot["daily_remaining"], 1300)
+        self.assertEqual(snapshot["minute_remaining"], 250)
+        self.assertEqual(self.meter.available(), 1200)
+        self.assertTrue(self.meter.can_spend(1200))
+        self.assertFalse(self.meter.can_spend(1201))
+        self.assertEqual(self.meter.affordable(50, 40), 30)
+
+    def test_missing_headers_decrement_last_known_remaining(self):
+        self.meter.record("fixtures", api_headers(500))
+        self.meter.record("odds", {})
+        self.assertEqual(self.meter.remaining(), 499)
+
+    def test_usage_is_flushed_per_day_and_endpoint(self):
+        self.meter.record("fixtures", api_headers(10))
+        self.meter.record("fixtures", api_headers(9))
+        self.writer.assert_not_called()
+
+        self.meter.record("odds", api_headers(8))
+        self.assertTrue(self.meter.wait_for_flush(timeout=2))
+
+        usage_rows, quota = self.writer.call_args.args
+        self.assertEqual(sorted(usage_rows), [(self.today, "fixtures", 2), (self.today, "odds", 1)])
+        self.assertEqual(quota, (self.today, 7500, 8))
+
+    def test_failed_flush_keeps_counts(self):
+        self.writer.return_value = False
+        self.meter.record("fixtures", api_headers(10))
+        self.assertFalse(self.meter.flush())
+
+        self.writer.return_value = True
+        self.meter.record("fixtures", api_headers(9))
+        self.meter.flush()
+        self.assertEqual(self.writer.call_args.args[0], [(self.today, "fixtures", 2)])
+
+    def test_failed_background_flush_does_not_retry_on_every_call(self):
+        self.writer.return_value = False
+        for remaining in range(10, 7, -1):
+            self.meter.record("fixtures", api_headers(remaining))
+        self.assertTrue(self.meter.wait_for_flush(timeout=2))
+        self.assertEqual(self.writer.call_count, 1)
+
+        # A következő két hívás még a küszöb alatt van: nincs újabb írási kísérlet
+        self.meter.record("fixtures", api_headers(7))
+        self.meter.record("fixtures", api_headers(6))
+        self.assertEqual(self.writer.call_count, 1)
+        self.assertEqual(self.meter.snapshot()["pending_calls"], 5)
+
+    def test_new_day_resets_remaining(self):
+        self.meter.record("fixtures", api_headers(0))
+        self.assertFalse(self.meter.can_spend())
+
+        self.today = date(2025, 3, 2)
+        self.assertEqual(self.meter.remaining(), 7500)
+        self.assertTrue(self.meter.can_spend())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.Backend.API.async_client import run_concurrently
+from src.Backend.API.rate_limiter import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_empty(self):
+        bucket = TokenBucket(calls=300, period=60, capacity=3)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_refill_rate_keeps_window_under_quota(self):
+        bucket = TokenBucket(calls=300, period=60, capacity=10)
+        # A löket + a töltés 60 másodperc alatt együtt pontosan a keretet adja ki
+        self.assertAlmostEqual(bucket.capacity + bucket.refill_rate * 60, 300)
+
+    def test_time_until_token(self):
+        with patch('src.Backend.API.rate_limiter.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(calls=11, period=10, capacity=1)  # 1 token / másodperc
+            self.assertTrue(bucket.try_acquire())
+            self.assertAlmostEqual(bucket.time_until_token(), 1.0)
+        with patch('src.Backend.API.rate_limiter.time.monotonic', return_value=100.5):
+            self.assertAlmostEqual(bucket.time_until_token(), 0.5)
+        with patch('src.Backend.API.rate_limiter.time.monotonic', return_value=101.0):
+            self.assertTrue(bucket.try_acquire())
+
+    def test_pause_blocks_all_callers(self):
+        bucket = TokenBucket(calls=300, period=60, capacity=5)
+        bucket.pause(30)
+        self.assertFalse(bucket.try_acquire())
+        self.assertGreater(bucket.time_until_token(), 29)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(calls=5, period=60, capacity=5)
+
+
+class TestRunConcurrently(unittest.TestCase):
+
+    def test_results_keep_input_order(self):
+        def slow_square(value):
+            time.sleep(0.01 * (5 - value))
+            return value * value
+
+        self.assertEqual(run_concurrently(slow_square, [(i,) for i in range(5)]), [0, 1, 4, 9, 16])
+
+    def test_respects_max_in_flight(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def tracked(_):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+
+        run_concurrently(tracked, [(i,) for i in range(12)], max_in_flight=3)
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_empty_input(self):
+        self.assertEqual(run_concurrently(lambda x: x, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import gzip
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.Backend.API.raw_archive import RawArchive
+from src.Backend.helpers.reprocess_archive import reprocess_archive
+
+DAY_1 = datetime(2024, 3, 1, 12).timestamp()
+DAY_2 = datetime(2024, 3, 2, 12).timestamp()
+
+
+def api_fixture(fixture_id, status="FT", home_score=1, statistics=None):
+    payload = {
+        "fixture": {"id": fixture_id, "date": "2024-03-01T15:00:00+00:00", "status": {"short": status}},
+        "league": {"id": 39, "season": 2023, "country": "England"},
+        "teams": {"home": {"id": 10, "name": "A", "logo": "a.png"}, "away": {"id": 20, "name": "B", "logo": "b.png"}},
+        "score": {"fulltime": {"home": home_score, "away": 0}},
+    }
+    if statistics is not None:
+        payload["statistics"] = statistics
+    return payload
+
+
+def team_statistics(team_id, shots):
+    return {"team": {"id": team_id}, "statistics": [{"type": "Total Shots", "value": shots}]}
+
+
+def odds_item(fixture_id, home_odd):
+    return {"fixture": {"id": fixture_id},
+            "bookmakers": [{"id": 8, "name": "Bet365", "bets": [
+                {"name": "Match Winner", "values": [{"odd": home_odd}, {"odd": "3.40"}, {"odd": "3.20"}]}]}]}
+
+
+class TestRawArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.archive = RawArchive(self.tmp_dir.name)
+        self.addCleanup(self.archive.close)
+
+    def test_partitioned_compressed_and_indexed(self):
+        self.archive.append("fixtures", {"id": 1}, {"response": [{"version": 1}]}, archived_at=DAY_1)
+        self.archive.append("fixtures/statistics", {"fixture": 1}, {"response": []}, archived_at=DAY_1)
+        self.archive.append("fixtures", {"id": 1, "season": None}, {"response": [{"version": 2}]}, archived_at=DAY_2)
+
+        self.archive.flush()
+        self.assertEqual(self.archive.partitions(), ["2024-03-01", "2024-03-02"])
+        path = os.path.join(self.tmp_dir.name, "2024-03-01", "fixtures__statistics.jsonl.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 1)
+
+        self.assertEqual([partition for partition, _ in self.archive.lookup("fixtures", {"id": 1})],
+                         ["2024-03-01", "2024-03-02"])
+        self.assertEqual(self.archive.load("fixtures", {"id": 1}), {"response": [{"version": 2}]})
+        self.assertIsNone(self.archive.load("teams", {"id": 1}))
+
+        entries = list(self.archive.iter_entries(endpoints=["fixtures"], since="2024-03-02"))
+        self.assertEqual([entry["params"] for entry in entries], [{"id": "1"}])
+
+    def test_index_is_committed_in_batches(self):
+        archive = RawArchive(os.path.join(self.tmp_dir.name, "batched"), commit_every=3)
+        self.addCleanup(archive.close)
+
+        def committed():
+            with sqlite3.connect(os.path.join(archive.directory, "index.sqlite")) as reader:
+                return reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        for fixture_id in range(4):
+            archive.append("fixtures", {"id": fixture_id}, {"response": []}, archived_at=DAY_1)
+        self.assertEqual(committed(), 3)
+        # Saját kapcsolaton a még nem véglegesített bejegyzés is látszik
+        self.assertEqual(len(archive.lookup("fixtures", {"id": 3})), 1)
+
+        archive.flush()
+        self.assertEqual(committed(), 4)
+
+    @patch('builtins.print')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_odds')
+    @patch('src.Backend.helpers.reprocess_archive.save_bookmakers')
+    @patch('src.Backend.helpers.reprocess_archive.write_match_statistics_bulk')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_fixtures')
+    def test_reprocess_rebuilds_tables_from_latest_payloads(self, mock_write_fixtures, mock_write_statistics,
+                                                            mock_bookmakers, mock_write_odds, mock_print):
+        self.archive.append("fixtures", {"date": "2024-03-01", "status": "NS"},
+                            {"response": [api_fixture(1, "NS", None), api_fixture(2, "NS", None)]}, archived_at=DAY_1)
+        self.archive.append("odds", {"date": "2024-03-01", "page": 1},
+                            {"response": [odds_item(1, "2.10"), odds_item(3, "1.50")]}, archived_at=DAY_1)
+        self.archive.append("fixtures/statistics", {"fixture": 2},
+                            {"response": [team_statistics(10, 7), team_statistics(20, 3)]}, archived_at=DAY_1)
+        self.archive.append("fixtures", {"ids": "1"},
+                            {"response": [api_fixture(1, statistics=[team_statistics(10, 5), team_statistics(20, 4)])]},
+                            archived_at=DAY_2)
+        self.archive.append("odds", {"fixture": 1}, {"response": [odds_item(1, "1.95")]}, archived_at=DAY_2)
+
+        counts = reprocess_archive(self.archive)
+
+        self.assertEqual(counts, {"fixtures": 1, "statistics": 4, "odds": 1, "skipped": 0})
+        fixtures = {row["id"]: row for row in mock_write_fixtures.call_args.args[0]}
+        self.assertEqual((fixtures[1]["status"], fixtures[1]["score_home"]), ("FT", 1))
+        # A napi NS listából a 2-es mérkőzésnek nincs oddsa: élesben sem mentenénk
+        self.assertNotIn(2, fixtures)
+        self.assertEqual(sorted((fixture_id, team_id) for fixture_id, team_id, _ in
+                                mock_write_statistics.call_args.args[0]), [(1, 10), (1, 20), (2, 10), (2, 20)])
+        # Az archívumban nem szereplő 3-as mérkőzés oddsa kimarad, az 1-esé a legfrissebb
+        odds = mock_write_odds.call_args.args[0]
+        self.assertEqual([(row["fixture_id"], row["home_odds"]) for row in odds], [(1, "1.95")])
+        self.assertEqual(odds[0]["updated_at"], "2024-03-02 12:00:00")
+        mock_bookmakers.assert_called_once_with({8: "Bet365"})
+
+    @patch('builtins.print')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_odds')
+    @patch('src.Backend.helpers.reprocess_archive.write_match_statistics_bulk')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_fixtures')
+    def test_reprocess_only_selected_table(self, mock_write_fixtures, mock_write_statistics, mock_write_odds,
+                                           mock_print):
+        self.archive.append("fixtures", {"ids": "1"},
+                            {"response": [api_fixture(1, statistics=[team_statistics(10, 5)])]}, archived_at=DAY_1)
+
+        counts = reprocess_archive(self.archive, tables=("statistics",))
+
+        self.assertEqual(counts, {"fixtures": 0, "statistics": 1, "odds": 0, "skipped": 0})
+        mock_write_fixtures.assert_not_called()
+        mock_write_odds.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_odds')
+    @patch('src.Backend.helpers.reprocess_archive.save_bookmakers')
+    @patch('src.Backend.helpers.reprocess_archive.write_match_statistics_bulk')
+    @patch('src.Backend.helpers.reprocess_archive.write_to_fixtures')
+    def test_malformed_items_are_skipped(self, mock_write_fixtures, mock_write_statistics, mock_bookmakers,
+                                         mock_write_odds, mock_print):
+        self.archive.append("fixtures", {"ids": "1-2"}, {"response": [{"ok": True}, api_fixture(1)]},
+                            archived_at=DAY_1)
+        self.archive.append("fixtures", {"league": 39, "season": 2023}, {"ok": True}, archived_at=DAY_1)
+        self.archive.append("fixtures/statistics", {"fixture": 1}, {"response": [{"ok": True}]}, archived_at=DAY_1)
+        self.archive.append("odds", {"fixture": 1}, {"response": ["broken", odds_item(1, "2.00")]}, archived_at=DAY_1)
+
+        counts = reprocess_archive(self.archive)
+
+        self.assertEqual(counts, {"fixtures": 1, "statistics": 0, "odds": 1, "skipped": 3})
+        self.assertEqual([row["id"] for row in mock_write_fixtures.call_args.args[0]], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+
+from src.Backend.API.async_client import run_concurrently
+from src.Backend.API.request_scheduler import PriorityScheduler, api_priority, current_priority, \
+    INTERACTIVE, REFRESH, BACKFILL
+
+
+class FakeBucket:
+    """
+    Csak a teszt által kiadott tokeneket engedi át.
+    """
+
+    def __init__(self, tokens=0):
+        self.tokens = tokens
+        self.paused = []
+        self._lock = threading.Lock()
+
+    def release(self, tokens=1):
+        with self._lock:
+            self.tokens += tokens
+
+    def try_acquire(self):
+        with self._lock:
+            if self.tokens:
+                self.tokens -= 1
+                return True
+            return False
+
+    def time_until_token(self):
+        return 0.005
+
+    def pause(self, seconds):
+        self.paused.append(seconds)
+
+
+class TestPriorityScheduler(unittest.TestCase):
+
+    def wait_for_queue(self, scheduler, **expected):
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            depths = scheduler.queue_depths()
+            if all(depths[name] == count for name, count in expected.items()):
+                return
+            time.sleep(0.001)
+        self.fail(f"A sor nem állt be: {scheduler.queue_depths()}")
+
+    def test_interactive_request_jumps_the_queue(self):
+        bucket = FakeBucket()
+        scheduler = PriorityScheduler(bucket)
+        order = []
+
+        def request(name, priority):
+            scheduler.acquire(priority)
+            order.append(name)
+
+        threads = [threading.Thread(target=request, args=(f"backfill-{i}", BACKFILL)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        self.wait_for_queue(scheduler, backfill=3)
+
+        threads.append(threading.Thread(target=request, args=("refresh", REFRESH)))
+        threads[-1].start()
+        threads.append(threading.Thread(target=request, args=("click", INTERACTIVE)))
+        threads[-1].start()
+        self.wait_for_queue(scheduler, backfill=3, refresh=1, interactive=1)
+
+        for served in range(5):
+            bucket.release()
+            deadline = time.monotonic() + 2
+            while len(order) <= served and time.monotonic() < deadline:
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join(timeout=2)
+
+        self.assertEqual(order[:2], ["click", "refresh"])
+        self.assertEqual(sorted(order[2:]), ["backfill-0", "backfill-1", "backfill-2"])
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["backfill"]["granted"], 3)
+        self.assertEqual(stats["backfill"]["max_queued"], 3)
+        self.assertEqual(stats["interactive"]["queued"], 0)
+        self.assertGreater(stats["backfill"]["wait_max"], stats["interactive"]["wait_max"])
+
+    def test_priority_follows_context_into_worker_threads(self):
+        scheduler = PriorityScheduler(FakeBucket(tokens=10))
+
+        with api_priority(INTERACTIVE):
+            priorities = run_concurrently(lambda: current_priority(), [(), ()])
+            run_concurrently(scheduler.acquire, [(), ()])
+
+        self.assertEqual(priorities, [INTERACTIVE, INTERACTIVE])
+        self.assertEqual(current_priority(), REFRESH)
+        self.assertEqual(scheduler.stats()["interactive"]["granted"], 2)
+
+    def test_pause_is_forwarded_to_bucket(self):
+        bucket = FakeBucket()
+        PriorityScheduler(bucket).pause(3.0)
+
+        self.assertEqual(bucket.paused, [3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.Backend.API.response_cache import ResponseCache, make_cache_key, ROLLING_LIST_TTL
+
+
+def fixture_payload(fixture_id, status):
+    return {"errors": [], "response": [{"fixture": {"id": fixture_id, "status": {"short": status}}}]}
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp_dir.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_cache_key_is_normalized(self):
+        self.assertEqual(make_cache_key("fixtures", {"id": 1, "timezone": "UTC"}),
+                         make_cache_key("fixtures", {"timezone": "UTC", "id": "1"}))
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get("fixtures", {"id": 1}))
+        self.cache.put("fixtures", {"id": 1}, fixture_payload(1, "FT"))
+
+        self.assertEqual(self.cache.get("fixtures", {"id": 1}), fixture_payload(1, "FT"))
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["per_endpoint"]["fixtures"], {"hits": 1, "misses": 1})
+
+    def test_finished_fixture_never_expires(self):
+        self.cache.put("fixtures", {"id": 1}, fixture_payload(1, "FT"))
+
+        with patch('src.Backend.API.response_cache.time.time', return_value=10 ** 12):
+            self.assertIsNotNone(self.cache.get("fixtures", {"id": 1}))
+
+    def test_rolling_lists_of_finished_fixtures_expire(self):
+        with patch('src.Backend.API.response_cache.time.time', return_value=1000):
+            self.cache.put("fixtures", {"team": 33, "last": 25}, fixture_payload(1, "FT"))
+            self.cache.put("fixtures/headtohead", {"h2h": "33-34", "last": 10}, fixture_payload(1, "FT"))
+            self.cache.put("fixtures", {"league": 39, "season": 2023, "to": "2024-06-01"}, fixture_payload(1, "FT"))
+
+        with patch('src.Backend.API.response_cache.time.time', return_value=1000 + ROLLING_LIST_TTL + 1):
+            self.assertIsNone(self.cache.get("fixtures", {"team": 33, "last": 25}))
+            self.assertIsNone(self.cache.get("fixtures/headtohead", {"h2h": "33-34", "last": 10}))
+            # Lezárult dátumtartomány: nem bővülhet, nem jár le
+            self.assertIsNotNone(self.cache.get("fixtures", {"league": 39, "season": 2023, "to": "2024-06-01"}))
+
+    @patch('src.Backend.API.response_cache.API_CACHE_NS_TTL', 60)
+    def test_not_started_fixture_expires(self):
+        with patch('src.Backend.API.response_cache.time.time', return_value=1000):
+            self.cache.put("fixtures", {"id": 2}, fixture_payload(2, "NS"))
+        with patch('src.Backend.API.response_cache.time.time', return_value=1059):
+            self.assertIsNotNone(self.cache.get("fixtures", {"id": 2}))
+        with patch('src.Backend.API.response_cache.time.time', return_value=1061):
+            self.assertIsNone(self.cache.get("fixtures", {"id": 2}))
+
+    def test_statistics_of_finished_fixture_never_expire(self):
+        self.cache.put("fixtures", {"id": 3}, fixture_payload(3, "FT"))
+        self.cache.put("fixtures/statistics", {"fixture": 3}, {"errors": [], "response": [{"team": {"id": 1}}]})
+
+        with patch('src.Backend.API.response_cache.time.time', return_value=10 ** 12):
+            self.assertIsNotNone(self.cache.get("fixtures/statistics", {"fixture": 3}))
+
+    def test_empty_or_error_response_not_cached(self):
+        self.cache.put("odds", {"fixture": 4}, {"errors": [], "response": []})
+        self.cache.put("odds", {"fixture": 5}, {"errors": {"rateLimit": "Too many requests"}, "response": []})
+
+        self.assertIsNone(self.cache.get("odds", {"fixture": 4}))
+        self.assertIsNone(self.cache.get("odds", {"fixture": 5}))
+        self.assertEqual(self.cache.stats()["stores"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
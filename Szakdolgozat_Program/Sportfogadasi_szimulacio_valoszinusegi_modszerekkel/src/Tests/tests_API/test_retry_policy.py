@@ -0,0 +1,141 @@
+import json
+import socket
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+from urllib3.exceptions import MaxRetryError
+
+from src.Backend.API.make_api_request import _send_request
+from src.Backend.API.retry_policy import RetryPolicy, parse_retry_after
+from src.config import PRODUCTION_BASE_URL
+
+
+def api_response(status_code=200, body=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = json.dumps(body if body is not None else {"errors": [], "response": [{"ok": True}]}).encode()
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} error")
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_uses_full_jitter_with_cap(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=10.0, rng=lambda low, high: high)
+        self.assertEqual([policy.backoff(attempt) for attempt in range(5)], [1.0, 2.0, 4.0, 8.0, 10.0])
+
+        policy = RetryPolicy(rng=lambda low, high: low)
+        self.assertEqual(policy.backoff(3), 0)
+
+    def test_non_idempotent_policy_does_not_retry_transient_errors(self):
+        self.assertTrue(RetryPolicy(max_attempts=3).can_retry_transient(0))
+        self.assertFalse(RetryPolicy(max_attempts=3).can_retry_transient(2))
+        self.assertFalse(RetryPolicy(max_attempts=3, idempotent=False).can_retry_transient(0))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+@patch('builtins.print')
+@patch('src.Backend.API.make_api_request.time.sleep')
+@patch('src.Backend.API.make_api_request.api_quota_meter')
+@patch('src.Backend.API.make_api_request.api_rate_limiter')
+@patch('src.Backend.API.make_api_request.get_api_session')
+class TestSendRequestRetries(unittest.TestCase):
+
+    def setUp(self):
+        archive_patcher = patch('src.Backend.API.make_api_request.raw_archive')
+        self.mock_archive = archive_patcher.start()
+        self.addCleanup(archive_patcher.stop)
+        url_patcher = patch('src.Backend.API.make_api_request.BASE_URL', PRODUCTION_BASE_URL)
+        url_patcher.start()
+        self.addCleanup(url_patcher.stop)
+
+    def test_rate_limit_pauses_limiter_for_retry_after(self, mock_session, mock_limiter, mock_meter, mock_sleep,
+                                                      mock_print):
+        mock_session.return_value.get.side_effect = [
+            api_response(429, {"errors": {"rateLimit": "Too many requests"}}, {"Retry-After": "3"}),
+            api_response(200, {"errors": {"rateLimit": "Too many requests"}}),
+            api_response(200),
+        ]
+
+        data = _send_request("fixtures", {"id": 1})
+
+        self.assertEqual(data["response"], [{"ok": True}])
+        self.assertEqual(mock_session.return_value.get.call_count, 3)
+        self.assertEqual(mock_limiter.pause.call_args_list[0].args, (3.0,))
+        self.assertEqual(mock_limiter.pause.call_count, 2)
+        self.assertEqual(mock_limiter.acquire.call_count, 3)
+        mock_sleep.assert_not_called()
+        # Csak a végül sikeres válasz kerül a nyers archívumba
+        self.mock_archive.append.assert_called_once_with("fixtures", {"id": 1}, data)
+
+    def test_rate_limit_retries_are_bounded(self, mock_session, mock_limiter, mock_meter, mock_sleep, mock_print):
+        mock_session.return_value.get.return_value = api_response(429, {}, {"Retry-After": "1"})
+
+        self.assertIsNone(_send_request("odds", {"fixture": 1}))
+        self.assertEqual(mock_session.return_value.get.call_count, 3)  # Az odds szabály 3 kísérletet enged
+        self.mock_archive.append.assert_not_called()
+
+    def test_transient_errors_are_retried_with_backoff(self, mock_session, mock_limiter, mock_meter, mock_sleep,
+                                                       mock_print):
+        mock_session.return_value.get.side_effect = [
+            requests.exceptions.ConnectionError("reset"),
+            api_response(503),
+            api_response(200),
+        ]
+
+        data = _send_request("teams", {"id": 1})
+
+        self.assertEqual(data["response"], [{"ok": True}])
+        self.assertEqual(mock_sleep.call_count, 2)
+        mock_limiter.pause.assert_not_called()
+
+    def test_name_resolution_errors_are_not_retried(self, mock_session, mock_limiter, mock_meter, mock_sleep,
+                                                    mock_print):
+        dns_error = socket.gaierror(-2, "Name or service not known")
+        mock_session.return_value.get.side_effect = requests.exceptions.ConnectionError(
+            MaxRetryError(None, "/teams", reason=dns_error))
+
+        self.assertIsNone(_send_request("teams", {"id": 1}))
+        self.assertEqual(mock_session.return_value.get.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_client_errors_are_not_retried(self, mock_session, mock_limiter, mock_meter, mock_sleep, mock_print):
+        mock_session.return_value.get.return_value = api_response(404)
+
+        self.assertIsNone(_send_request("teams", {"id": 1}))
+        self.assertEqual(mock_session.return_value.get.call_count, 1)
+
+    def test_non_idempotent_endpoint_is_not_retried(self, mock_session, mock_limiter, mock_meter, mock_sleep,
+                                                    mock_print):
+        mock_session.return_value.get.side_effect = requests.exceptions.Timeout("timeout")
+
+        with patch('src.Backend.API.make_api_request.get_retry_policy',
+                   return_value=RetryPolicy(max_attempts=5, idempotent=False)):
+            self.assertIsNone(_send_request("teams", {"id": 1}))
+
+        self.assertEqual(mock_session.return_value.get.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_stand_in_server_responses_are_not_archived_or_metered(self, mock_session, mock_limiter, mock_meter,
+                                                                   mock_sleep, mock_print):
+        mock_session.return_value.get.return_value = api_response(200)
+
+        with patch('src.Backend.API.make_api_request.BASE_URL', "http://127.0.0.1:8765/"):
+            data = _send_request("fixtures", {"id": 1})
+
+        self.assertEqual(data["response"], [{"ok": True}])
+        self.assertEqual(mock_session.return_value.get.call_args.args[0], "http://127.0.0.1:8765/fixtures")
+        self.mock_archive.append.assert_not_called()
+        mock_meter.record.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.Backend.API.fixtures import backfill_league_seasons
+
+
+def api_fixture(fixture_id, status="FT"):
+    return {
+        "fixture": {"id": fixture_id, "date": "2024-03-01T15:00:00+00:00", "status": {"short": status}},
+        "league": {"id": 39, "season": 2023, "country": "England"},
+        "teams": {"home": {"id": 1, "name": "A", "logo": "a.png"}, "away": {"id": 2, "name": "B", "logo": "b.png"}},
+        "score": {"fulltime": {"home": 1, "away": 0}}
+    }
+
+
+@patch('builtins.print')
+@patch('src.Backend.API.fixtures.write_league_season_backfill')
+@patch('src.Backend.API.fixtures.write_to_fixtures')
+@patch('src.Backend.API.fixtures.fetch_many')
+@patch('src.Backend.API.fixtures.read_league_season_backfill')
+class TestSeasonBackfill(unittest.TestCase):
+
+    def test_only_missing_or_stale_seasons_are_fetched(self, mock_state, mock_fetch_many, mock_write_fixtures,
+                                                       mock_write_state, mock_print):
+        mock_state.return_value = {
+            (39, 2022): {"is_complete": 1, "backfilled_at": datetime.now() - timedelta(days=300)},
+            (39, 2024): {"is_complete": 0, "backfilled_at": datetime.now()},
+            (61, 2024): {"is_complete": 0, "backfilled_at": datetime.now() - timedelta(days=2)},
+        }
+        mock_fetch_many.return_value = [{"errors": [], "response": [api_fixture(1)]},
+                                        {"errors": [], "response": [api_fixture(2), api_fixture(3, "NS")]}]
+
+        saved = backfill_league_seasons([(39, 2022), (39, 2023), (39, 2024), (61, 2024)])
+
+        requested = [(params["league"], params["season"]) for _, params in mock_fetch_many.call_args.args[0]]
+        self.assertEqual(requested, [(39, 2023), (61, 2024)])
+        self.assertEqual(saved, 3)
+        self.assertEqual(mock_write_fixtures.call_count, 2)
+        self.assertEqual([call.args for call in mock_write_state.call_args_list],
+                         [(39, 2023, 1, True), (61, 2024, 2, False)])
+
+    def test_nothing_to_do(self, mock_state, mock_fetch_many, mock_write_fixtures, mock_write_state, mock_print):
+        mock_state.return_value = {(39, 2022): {"is_complete": 1, "backfilled_at": datetime.now()}}
+
+        self.assertEqual(backfill_league_seasons([(39, 2022)]), 0)
+        mock_fetch_many.assert_not_called()
+
+    def test_failed_season_is_not_marked(self, mock_state, mock_fetch_many, mock_write_fixtures, mock_write_state,
+                                         mock_print):
+        mock_state.return_value = {}
+        mock_fetch_many.return_value = [None]
+
+        self.assertEqual(backfill_league_seasons([(39, 2023)]), 0)
+        mock_write_fixtures.assert_not_called()
+        mock_write_state.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
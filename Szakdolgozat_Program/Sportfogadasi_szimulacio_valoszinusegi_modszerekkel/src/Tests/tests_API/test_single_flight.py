@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+
+from src.Backend.API.async_client import run_concurrently
+from src.Backend.API.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    def slow_call(self):
+        self.calls += 1
+        time.sleep(0.05)
+        return {"response": [self.calls]}
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do("teams?id=1", self.slow_call)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.flight.stats(), {"executed": 1, "deduplicated": 4})
+
+    def test_repeated_calls_outside_scope_execute_again(self):
+        self.flight.do("teams?id=1", self.slow_call)
+        self.flight.do("teams?id=1", self.slow_call)
+        self.assertEqual(self.calls, 2)
+
+    def test_repeated_calls_inside_scope_are_memoized(self):
+        with self.flight.run_scope():
+            first = self.flight.do("teams?id=1", self.slow_call)
+            with self.flight.run_scope():
+                second = self.flight.do("teams?id=1", self.slow_call)
+            third = self.flight.do("teams?id=1", self.slow_call)
+
+        self.assertEqual(self.calls, 1)
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(self.flight.stats()["deduplicated"], 2)
+
+        # A hatókör végén a memó törlődik
+        self.flight.do("teams?id=1", self.slow_call)
+        self.assertEqual(self.calls, 2)
+
+    def test_remember_false_and_failed_calls_are_not_memoized(self):
+        with self.flight.run_scope():
+            self.flight.do("fixtures?id=1", self.slow_call, remember=False)
+            self.flight.do("fixtures?id=1", self.slow_call, remember=False)
+            self.flight.do("odds?fixture=1", lambda: None)
+            self.flight.do("odds?fixture=1", lambda: None)
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.flight.stats()["deduplicated"], 0)
+
+
+    def test_fresh_call_does_not_follow_cached_leader(self):
+        started = threading.Event()
+
+        def cached_call():
+            started.set()
+            time.sleep(0.05)
+            return {"response": ["cached"]}
+
+        leader = threading.Thread(target=lambda: self.flight.do("fixtures?ids=1", cached_call))
+        leader.start()
+        started.wait()
+        fresh = self.flight.do("fixtures?ids=1", lambda: {"response": ["fresh"]}, remember=False)
+        leader.join()
+
+        self.assertEqual(fresh, {"response": ["fresh"]})
+
+    def test_scope_does_not_leak_to_other_threads(self):
+        with self.flight.run_scope():
+            self.flight.do("teams?id=1", self.slow_call)
+            other = threading.Thread(target=lambda: self.flight.do("teams?id=1", self.slow_call))
+            other.start()
+            other.join()
+            self.flight.do("teams?id=1", self.slow_call)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_scope_is_shared_with_concurrent_workers(self):
+        with self.flight.run_scope():
+            self.flight.do("teams?id=1", self.slow_call)
+            run_concurrently(lambda: self.flight.do("teams?id=1", self.slow_call), [(), (), ()])
+
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch
+
+from src.Backend.API.fixtures import fetch_fixtures_by_ids, update_fixtures
+
+
+def api_fixture(fixture_id, status="FT", home=2, away=1):
+    return {
+        "fixture": {"id": fixture_id, "date": "2025-03-01T15:00:00+00:00", "status": {"short": status}},
+        "score": {"fulltime": {"home": home, "away": away}}
+    }
+
+
+def fake_ids_request(endpoint, params, use_cache=True):
+    ids = [int(fixture_id) for fixture_id in params["ids"].split("-")]
+    return {"errors": [], "response": [api_fixture(fixture_id) for fixture_id in ids]}
+
+
+class TestBatchedFixtureRefresh(unittest.TestCase):
+
+    @patch('builtins.print')
+    @patch('src.Backend.API.fixtures.make_api_request', side_effect=fake_ids_request)
+    def test_fetch_fixtures_by_ids_chunks_by_twenty(self, mock_request, mock_print):
+        fixtures = fetch_fixtures_by_ids(range(1, 46), use_cache=False)
+
+        self.assertEqual(mock_request.call_count, 3)  # 20 + 20 + 5
+        self.assertEqual(set(fixtures), set(range(1, 46)))
+        for call in mock_request.call_args_list:
+            self.assertLessEqual(len(call.args[1]["ids"].split("-")), 20)
+            self.assertFalse(call.args[2])
+
+    @patch('builtins.print')
+    @patch('src.Backend.API.fixtures.evaluate_predictions_for_fixtures')
+    @patch('src.Backend.API.fixtures.update_fixture_status')
+    @patch('src.Backend.API.fixtures.get_fixtures_with_updatable_status')
+    @patch('src.Backend.API.fixtures.make_api_request', side_effect=fake_ids_request)
+    def test_update_fixtures_single_batch_write_and_evaluation(self, mock_request, mock_get_updatable,
+                                                               mock_update_status, mock_evaluate, mock_print):
+        mock_get_updatable.return_value = [
+            {"id": fixture_id, "status": "NS", "score_home": None, "score_away": None} for fixture_id in range(1, 31)
+        ]
+
+        update_fixtures()
+
+        self.assertEqual(mock_request.call_count, 2)
+        mock_update_status.assert_called_once()
+        self.assertEqual(len(mock_update_status.call_args.args[0]), 30)
+        mock_evaluate.assert_called_once()
+        self.assertEqual(len(mock_evaluate.call_args.args[0]), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
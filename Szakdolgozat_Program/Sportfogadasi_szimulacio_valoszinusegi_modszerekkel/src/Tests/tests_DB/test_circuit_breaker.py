@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.Backend.DB.circuit_breaker import CircuitBreaker
+
+
+@patch('builtins.print')
+class TestCircuitBreaker(unittest.TestCase):
+
+    def make_breaker(self, probe, **kwargs):
+        breaker = CircuitBreaker(probe, **kwargs)
+        self.addCleanup(breaker.stop)
+        return breaker
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def test_opens_after_consecutive_failures(self, mock_print):
+        breaker = self.make_breaker(lambda: False, failure_threshold=3, probe_interval=60)
+
+        self.assertFalse(breaker.record_failure())
+        breaker.record_success()  # A sikeres hívás nullázza a számlálót
+        self.assertFalse(breaker.record_failure())
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.record_failure())
+
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.rejected, 2)
+
+    def test_single_probe_closes_the_circuit(self, mock_print):
+        results = iter([False, False, True])
+        probe_threads = set()
+
+        def probe():
+            probe_threads.add(threading.current_thread().name)
+            return next(results)
+
+        breaker = self.make_breaker(probe, failure_threshold=1, probe_interval=0.01)
+        self.assertTrue(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())  # Már nyitva: nem indul újabb próba
+
+        self.wait_until(lambda: not breaker.is_open)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.trips, 1)
+        self.assertEqual(len(probe_threads), 1)
+
+    def test_probe_exception_keeps_circuit_open(self, mock_print):
+        calls = []
+
+        def probe():
+            calls.append(1)
+            raise ConnectionError("still down")
+
+        breaker = self.make_breaker(probe, failure_threshold=1, probe_interval=0.01)
+        breaker.record_failure()
+
+        self.wait_until(lambda: len(calls) >= 2)
+        self.assertTrue(breaker.is_open)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+
+from src.Backend.DB import connection as connection_module
+from src.Backend.DB.circuit_breaker import CircuitBreaker
+from src.Backend.DB.connection import get_db_connection, get_db_pool, db_connection
+
+
+@patch('builtins.print')
+@patch('src.Backend.DB.connection.time.sleep')
+@patch('src.Backend.DB.connection.pooling.MySQLConnectionPool')
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(connection_module, "_pool", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(MagicMock(return_value=False), failure_threshold=3, probe_interval=60)
+        self.addCleanup(self.breaker.stop)
+        breaker_patcher = patch.object(connection_module, "db_circuit_breaker", self.breaker)
+        breaker_patcher.start()
+        self.addCleanup(breaker_patcher.stop)
+
+    def test_pool_is_created_once(self, mock_pool_class, mock_sleep, mock_print):
+        first = get_db_connection()
+        second = get_db_connection()
+
+        mock_pool_class.assert_called_once()
+        self.assertEqual(mock_pool_class.call_args.kwargs["pool_size"], connection_module.DB_POOL_SIZE)
+        self.assertIs(get_db_pool(), mock_pool_class.return_value)
+        self.assertIs(first, mock_pool_class.return_value.get_connection.return_value)
+        self.assertIs(second, first)
+
+    def test_exhausted_pool_waits_for_a_free_connection(self, mock_pool_class, mock_sleep, mock_print):
+        pooled = MagicMock()
+        mock_pool_class.return_value.get_connection.side_effect = [
+            mysql.connector.errors.PoolError("pool exhausted"), mysql.connector.errors.PoolError("pool exhausted"),
+            pooled,
+        ]
+
+        self.assertIs(get_db_connection(), pooled)
+        self.assertEqual(mock_sleep.call_count, 2)
+        mock_print.assert_not_called()
+
+    def test_unreachable_server_returns_none(self, mock_pool_class, mock_sleep, mock_print):
+        mock_pool_class.side_effect = mysql.connector.errors.InterfaceError("Can't connect")
+
+        self.assertIsNone(get_db_connection(retries=5, delay=1))
+        # A harmadik hiba kinyitja a megszakítót: a többi hívás már nem próbálkozik és nem vár
+        self.assertEqual(mock_pool_class.call_count, 3)
+        self.assertEqual([call.args for call in mock_sleep.call_args_list], [(1,), (1,)])
+        self.assertTrue(self.breaker.is_open)
+
+        self.assertIsNone(get_db_connection())
+        self.assertEqual(mock_pool_class.call_count, 3)
+        self.assertEqual(self.breaker.rejected, 1)
+
+    def test_context_manager_returns_connection_to_pool(self, mock_pool_class, mock_sleep, mock_print):
+        pooled = mock_pool_class.return_value.get_connection.return_value
+
+        with db_connection() as connection:
+            self.assertIs(connection, pooled)
+            pooled.close.assert_not_called()
+
+        pooled.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
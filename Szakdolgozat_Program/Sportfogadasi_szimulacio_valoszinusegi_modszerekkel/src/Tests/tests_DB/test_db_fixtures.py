@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import mysql.connector
+
+from src.Backend.DB.fixtures import write_to_fixtures, get_last_matches, get_last_matches_bulk, \
+    prefetched_last_matches, read_head_to_head_stats, delete_fixtures_without_statistics
+
+
+def fixture_row(fixture_id, home_team_id, away_team_id, status="FT"):
+    return {
+        "id": fixture_id, "date": "2024-03-01T15:00:00+00:00",
+        "home_team_id": home_team_id, "home_team_name": f"Team {home_team_id}", "home_team_country": "England",
+        "home_team_logo": f"{home_team_id}.png",
+        "away_team_id": away_team_id, "away_team_name": f"Team {away_team_id}", "away_team_country": "England",
+        "away_team_logo": f"{away_team_id}.png",
+        "score_home": 2, "score_away": 1, "status": status,
+    }
+
+
+def history_row(team_id, fixture_id, opponent_id):
+    return {"team_id": team_id, "id": fixture_id, "date": None,
+            "home_team_id": team_id, "home_team_name": f"Team {team_id}",
+            "away_team_id": opponent_id, "away_team_name": f"Team {opponent_id}",
+            "score_home": 1, "score_away": 0, "status": "FT"}
+
+
+class TestFixturesDB(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_cursor = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_connection.cursor.return_value = self.mock_cursor
+
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_write_to_fixtures_is_one_bulk_transaction(self, mock_get_db):
+        mock_get_db.return_value = self.mock_connection
+        fixtures = [fixture_row(1000 + i, i % 20, (i + 7) % 20) for i in range(380)]
+        fixtures[0]["status"] = {"short": "NS"}
+
+        write_to_fixtures(fixtures)
+
+        mock_get_db.assert_called_once()
+        # Egy többsoros csapat upsert és egy executemany, soronkénti execute nélkül
+        self.mock_cursor.execute.assert_called_once()
+        team_query, team_values = self.mock_cursor.execute.call_args.args
+        self.assertIn("INSERT INTO teams", team_query)
+        self.assertEqual(len(team_values), 20 * 4)
+        self.mock_cursor.executemany.assert_called_once()
+        fixture_rows = self.mock_cursor.executemany.call_args.args[1]
+        self.assertEqual(len(fixture_rows), 380)
+        self.assertEqual(fixture_rows[0][-1], "NS")
+        self.mock_connection.commit.assert_called_once()
+        self.mock_connection.close.assert_called_once()
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_write_to_fixtures_rolls_back_on_error(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.executemany.side_effect = mysql.connector.Error("FK error")
+
+        write_to_fixtures([fixture_row(1, 10, 20)])
+
+        self.mock_connection.rollback.assert_called_once()
+        self.mock_connection.commit.assert_not_called()
+        self.mock_connection.close.assert_called_once()
+
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_write_to_fixtures_empty(self, mock_get_db):
+        write_to_fixtures([])
+
+        mock_get_db.assert_not_called()
+
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_get_last_matches_bulk_is_one_query(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = [history_row(1, 11, 5), history_row(1, 10, 6), history_row(2, 12, 7)]
+
+        histories = get_last_matches_bulk([1, 2, 3, 1], 10, exclude_opponents={1: 2, 2: 1})
+
+        self.mock_cursor.execute.assert_called_once()
+        query, params = self.mock_cursor.execute.call_args.args
+        self.assertIn("ROW_NUMBER() OVER (PARTITION BY t.team_id", query)
+        self.assertEqual(query.count("(%s, %s)"), 2)
+        self.assertEqual(params, [1, 2, 3, 1, 2, 3, 1, 2, 2, 1, 10])
+        self.assertEqual([match["id"] for match in histories[1]], [11, 10])
+        self.assertEqual([match["id"] for match in histories[2]], [12])
+        self.assertEqual(histories[3], [])
+        self.assertNotIn("team_id", histories[1][0])
+        self.mock_connection.close.assert_called_once()
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_failed_prefetch_falls_back_to_per_team_queries(self, mock_get_db, mock_print):
+        bulk_connection = MagicMock()
+        bulk_connection.cursor.return_value.execute.side_effect = mysql.connector.Error("timeout")
+        mock_get_db.side_effect = [bulk_connection, None, self.mock_connection]
+        self.mock_cursor.fetchall.return_value = [history_row(1, 100, 20)]
+
+        self.assertIsNone(get_last_matches_bulk([1, 2]))
+        self.assertIsNone(get_last_matches_bulk([1, 2]))
+
+        mock_get_db.side_effect = [bulk_connection, self.mock_connection]
+        with prefetched_last_matches([1, 2]):
+            # Nincs előtöltött adat: a csapat meccsei az adatbázisból jönnek, nem üres lista
+            self.assertEqual([m["id"] for m in get_last_matches(1, None, 10)], [100])
+        self.mock_cursor.execute.assert_called_once()
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_prefetched_history_serves_get_last_matches(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = [history_row(1, 100 + i, 20 + i) for i in range(4)] + \
+                                                 [history_row(2, 200, 30)]
+
+        with prefetched_last_matches([1, 2], num_matches=4):
+            self.mock_cursor.execute.reset_mock()
+            # Az ellenfél kizárása után is van elég mérkőzés
+            self.assertEqual([m["id"] for m in get_last_matches(1, 21, 3)], [100, 102, 103])
+            # A 2-es csapatnak nincs több meccse, a lista teljes
+            self.assertEqual([m["id"] for m in get_last_matches(2, None, 10)], [200])
+            self.mock_cursor.execute.assert_not_called()
+
+            # Több kellene, mint amennyit betöltöttünk: az adatbázis dönt
+            self.mock_cursor.fetchall.return_value = []
+            get_last_matches(1, 21, 4)
+            self.mock_cursor.execute.assert_called_once()
+
+            # Írás után az érintett csapat adatait újra le kell kérni
+            self.mock_cursor.execute.reset_mock()
+            write_to_fixtures([fixture_row(300, 2, 9)])
+            self.mock_cursor.execute.reset_mock()
+            get_last_matches(2, None, 1)
+            self.mock_cursor.execute.assert_called_once()
+
+        self.mock_cursor.execute.reset_mock()
+        get_last_matches(1, 21, 3)
+        self.mock_cursor.execute.assert_called_once()
+
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_head_to_head_is_one_read_only_query(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = [history_row(1, 10, 2), history_row(2, 11, 1)]
+
+        matches = read_head_to_head_stats(1, 2)
+
+        self.assertEqual([match["id"] for match in matches], [10, 11])
+        mock_get_db.assert_called_once()
+        self.mock_cursor.execute.assert_called_once()
+        query, params = self.mock_cursor.execute.call_args.args
+        self.assertIn("EXISTS (SELECT 1 FROM match_statistics", query)
+        self.assertEqual(params, (1, 2, 2, 1))
+        self.mock_connection.commit.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('src.Backend.DB.fixtures.get_db_connection')
+    def test_cleanup_deletes_in_batches(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        rowcounts = iter([100, 100, 37])
+
+        def execute(query, params):
+            self.mock_cursor.rowcount = next(rowcounts)
+        self.mock_cursor.execute.side_effect = execute
+
+        self.assertEqual(delete_fixtures_without_statistics(30, batch_size=100), 237)
+
+        self.assertEqual(self.mock_cursor.execute.call_count, 3)
+        query, params = self.mock_cursor.execute.call_args.args
+        self.assertIn("DELETE FROM fixtures", query)
+        self.assertIn("NOT EXISTS (SELECT 1 FROM odds", query)
+        self.assertEqual(params, (30, 100))
+        self.assertEqual(self.mock_connection.commit.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import pathlib
+import re
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.Backend.DB.migrations import apply_migrations, check_query_plans, HOT_QUERIES, CHECKED_TABLES, MIGRATIONS
+
+TEST_MIGRATIONS = [
+    (1, "first", [("fixtures", "idx_a", "home_team_id, date"), ("odds", "idx_b", "fixture_id")]),
+    (2, "second", [("fixtures", "idx_c", "away_team_id, date")]),
+    (3, "third", ["CREATE TABLE IF NOT EXISTS t (id INT NOT NULL PRIMARY KEY)"]),
+]
+
+DB_DIR = pathlib.Path(__file__).resolve().parents[2] / "Backend" / "DB"
+
+
+@patch('builtins.print')
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_cursor = MagicMock()
+        self.mock_connection = MagicMock()
+        self.mock_connection.cursor.return_value = self.mock_cursor
+
+    def executed(self, prefix):
+        return [call.args for call in self.mock_cursor.execute.call_args_list
+                if call.args[0].strip().startswith(prefix)]
+
+    @patch('src.Backend.DB.migrations.index_exists')
+    @patch('src.Backend.DB.migrations.get_db_connection')
+    def test_only_pending_migrations_and_missing_indexes(self, mock_get_db, mock_index_exists, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = [(1,)]
+        mock_index_exists.return_value = False
+
+        self.assertEqual(apply_migrations(TEST_MIGRATIONS), [2, 3])
+
+        self.assertEqual([args[0] for args in self.executed("CREATE INDEX")],
+                         ["CREATE INDEX idx_c ON fixtures (away_team_id, date)"])
+        self.assertEqual([args[0] for args in self.executed("CREATE TABLE IF NOT EXISTS t")],
+                         ["CREATE TABLE IF NOT EXISTS t (id INT NOT NULL PRIMARY KEY)"])
+        self.assertEqual([args[1] for args in self.executed("INSERT INTO schema_migrations")],
+                         [(2, "second"), (3, "third")])
+        self.assertEqual(self.mock_connection.commit.call_count, 2)
+
+    @patch('src.Backend.DB.migrations.index_exists')
+    @patch('src.Backend.DB.migrations.get_db_connection')
+    def test_existing_index_is_not_recreated(self, mock_get_db, mock_index_exists, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = []
+        mock_index_exists.side_effect = lambda cursor, table, name: name == "idx_a"
+
+        self.assertEqual(apply_migrations(TEST_MIGRATIONS), [1, 2, 3])
+
+        self.assertEqual([args[0].split()[2] for args in self.executed("CREATE INDEX")], ["idx_b", "idx_c"])
+
+    @patch('src.Backend.DB.migrations.get_db_connection')
+    def test_explain_check_reports_full_scans(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.side_effect = [
+            [{"table": "<derived2>", "type": "ALL", "rows": 20},
+             {"table": "fixtures", "type": "range", "rows": 10},
+             {"table": "ht", "type": "eq_ref", "rows": 1}],
+            [{"table": "odds", "type": "ALL", "rows": 50000}],
+        ]
+        queries = [("last_matches", "SELECT 1", ()), ("best_odds", "SELECT 2", ())]
+
+        self.assertEqual(check_query_plans(queries), [("best_odds", "odds")])
+        self.assertTrue(self.executed("EXPLAIN"))
+
+    @patch('src.Backend.DB.migrations.get_db_connection')
+    def test_full_scan_under_an_alias_is_reported(self, mock_get_db, mock_print):
+        mock_get_db.return_value = self.mock_connection
+        self.mock_cursor.fetchall.return_value = [{"table": "mp", "type": "ALL", "rows": 90000}]
+
+        self.assertEqual(check_query_plans([("update_strategy_profit", "SELECT 1", ())]),
+                         [("update_strategy_profit", "mp")])
+
+    def test_versions_are_unique_and_increasing(self, mock_print):
+        versions = [version for version, _, _ in MIGRATIONS]
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_tables_are_created_only_by_migrations(self, mock_print):
+        for path in DB_DIR.glob("*.py"):
+            if path.name != "migrations.py":
+                with self.subTest(module=path.name):
+                    self.assertNotIn("CREATE TABLE", path.read_text(encoding="utf-8"))
+
+    def test_every_hot_query_alias_of_a_checked_table_is_checked(self, mock_print):
+        base_tables = {"fixtures", "match_statistics", "model_predictions", "odds"}
+        for name, query, _ in HOT_QUERIES:
+            for table, alias in re.findall(r"(?:FROM|JOIN)\s+(\w+)\s+(?:AS\s+)?(\w+)", query):
+                if table in base_tables and alias.upper() not in ("WHERE", "JOIN", "ON", "ORDER", "GROUP", "LEFT"):
+                    with self.subTest(query=name, alias=alias):
+                        self.assertIn(alias, CHECKED_TABLES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+import warnings
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from src.Backend.DB.predictions import compute_strategy_results, load_strategy_inputs, update_strategy_profit
+
+
+def reference_results(bets_by_model):
+    """
+    A korábbi, soronkénti update_strategy_profit számítása modellenként:
+    bets_by_model[model] = [(won, odds, probability) fogadható mérkőzésenként, időrendben].
+    """
+    profits = np.zeros((5, len(bets_by_model)))
+    stakes = np.zeros_like(profits)
+    fib_seq = [1, 1, 2, 3, 5, 8, 13, 21, 34]
+    for model, bets in enumerate(bets_by_model):
+        stake, fib_index, bankroll = 10.0, 0, 10.0
+        for won, odds, probability in bets:
+            profits[0, model] += 10.0 * (odds - 1) if won else -10.0
+            stakes[0, model] += 10.0
+            if probability * odds > 1:
+                profits[1, model] += 10.0 * (odds - 1) if won else -10.0
+                stakes[1, model] += 10.0
+            profits[2, model] += stake * (odds - 1) if won else -stake
+            stakes[2, model] += stake
+            stake = 10.0 if won else stake * 2
+            current = 10.0 * fib_seq[fib_index]
+            profits[3, model] += current * (odds - 1) if won else -current
+            stakes[3, model] += current
+            fib_index = max(0, fib_index - 2) if won else min(len(fib_seq) - 1, fib_index + 1)
+            b = odds - 1
+            fraction = (probability * b - (1 - probability)) / b
+            if fraction > 0:
+                current = bankroll * fraction
+                bankroll += current * b if won else -current
+                stakes[4, model] += current
+        profits[4, model] = bankroll - 10.0
+    return profits, stakes
+
+
+@patch('builtins.print')
+class TestStrategyProfit(unittest.TestCase):
+
+    def test_vectorized_results_match_sequential_betting(self, mock_print):
+        rng = random.Random(7)
+        fixtures = 25
+        valid = np.array([[rng.random() < 0.8 for _ in range(fixtures)] for _ in range(6)])
+        won = np.array([[rng.random() < 0.45 for _ in range(fixtures)] for _ in range(6)])
+        odds = np.array([[round(rng.uniform(1.2, 5.0), 2) for _ in range(fixtures)] for _ in range(6)])
+        probability = np.array([[rng.uniform(0.2, 0.8) for _ in range(fixtures)] for _ in range(6)])
+
+        profits, stakes = compute_strategy_results(valid, won, odds, probability)
+
+        expected_profits, expected_stakes = reference_results([
+            [(won[m, f], odds[m, f], probability[m, f]) for f in range(fixtures) if valid[m, f]] for m in range(6)
+        ])
+        np.testing.assert_allclose(profits, expected_profits)
+        np.testing.assert_allclose(stakes, expected_stakes)
+
+    def test_padded_cells_do_not_emit_warnings(self, mock_print):
+        valid = np.array([[True, False, False]] * 6)
+        won = np.zeros((6, 3), dtype=bool)
+        odds = np.array([[2.0, 1.0, 1.0]] * 6)  # A 2. és 3. mérkőzésnél nincs fogadható odds
+        probability = np.array([[0.6, np.nan, 0.5]] * 6)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            profits, stakes = compute_strategy_results(valid, won, odds, probability)
+
+        self.assertTrue(np.isfinite(profits).all())
+        np.testing.assert_allclose(stakes[4], 10.0 * 0.2)  # Kelly: (0.6 * 1 - 0.4) / 1 = 0.2
+
+    def test_inputs_are_loaded_with_one_query(self, mock_print):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [
+            {"fixture_id": 11, "model_id": 1, "was_correct": 1, "probability": "55,5", "selected_odds": 2.5},
+            {"fixture_id": 11, "model_id": 1, "was_correct": 0, "probability": "40", "selected_odds": 3.0},
+            {"fixture_id": 12, "model_id": 2, "was_correct": 0, "probability": "40", "selected_odds": 1.01},
+            {"fixture_id": 12, "model_id": 3, "was_correct": 0, "probability": None, "selected_odds": None},
+            {"fixture_id": 99, "model_id": 1, "was_correct": 1, "probability": "60", "selected_odds": 2.0},
+        ]
+
+        valid, won, odds, probability = load_strategy_inputs(cursor, 5, [12, 11])
+
+        cursor.execute.assert_called_once()
+        self.assertEqual(cursor.execute.call_args.args[1], (5, 5))
+        self.assertEqual(valid.shape, (6, 2))
+        self.assertEqual(np.argwhere(valid).tolist(), [[0, 1]])
+        self.assertTrue(won[0, 1])
+        self.assertEqual(odds[0, 1], 2.5)
+        self.assertAlmostEqual(probability[0, 1], 0.555)
+
+    @patch('src.Backend.DB.predictions.get_db_connection')
+    def test_simulations_are_written_with_one_executemany(self, mock_get_db, mock_print):
+        connection = MagicMock()
+        mock_get_db.return_value = connection
+        cursor = connection.cursor.return_value
+        cursor.fetchall.return_value = [
+            {"fixture_id": 1, "model_id": 1, "was_correct": 1, "probability": "60", "selected_odds": 2.0},
+        ]
+        completed = [{"fixture_id": 2, "match_date": "2024-03-02", "score_home": 0, "score_away": 0},
+                     {"fixture_id": 1, "match_date": "2024-03-01", "score_home": 1, "score_away": 0},
+                     {"fixture_id": 3, "match_date": "2024-03-03", "score_home": None, "score_away": None}]
+
+        update_strategy_profit(7, completed)
+
+        mock_get_db.assert_called_once()
+        cursor.execute.assert_called_once()
+        cursor.executemany.assert_called_once()
+        rows = cursor.executemany.call_args.args[1]
+        self.assertEqual([row[-2:] for row in rows], [(7, strategy_id) for strategy_id in range(1, 6)])
+        flat = rows[0]
+        self.assertEqual(flat[:2], (10.0, 10.0))  # Összes profit, majd az 1-es modell profitja
+        self.assertEqual(flat[7], 10.0)  # Az 1-es modell tétje
+        connection.commit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
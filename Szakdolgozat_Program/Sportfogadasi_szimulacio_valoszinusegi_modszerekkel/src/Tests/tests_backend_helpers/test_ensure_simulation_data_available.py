@@ -3,13 +3,31 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 import copy
 
+from src.Backend.API.quota_meter import ApiBudgetExceeded
 from src.Backend.helpers.ensureDatas import ensure_simulation_data_available
 
 
+def all_have_statistics(fixture_ids, exists_only=False):
+    return set(fixture_ids)
+
+
 class TestSimulationData(unittest.TestCase):
 
     def setUp(self):
         """Set up common test data"""
+        # A liga-szezon feltöltés külön tesztelt, itt nem érheti el az API-t és az adatbázist
+        for name, value in (("fetch_fixtures_by_ids", {}), ("backfill_league_seasons", 0)):
+            patcher = patch(f'src.Backend.helpers.ensureDatas.{name}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Az előtöltés nélkül a get_last_matches mock szolgál ki minden lekérést
+        patcher = patch('src.Backend.DB.fixtures.get_last_matches_bulk', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('src.Backend.helpers.ensureDatas.skip_known_missing_statistics', side_effect=list)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         self.fixture_list = [(1, 2, 101), (3, 4, 102)]
 
         # Mock fixture data
@@ -88,21 +106,19 @@ class TestSimulationData(unittest.TestCase):
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_all_data_available(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                       mock_read_odds, mock_write_stats, mock_get_country,
-                                                       mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                       mock_read_odds, mock_get_country,
+                                                       mock_get_h2h, mock_read_h2h,
                                                        mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                        mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test when all required data is already available in database"""
@@ -117,7 +133,7 @@ class TestSimulationData(unittest.TestCase):
 
         # Mock all necessary functions
         mock_get_last_matches.return_value = matches
-        mock_read_stats.return_value = self.mock_stats
+        mock_read_stats.side_effect = all_have_statistics
         mock_read_h2h.return_value = matches[:10]  # 10 H2H matches
         mock_read_odds.return_value = [
             {
@@ -143,27 +159,53 @@ class TestSimulationData(unittest.TestCase):
 
         # Verify DB writes were not called
         mock_write_fixtures.assert_not_called()
-        mock_write_stats.assert_not_called()
         mock_write_odds.assert_not_called()
 
+    @patch('src.Backend.helpers.ensureDatas.api_quota_meter')
+    @patch('src.Backend.helpers.ensureDatas.get_last_matches')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
+    @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
+    @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
+    @patch('builtins.print')
+    def test_exhausted_budget_only_affects_fixtures_needing_api(self, mock_print, mock_fetch_odds, mock_read_odds,
+                                                                mock_read_h2h, mock_read_stats, mock_get_last_matches,
+                                                                mock_meter):
+        """Test that an exhausted API budget keeps fixtures whose data is already stored"""
+        matches = []
+        for i in range(10):
+            match = copy.deepcopy(self.mock_match)
+            match["id"] = 1000 + i
+            matches.append(match)
+
+        mock_get_last_matches.return_value = matches
+        mock_read_stats.side_effect = all_have_statistics
+        mock_read_h2h.return_value = matches
+        mock_read_odds.side_effect = lambda fixture_id: [{"fixture_id": 101}] if fixture_id == 101 else []
+        mock_meter.require.side_effect = ApiBudgetExceeded("no budget")
+
+        result = ensure_simulation_data_available(self.fixture_list, num_matches=10)
+
+        self.assertEqual(result, [101])
+        mock_fetch_odds.assert_not_called()
+        mock_meter.require.assert_called_once()
+
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_functionalities(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                    mock_read_odds, mock_write_stats, mock_get_country,
-                                                    mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                    mock_read_odds, mock_get_country,
+                                                    mock_get_h2h, mock_read_h2h,
                                                     mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                     mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test the main functionalities of ensure_simulation_data_available"""
@@ -179,10 +221,9 @@ class TestSimulationData(unittest.TestCase):
         # Egyszerűsített mock-olás - kevesebb speciális viselkedéssel
         mock_get_last_matches.return_value = api_matches[:15]
         mock_get_fixtures.return_value = api_matches
-        mock_read_stats.return_value = self.mock_stats
-        mock_get_stats.return_value = self.mock_stats
+        mock_read_stats.side_effect = all_have_statistics
+        mock_get_stats.return_value = {}
         mock_read_h2h.return_value = api_matches[:10]
-        mock_get_fixture.return_value = self.mock_fixture
         mock_get_country.return_value = "England"
         mock_read_odds.return_value = []
         mock_fetch_odds.return_value = self.mock_odds
@@ -211,21 +252,19 @@ class TestSimulationData(unittest.TestCase):
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_insufficient_stats(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                       mock_read_odds, mock_write_stats, mock_get_country,
-                                                       mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                       mock_read_odds, mock_get_country,
+                                                       mock_get_h2h, mock_read_h2h,
                                                        mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                        mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test when insufficient statistics are available"""
@@ -240,14 +279,14 @@ class TestSimulationData(unittest.TestCase):
 
         # Mock functions to simulate failed stats
         mock_get_last_matches.return_value = matches
-        mock_read_stats.return_value = None  # No stats in DB
-        mock_get_stats.return_value = None  # No stats from API
+        mock_read_stats.return_value = set()  # No stats in DB
+        mock_get_stats.return_value = {}  # No stats from API
 
         # Run the function
         result = ensure_simulation_data_available(self.fixture_list[:1], num_matches=10)
 
-        # Verify fixtures were deleted due to missing stats
-        mock_delete_fixture.assert_called()
+        # Matches without stats are kept (not deleted and re-inserted on the next run)
+        mock_delete_fixture.assert_not_called()
 
         # Verify the function returned an empty list (no valid fixtures)
         self.assertEqual(result, [])
@@ -255,21 +294,19 @@ class TestSimulationData(unittest.TestCase):
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_insufficient_h2h(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                     mock_read_odds, mock_write_stats, mock_get_country,
-                                                     mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                     mock_read_odds, mock_get_country,
+                                                     mock_get_h2h, mock_read_h2h,
                                                      mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                      mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test when insufficient head-to-head data is available"""
@@ -284,7 +321,7 @@ class TestSimulationData(unittest.TestCase):
 
         # Mock all necessary functions for regular matches
         mock_get_last_matches.return_value = matches
-        mock_read_stats.return_value = self.mock_stats
+        mock_read_stats.side_effect = all_have_statistics
 
         # Not enough H2H matches (only 3)
         mock_read_h2h.return_value = []
@@ -299,9 +336,6 @@ class TestSimulationData(unittest.TestCase):
 
         mock_get_h2h.return_value = h2h_matches
 
-        # Mock stats for H2H matches
-        mock_get_fixture.return_value = self.mock_fixture
-
         # Run the function
         result = ensure_simulation_data_available(self.fixture_list[:1], num_matches=10)
 
@@ -311,21 +345,19 @@ class TestSimulationData(unittest.TestCase):
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_missing_odds(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                 mock_read_odds, mock_write_stats, mock_get_country,
-                                                 mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                 mock_read_odds, mock_get_country,
+                                                 mock_get_h2h, mock_read_h2h,
                                                  mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                  mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test when odds data is missing and needs to be fetched"""
@@ -340,7 +372,7 @@ class TestSimulationData(unittest.TestCase):
 
         # Mock all necessary functions
         mock_get_last_matches.return_value = matches
-        mock_read_stats.return_value = self.mock_stats
+        mock_read_stats.side_effect = all_have_statistics
         mock_read_h2h.return_value = matches[:10]  # 10 H2H matches
 
         # No odds in DB
@@ -362,21 +394,19 @@ class TestSimulationData(unittest.TestCase):
     @patch('src.Backend.helpers.ensureDatas.get_last_matches')
     @patch('src.Backend.helpers.ensureDatas.get_fixtures_for_team')
     @patch('src.Backend.helpers.ensureDatas.write_to_fixtures')
-    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.get_match_statistics')
-    @patch('src.Backend.helpers.ensureDatas.delete_fixture_by_id')
+    @patch('src.Backend.helpers.ensureDatas.read_from_match_statistics_bulk')
+    @patch('src.Backend.helpers.ensureDatas.fetch_match_statistics_batch')
+    @patch('src.Backend.DB.fixtures.delete_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.read_head_to_head_stats')
     @patch('src.Backend.helpers.ensureDatas.get_head_to_head_stats')
-    @patch('src.Backend.helpers.ensureDatas.get_fixture_by_id')
     @patch('src.Backend.helpers.ensureDatas.get_team_country_by_id')
-    @patch('src.Backend.helpers.ensureDatas.write_to_match_statistics')
     @patch('src.Backend.helpers.ensureDatas.read_odds_by_fixture')
     @patch('src.Backend.helpers.ensureDatas.fetch_odds_for_fixture')
     @patch('src.Backend.helpers.ensureDatas.write_to_odds')
     @patch('builtins.print')
     def test_ensure_simulation_data_failed_odds_fetch(self, mock_print, mock_write_odds, mock_fetch_odds,
-                                                      mock_read_odds, mock_write_stats, mock_get_country,
-                                                      mock_get_fixture, mock_get_h2h, mock_read_h2h,
+                                                      mock_read_odds, mock_get_country,
+                                                      mock_get_h2h, mock_read_h2h,
                                                       mock_delete_fixture, mock_get_stats, mock_read_stats,
                                                       mock_write_fixtures, mock_get_fixtures, mock_get_last_matches):
         """Test when odds fetching fails"""
@@ -391,7 +421,7 @@ class TestSimulationData(unittest.TestCase):
 
         # Mock all necessary functions
         mock_get_last_matches.return_value = matches
-        mock_read_stats.return_value = self.mock_stats
+        mock_read_stats.side_effect = all_have_statistics
         mock_read_h2h.return_value = matches[:10]  # 10 H2H matches
 
         # No odds in DB
@@ -118,7 +118,7 @@ class TestLogisticRegressionModel(unittest.TestCase):
             self.assertEqual(features[12], 0.0)  # missing goalkeeper_saves
 
     @patch('src.Backend.probability_models.logistic_regression_model.get_last_matches')
-    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics')
+    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics_batch')
     def test_prepare_training_data_no_matches(self, mock_get_stats, mock_get_matches):
         """Test preparing training data when no matches are available"""
         mock_get_matches.return_value = []
@@ -134,7 +134,7 @@ class TestLogisticRegressionModel(unittest.TestCase):
             mock_get_stats.assert_not_called()
 
     @patch('src.Backend.probability_models.logistic_regression_model.get_last_matches')
-    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics')
+    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics_batch')
     @patch('src.Backend.probability_models.logistic_regression_model.extract_features')
     def test_prepare_training_data_home_team(self, mock_extract_features, mock_get_stats, mock_get_matches):
         """Test preparing training data for home team matches"""
@@ -144,10 +144,10 @@ class TestLogisticRegressionModel(unittest.TestCase):
         ]
 
         # Mock match statistics
-        mock_get_stats.return_value = [
+        mock_get_stats.return_value = {1: [
             {'team_id': 1, 'shots_on_goal': 5},  # Home team stats
             {'team_id': 2, 'shots_on_goal': 3}  # Away team stats
-        ]
+        ]}
 
         # Mock extracted features
         mock_extract_features.side_effect = [
@@ -170,7 +170,7 @@ class TestLogisticRegressionModel(unittest.TestCase):
             self.assertEqual(X[0, 33], 0)
 
     @patch('src.Backend.probability_models.logistic_regression_model.get_last_matches')
-    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics')
+    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics_batch')
     @patch('src.Backend.probability_models.logistic_regression_model.extract_features')
     def test_prepare_training_data_away_team(self, mock_extract_features, mock_get_stats, mock_get_matches):
         """Test preparing training data for away team matches"""
@@ -180,10 +180,10 @@ class TestLogisticRegressionModel(unittest.TestCase):
         ]
 
         # Mock match statistics
-        mock_get_stats.return_value = [
+        mock_get_stats.return_value = {1: [
             {'team_id': 2, 'shots_on_goal': 4},  # Home team stats
             {'team_id': 1, 'shots_on_goal': 4}  # Away team stats
-        ]
+        ]}
 
         # Mock extracted features
         mock_extract_features.side_effect = [
@@ -283,7 +283,7 @@ class TestLogisticRegressionModel(unittest.TestCase):
             self.assertEqual(result["2"], 20.0)  # class 0 probability
 
     @patch('src.Backend.probability_models.logistic_regression_model.get_last_matches')
-    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics')
+    @patch('src.Backend.probability_models.logistic_regression_model.get_match_statistics_batch')
     @patch('src.Backend.probability_models.logistic_regression_model.extract_features')
     def test_get_average_team_statistics(self, mock_extract_features, mock_get_stats, mock_get_matches):
         """Test calculating average team statistics"""
@@ -294,16 +294,16 @@ class TestLogisticRegressionModel(unittest.TestCase):
         ]
 
         # Mock match statistics
-        mock_get_stats.side_effect = [
-            [
+        mock_get_stats.return_value = {
+            1: [
                 {'team_id': 1, 'shots_on_goal': 4},
                 {'team_id': 2, 'shots_on_goal': 3}
             ],
-            [
+            2: [
                 {'team_id': 3, 'shots_on_goal': 2},
                 {'team_id': 1, 'shots_on_goal': 5}
             ]
-        ]
+        }
 
         # Előre definiáljuk a mock értékeket, amiket ellenőrzünk később
         feature_set_1 = np.array(
@@ -323,7 +323,7 @@ class TestLogisticRegressionModel(unittest.TestCase):
 
             # Check function calls
             mock_get_matches.assert_called_once_with(1, 5)
-            self.assertEqual(mock_get_stats.call_count, 2)
+            mock_get_stats.assert_called_once_with([1, 2])
             self.assertEqual(mock_extract_features.call_count, 2)
 
 
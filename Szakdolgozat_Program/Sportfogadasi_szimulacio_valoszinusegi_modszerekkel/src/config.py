@@ -1,9 +1,70 @@
+import os
+
 API_KEY = 'dbb2c1ab9308ecb6e97ac342a32a8f8f'
-BASE_URL = 'https://v3.football.api-sports.io/'
+PRODUCTION_BASE_URL = 'https://v3.football.api-sports.io/'
+# Felülírható, pl. a helyi visszajátszó szerverre: API_BASE_URL=http://127.0.0.1:8765/
+# Más cím esetén a válaszok nem kerülnek a nyers archívumba és az API keret mérésébe
+BASE_URL = os.environ.get('API_BASE_URL', PRODUCTION_BASE_URL)
 HOST = 'v3.football.api-sports.io'
 DB_CONFIG = {
     'user': 'root',      # MySQL felhasználónév
     'password': '',  # MySQL jelszó
     'host': '127.0.0.1',          # Ha távolról csatlakozol, akkor a szerver IP címe
     'database': 'sports_database' # Az adatbázis neve
-}
\ No newline at end of file
+}
+
+# MySQL kapcsolatkészlet (a get_db_connection ebből ad kapcsolatot)
+DB_POOL_NAME = 'sports_pool'
+DB_POOL_SIZE = 10                 # Nyitva tartott kapcsolatok (a mysql.connector legfeljebb 32-t enged)
+DB_POOL_RESET_SESSION = True      # Visszaadáskor a session változók és ideiglenes táblák törlése
+DB_POOL_CHECKOUT_TIMEOUT = 10     # Másodperc várakozás, ha minden kapcsolat foglalt
+DB_CONNECT_TIMEOUT = 3            # Másodperc egy kapcsolódási kísérletre
+DB_IN_CHUNK_SIZE = 500            # Ennyi azonosító kerül egy IN (...) listába a tömeges olvasásoknál
+
+# Adatbázis megszakító (circuit breaker): leállás esetén a hívások azonnal hibával térnek vissza
+DB_CIRCUIT_FAILURE_THRESHOLD = 3  # Ennyi egymást követő sikertelen csatlakozás után nyit ki
+DB_CIRCUIT_PROBE_INTERVAL = 2     # Másodpercenként egyetlen háttérpróba ellenőrzi a helyreállást
+
+# API HTTP kliens beállításai (közös, keep-alive kapcsolatkészlet)
+API_POOL_SIZE = 10        # Egyszerre nyitva tartott kapcsolatok száma a hosthoz
+API_TIMEOUT = 30          # Másodperc egy kérés teljes válaszidejére
+API_BURST = 10            # Token bucket löket: ennyi hívás mehet ki azonnal egymás után
+API_MAX_IN_FLIGHT = 8     # Párhuzamosan futó kérések száma (legfeljebb API_POOL_SIZE)
+
+# Helyi adatok (cache, archívumok) könyvtára
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# API válasz cache (SQLite)
+API_CACHE_ENABLED = True
+API_CACHE_PATH = os.path.join(DATA_DIR, 'api_cache.sqlite')
+API_CACHE_NS_TTL = 10 * 60       # Még el nem kezdődött (NS) mérkőzések: percek
+API_CACHE_LIVE_TTL = 60          # Élő mérkőzések: 1 perc
+API_CACHE_ODDS_TTL = 30 * 60     # Oddsok saját TTL-lel
+
+# API kvóta nyilvántartás (x-ratelimit fejlécek alapján)
+API_DAILY_RESERVE = 500          # Ennyi napi hívást a háttérfeladatok nem költhetnek el (interaktív használatra)
+API_USAGE_FLUSH_EVERY = 25       # Ennyi hívásonként írjuk ki a hívásszámokat az adatbázisba
+API_CALLS_PER_FIXTURE = 40       # Becsült API hívásszám egy mérkőzés szimulációs adatainak pótlásához
+
+# Nyers API válaszok archívuma (napi partíciók, gzip JSON-lines) az offline újrafeldolgozáshoz
+RAW_ARCHIVE_ENABLED = True
+RAW_ARCHIVE_DIR = os.path.join(DATA_DIR, 'raw_archive')
+RAW_ARCHIVE_COMMIT_EVERY = 100  # Ennyi archivált válaszonként véglegesítjük az indexet (és flush()-kor)
+
+# API válaszok felvétele kazettába (gzip JSON-lines) offline méréshez és CI-hez
+CASSETTE_DIR = os.path.join(DATA_DIR, 'cassettes')
+API_RECORD_CASSETTE = os.environ.get('API_RECORD_CASSETTE')  # Ide rögzítjük a válaszokat (puszta név: CASSETTE_DIR-be)
+
+# Liga-szezon szintű mérkőzés feltöltés
+LEAGUE_SEASON_REFRESH_HOURS = 24  # A folyamatban lévő szezonokat legfeljebb ilyen gyakran kérjük le újra
+
+# Statisztika nélküli mérkőzések (negatív cache)
+MISSING_STATISTICS_RECHECK_DAYS = 14  # Ennyi nap után kérdezzük meg újra az API-t egy statisztika nélküli meccsről
+STATISTICLESS_FIXTURE_MIN_AGE_DAYS = 30  # A karbantartás az ennél régebbi, statisztika nélküli meccseket törli
+
+# Pre-match mérkőzések inkrementális szinkronja
+PRE_MATCH_SYNC_DAYS = 5        # Ennyi következő nap mérkőzéseit tartjuk szinkronban
+PRE_MATCH_RESYNC_HOURS = 6     # Egy napot (az összes oddsával) legfeljebb ilyen gyakran szinkronizálunk teljesen
+
+# Fogadóirodák szinkronja induláskor (hálózat nélkül, a nyers archívum odds válaszaiból)
+BOOKMAKER_SYNC_ARCHIVE_DAYS = 7  # Ennyi legutóbbi napi partíció odds válaszait nézzük át
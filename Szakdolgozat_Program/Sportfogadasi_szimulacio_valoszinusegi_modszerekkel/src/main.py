@@ -1,4 +1,9 @@
 from src.Backend.API.fixtures import save_pre_match_fixtures, update_fixtures
+from src.Backend.API.make_api_request import print_scheduler_report
+from src.Backend.API.quota_meter import api_quota_meter, print_api_usage_report
+from src.Backend.API.response_cache import print_cache_report
+from src.Backend.API.single_flight import print_single_flight_report
+from src.Backend.DB.migrations import apply_migrations
 from src.Backend.DB.predictions import batch_evaluate_all_predictions
 from src.Frontend.windows.SportsApp import SportsApp
 import tkinter as tk
@@ -12,11 +17,18 @@ def main():
     # Üzenetablak megjelenítése
     response = messagebox.askyesno("Frissítés", "Szeretné frissíteni az aktuális mérkőzések listáját?")
 
+    apply_migrations()
+    api_quota_meter.restore()
+
     if response:  # Ha a felhasználó Igen-t választott
         print("🔄 Mérkőzések frissítése...")
         save_pre_match_fixtures()
         update_fixtures()
         batch_evaluate_all_predictions()
+        print_cache_report()
+        print_single_flight_report()
+        print_api_usage_report()
+        print_scheduler_report()
         print("✅ Frissítés kész!")
 
     # Az alkalmazás főablakának indítása